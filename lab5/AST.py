@@ -35,6 +35,7 @@ class Id(AstNode):
     def __init__(self, value: str, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.value = value
+        self.slot = None
 
 
 class Variable(Expr):
@@ -113,6 +114,7 @@ class Assignment(AstNode):
         self.assign_op = assign_op
         self.expression = expression
         self.with_ref = with_ref
+        self.matrix = False  # compound assignment of matrix variable, set by TypeChecker
 
 
 class Assignments(Statement):
@@ -148,3 +150,19 @@ class BinOp(Expr):
         self.left_expr = left_expr
         self.bin_op = bin_op
         self.right_expr = right_expr
+
+
+class VectorizedFor(For):
+    def __init__(self, iteration: ForExpr, for_block: Block, loops: List[For], assignment: Assignment,
+                 *args, **kwargs):
+        super().__init__(iteration, for_block, *args, **kwargs)
+        self.loops = loops  # loop nest from outermost, loops[0] has the same iteration and block
+        self.assignment = assignment  # the only statement of the innermost loop
+
+
+class FusedExpr(BinOp):
+    def __init__(self, left_expr: Expr, bin_op: str, right_expr: Expr, leaves: List[Expr], code: List[tuple],
+                 *args, **kwargs):
+        super().__init__(left_expr, bin_op, right_expr, *args, **kwargs)
+        self.leaves = leaves  # operands of the chain, evaluated first in this order
+        self.code = code  # (op, register indexes) instructions, registers are leaves then instruction results
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+
+VERSION = 1  # bump whenever AST classes, parser actions or TypeChecker annotations change
+
+
+def user_cache_dir():  # lab5 directory in cache of the user, $XDG_CACHE_HOME or ~/.cache
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "lab5")
+
+
+class ASTCache(object):
+    """On disk cache of parsed and type checked ASTs keyed by hash of program text, grammar and AST version.
+
+    Entries are zlib compressed pickles, replaced atomically so concurrent processes never see partial
+    file. Loading an entry touches it, least recently used entries are evicted once they exceed max_size
+    bytes. Only programs without illegal characters, syntax and type errors are stored, before they are
+    optimized. If the directory cannot be written, nothing is stored any more and programs run without
+    the cache.
+    """
+    suffix = ".ast"
+
+    def __init__(self, directory: str = None, max_size: int = 64 * 1024 * 1024):
+        self.directory = directory or user_cache_dir()
+        self.max_size = max_size
+        self.writable = True  # False after failed store
+
+    def _path(self, text: str, signature: str):
+        key = hashlib.sha256(f"{VERSION}:{len(signature)}:{signature}:{text}".encode()).hexdigest()
+        return os.path.join(self.directory, key + self.suffix)
+
+    def load(self, text: str, signature: str):  # returns checked Statements or None
+        path = self._path(text, signature)
+        try:
+            with open(path, "rb") as file:
+                program = pickle.loads(zlib.decompress(file.read()))
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, zlib.error,
+                pickle.UnpicklingError):
+            return None
+        touch(path)
+        return program
+
+    def store(self, text: str, signature: str, program):
+        if not self.writable:
+            return
+        try:
+            data = zlib.compress(pickle.dumps(program, pickle.HIGHEST_PROTOCOL), 1)
+        except RecursionError:  # too deep to pickle, program is parsed again next time
+            return
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, self._path(text, signature))  # atomic, concurrent runs never see partial file
+            tmp_path = None
+            self.evict()
+        except OSError:  # read only, missing or full directory
+            self.writable = False
+        finally:
+            if tmp_path is not None:
+                remove(tmp_path)
+
+    def evict(self):  # removes least recently used entries until they fit in max_size
+        evict(self.directory, self.suffix, self.max_size)
+
+
+def touch(path: str):  # marks entry most recently used, it may have been evicted meanwhile by other process
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict(directory: str, suffix: str, max_size: int):  # removes least recently used files with suffix above max_size
+    entries = []
+    with os.scandir(directory) as scan:
+        for entry in scan:
+            if entry.name.endswith(suffix):
+                try:
+                    info = entry.stat()
+                except OSError:  # removed by other process
+                    continue
+                entries.append((info.st_mtime, info.st_size, entry.path))
+    size = sum(entry[1] for entry in entries)
+    for _, entry_size, path in sorted(entries):
+        if size <= max_size:
+            break
+        remove(path)
+        size -= entry_size
+
+
+def remove(path: str):  # unlinks file, which may have been removed by other process
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,290 @@
+import operator
+
+from AST import *
+from visit import NodeVisitor
+
+# Every instruction is a tuple (opcode, a, b, c), unused operands are 0.
+# Binary opcodes come first, so VM handles all of them with a single comparison.
+(ADD, SUB, MUL, DIV, LT, LE, GT, GE, EQ, NE,
+ FOR_TEST, INC, JUMP, JUMP_IF_FALSE, MOVE, NEG, TRANSPOSE, EYE, ZEROS, ONES,
+ MATRIX, MATRIX_REFS, SET_ITEM, PRINT, RETURN) = range(25)
+
+OPNAMES = ('ADD', 'SUB', 'MUL', 'DIV', 'LT', 'LE', 'GT', 'GE', 'EQ', 'NE',
+           'FOR_TEST', 'INC', 'JUMP', 'JUMP_IF_FALSE', 'MOVE', 'NEG', 'TRANSPOSE', 'EYE', 'ZEROS', 'ONES',
+           'MATRIX', 'MATRIX_REFS', 'SET_ITEM', 'PRINT', 'RETURN')
+
+BINARY_OPS = (operator.add, operator.sub, operator.mul, operator.truediv, operator.lt, operator.le,
+              operator.gt, operator.ge, operator.eq, operator.ne)  # indexed by opcode
+
+BINARY_OPCODES = {
+    "+": ADD, "-": SUB, "*": MUL, "/": DIV,
+    "<": LT, "<=": LE, ">": GT, ">=": GE, "==": EQ, "!=": NE,
+    ".+": ADD, ".-": SUB, ".*": MUL, "./": DIV,
+    "+=": ADD, "-=": SUB, "*=": MUL, "/=": DIV
+}
+
+SPECIAL_OPCODES = {"eye": EYE, "zeros": ZEROS, "ones": ONES}
+
+# Operand kinds used by disassembler: r - register, k - constant pool index, t - jump target
+FORMATS = dict.fromkeys(range(len(BINARY_OPS)), 'rrr')
+FORMATS.update({
+    FOR_TEST: 'rrt', INC: 'r', JUMP: 't', JUMP_IF_FALSE: 'rt', MOVE: 'rr', NEG: 'rr', TRANSPOSE: 'rr',
+    EYE: 'rr', ZEROS: 'rr', ONES: 'rr', MATRIX: 'rk', MATRIX_REFS: 'rk', SET_ITEM: 'rkr', PRINT: 'k',
+    RETURN: 'r'
+})
+
+PRODUCERS = set(range(len(BINARY_OPS))) | {MOVE, NEG, TRANSPOSE, EYE, ZEROS, ONES, MATRIX, MATRIX_REFS}
+
+
+class Ref(object):  # register reference inside layout of matrix literal
+
+    __slots__ = ('reg',)
+
+    def __init__(self, reg: int):
+        self.reg = reg
+
+    def __repr__(self):
+        return f"r{self.reg}"
+
+
+class Code(object):
+
+    def __init__(self, instructions, consts, init, names, nregs):
+        self.instructions = instructions  # list of (opcode, a, b, c)
+        self.consts = consts  # constant pool
+        self.init = init  # (register, constant index) pairs loaded before execution
+        self.names = names  # register -> variable name
+        self.nregs = nregs
+
+
+class BytecodeCompiler(NodeVisitor):
+    """Compiles a type checked AST into register based bytecode executed by VM.
+
+    Variables, scalar constants and temporaries all live in numbered registers. MemoryStack scopes
+    share one table, so every variable gets a single register for the whole program.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._reset()
+
+    def _reset(self):
+        self.instructions = []
+        self.consts = []
+        self.init = []
+        self.names = {}
+        self.slots = {}  # variable name -> register
+        self.const_regs = {}  # (type, value) -> register
+        self.temps = []
+        self.temp_set = set()
+        self.busy = 0  # number of temporaries in use
+        self.loops = []  # (continue jumps, break jumps) of enclosing loops
+        self.nregs = 0
+
+    def compile(self, node: AstNode):
+        self._reset()
+        self.visit(node)
+        instructions = [tuple(instruction) for instruction in self.instructions]
+        return Code(instructions, self.consts, self.init, self.names, self.nregs)
+
+    def _emit(self, op: int, a: int = 0, b: int = 0, c: int = 0):
+        self.instructions.append([op, a, b, c])
+        return len(self.instructions) - 1
+
+    def _patch(self, pcs: List[int], operand: int, target: int):
+        for pc in pcs:
+            self.instructions[pc][operand] = target
+
+    def _register(self):
+        self.nregs += 1
+        return self.nregs - 1
+
+    def _slot(self, name: str):
+        if name not in self.slots:
+            self.slots[name] = self._register()
+            self.names[self.slots[name]] = name
+        return self.slots[name]
+
+    def _pool(self, value: any):
+        self.consts.append(value)
+        return len(self.consts) - 1
+
+    def _const(self, value: any):
+        key = (type(value), value)
+        if key not in self.const_regs:
+            self.const_regs[key] = self._register()
+            self.init.append((self.const_regs[key], self._pool(value)))
+        return self.const_regs[key]
+
+    def _temp(self):
+        if self.busy == len(self.temps):
+            self.temps.append(self._register())
+            self.temp_set.add(self.temps[-1])
+        self.busy += 1
+        return self.temps[self.busy - 1]
+
+    def _store(self, dst: int, reg: int):
+        last = self.instructions[-1] if self.instructions else None
+        if reg in self.temp_set and last and last[0] in PRODUCERS and last[1] == reg:
+            last[1] = dst  # write result of expression directly into destination
+        else:
+            self._emit(MOVE, dst, reg)
+
+    def visit_Statements(self, node: Statements):
+        for statement in node.statements:
+            busy = self.busy
+            self.visit(statement)
+            self.busy = busy
+
+    def visit_Block(self, node: Block):
+        self.visit(node.statements)
+
+    def visit_Id(self, node: Id):
+        return self._slot(node.value)
+
+    def visit_Variable(self, node: Variable):
+        if not isinstance(node.value, Id) and not isinstance(node.value, Matrix):
+            return self._const(-node.value if node.minus % 2 else node.value)
+        reg = self.visit(node.value)
+        if node.trans % 2:
+            temp = self._temp()
+            self._emit(TRANSPOSE, temp, reg)
+            reg = temp
+        if node.minus % 2:
+            temp = self._temp()
+            self._emit(NEG, temp, reg)
+            reg = temp
+        return reg
+
+    def visit_SpecialMatrix(self, node: SpecialMatrix):
+        size = self.visit(node.expressions[0])
+        temp = self._temp()
+        self._emit(SPECIAL_OPCODES[node.special], temp, size)
+        return temp
+
+    def visit_SimpleMatrix(self, node: SimpleMatrix):
+        refs = []
+
+        def _layout(vector: List[any]):
+            outer = []
+            inner = []
+            for el in vector:
+                if el == ";":
+                    outer.append(inner)
+                    inner = []
+                else:
+                    inner.append(_element(el))
+            outer.append(inner)
+            return outer if ';' in vector else inner
+
+        def _element(el: any):
+            if isinstance(el, list):
+                return _layout(el)
+            if isinstance(el, Id):
+                refs.append(Ref(self._slot(el.value)))
+                return refs[-1]
+            return el
+
+        layout = _layout(node.vector)
+        temp = self._temp()
+        self._emit(MATRIX_REFS if refs else MATRIX, temp, self._pool(layout))
+        return temp
+
+    def visit_BinOp(self, node: BinOp):
+        left = self.visit(node.left_expr)
+        right = self.visit(node.right_expr)
+        temp = self._temp()
+        self._emit(BINARY_OPCODES[node.bin_op], temp, left, right)
+        return temp
+
+    def visit_If(self, node: If):
+        cond = self.visit(node.cond_expr)
+        jump_else = self._emit(JUMP_IF_FALSE, cond)
+        self.visit(node.if_block)
+        if node.else_block:
+            jump_end = self._emit(JUMP)
+            self._patch([jump_else], 2, len(self.instructions))
+            self.visit(node.else_block)
+            self._patch([jump_end], 1, len(self.instructions))
+        else:
+            self._patch([jump_else], 2, len(self.instructions))
+
+    def visit_While(self, node: While):
+        head = len(self.instructions)
+        cond = self.visit(node.cond_expr)
+        jump_exit = self._emit(JUMP_IF_FALSE, cond)
+        self.loops.append(([], []))
+        self.visit(node.while_block)
+        continues, breaks = self.loops.pop()
+        self._emit(JUMP, head)
+        self._patch(continues, 1, head)
+        self._patch(breaks, 1, len(self.instructions))
+        self._patch([jump_exit], 2, len(self.instructions))
+
+    def visit_For(self, node: For):
+        var = self._slot(node.iteration.for_id.value)
+        start = self.visit(node.iteration.start_expr)
+        end = self.visit(node.iteration.end_expr)
+        if end in self.names:  # end is evaluated once, body must not see later changes of variable
+            temp = self._temp()
+            self._emit(MOVE, temp, end)
+            end = temp
+        self._store(var, start)
+
+        head = self._emit(FOR_TEST, var, end)
+        self.loops.append(([], []))
+        self.visit(node.for_block)
+        continues, breaks = self.loops.pop()
+        self._patch(continues, 1, self._emit(INC, var))
+        self._emit(JUMP, head)
+        self._patch(breaks, 1, self._emit(INC, var))  # Interpreter increments counter also on break
+        self._patch([head], 3, len(self.instructions))
+
+    def visit_Print(self, node: Print):
+        regs = tuple(self.visit(expr) for expr in node.expressions)
+        self._emit(PRINT, self._pool(regs))
+
+    def visit_Assignments(self, node: Assignments):
+        for assignment in node.assignments:
+            busy = self.busy
+            self.visit(assignment)
+            self.busy = busy
+
+    def visit_Assignment(self, node: Assignment):
+        value = self.visit(node.expression)
+        var = self._slot(node.assign_id.value)
+        if node.with_ref:
+            refs = (self.visit(node.with_ref[0]), self.visit(node.with_ref[1]))
+            self._emit(SET_ITEM, var, self._pool(refs), value)
+        elif node.assign_op == "=":
+            self._store(var, value)
+        else:
+            self._emit(BINARY_OPCODES[node.assign_op], var, var, value)
+
+    def visit_Break(self, node: Break):
+        self.loops[-1][1].append(self._emit(JUMP))
+
+    def visit_Continue(self, node: Continue):
+        self.loops[-1][0].append(self._emit(JUMP))
+
+    def visit_Return(self, node: Return):
+        self._emit(RETURN, self.visit(node.expressions[0]))
+
+
+def disassemble(code: Code):
+    def _operand(kind, value):
+        if kind == 'r':
+            name = code.names.get(value)
+            if name is None:
+                const = next((code.consts[k] for reg, k in code.init if reg == value), None)
+                name = repr(const) if const is not None else None
+            return f"r{value}" + (f"({name})" if name is not None else "")
+        if kind == 'k':
+            return f"k{value}({code.consts[value]!r})"
+        return f"-> {value}"
+
+    lines = []
+    for pc, (op, *operands) in enumerate(code.instructions):
+        args = ", ".join(_operand(kind, value) for kind, value in zip(FORMATS[op], operands))
+        lines.append(f"{pc:5}  {OPNAMES[op]:<14}{args}")
+    return "\n".join(lines)
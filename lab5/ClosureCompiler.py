@@ -0,0 +1,215 @@
+import numpy as np
+
+from AST import *
+from Exceptions import ReturnValueException
+from Interpreter import BREAK, CONTINUE, Interpreter
+from visit import NodeVisitor
+
+
+class ClosureCompiler(NodeVisitor):
+    """Compiles a type checked AST once into nested Python closures.
+
+    Expression closures return their value, statement closures return None, BREAK or CONTINUE,
+    so executing the program no longer dispatches through visit for every evaluated node.
+    """
+    _ops = Interpreter._ops
+
+    def __init__(self):
+        self.env = {}
+
+    def compile(self, node: AstNode):
+        self.env = {}  # MemoryStack.push shares the enclosing table, so one dict serves every scope
+        body = self.visit(node)
+
+        def program():
+            body()
+
+        return program
+
+    def visit_AstNode(self, node: AstNode):  # as Interpreter, reported when the node runs
+        message = f"No visitor for node {node.__class__.__name__}"
+        return lambda: print(message)
+
+    def visit_Statements(self, node: Statements):
+        body = tuple(self.visit(statement) for statement in node.statements)
+        if len(body) == 1:
+            return body[0]
+
+        def run():
+            for statement in body:
+                signal = statement()
+                if signal:
+                    return signal
+
+        return run
+
+    def visit_Id(self, node: Id):
+        env = self.env
+        name = node.value
+        return lambda: env[name]
+
+    def visit_Variable(self, node: Variable):
+        minus = node.minus % 2
+        trans = node.trans % 2
+        if not isinstance(node.value, Id) and not isinstance(node.value, Matrix):
+            const = -node.value if minus else node.value  # we know correct type from TypeCheck
+            return lambda: const
+
+        value = self.visit(node.value)
+        if minus and trans:
+            return lambda: -np.transpose(value())
+        elif trans:
+            return lambda: np.transpose(value())
+        elif minus:
+            return lambda: -value()
+        return value
+
+    def visit_SpecialMatrix(self, node: SpecialMatrix):
+        size = self.visit(node.expressions[0])
+        if node.special == "eye":
+            return lambda: np.eye(size())
+        elif node.special == "zeros":
+            return lambda: np.zeros((size(), size()))
+        else:  # ones
+            return lambda: np.ones((size(), size()))
+
+    def visit_SimpleMatrix(self, node: SimpleMatrix):
+        env = self.env
+
+        def _create_matrix(vector: List[any]):
+            outer = []
+            inner = []
+            for el in vector:
+                if el == ";":
+                    outer.append(inner)
+                    inner = []
+                else:
+                    inner.append(el)
+            outer.append(inner)
+            return outer
+
+        def _has_id(vector: List[any]):
+            return any(_has_id(el) if isinstance(el, list) else isinstance(el, Id) for el in vector)
+
+        def _fill(vector: List[any]):
+            return [_fill(el) if isinstance(el, list) else env[el.value] if isinstance(el, Id) else el
+                    for el in vector]
+
+        matrix = _create_matrix(node.vector) if ';' in node.vector else node.vector
+        if _has_id(matrix):
+            return lambda: np.array(_fill(matrix))
+        return lambda: np.array(matrix)
+
+    def visit_Block(self, node: Block):
+        return self.visit(node.statements)
+
+    def visit_If(self, node: If):
+        cond = self.visit(node.cond_expr)
+        if_block = self.visit(node.if_block)
+        if not node.else_block:
+            def run():
+                if cond():
+                    return if_block()
+
+            return run
+
+        else_block = self.visit(node.else_block)
+
+        def run():
+            if cond():
+                return if_block()
+            return else_block()
+
+        return run
+
+    def visit_While(self, node: While):
+        cond = self.visit(node.cond_expr)
+        body = self.visit(node.while_block)
+
+        def run():
+            while cond():
+                if body() == BREAK:
+                    break
+
+        return run
+
+    def visit_For(self, node: For):
+        env = self.env
+        name = node.iteration.for_id.value
+        start = self.visit(node.iteration.start_expr)
+        end = self.visit(node.iteration.end_expr)
+        body = self.visit(node.for_block)
+
+        def run():
+            first, last = start(), end()
+            env[name] = first
+            while env[name] < last:
+                signal = body()
+                env[name] = env[name] + 1  # Interpreter increments in finally, so also on break
+                if signal == BREAK:
+                    break
+
+        return run
+
+    def visit_Print(self, node: Print):
+        expressions = tuple(self.visit(expr) for expr in node.expressions)
+
+        def run():
+            print(*[expr() for expr in expressions], sep=" ")
+
+        return run
+
+    def visit_Assignment(self, node: Assignment):
+        env = self.env
+        name = node.assign_id.value
+        value = self.visit(node.expression)
+        if node.with_ref:
+            first_slice = self.visit(node.with_ref[0])
+            second_slice = self.visit(node.with_ref[1])
+
+            def run():
+                evaluated_value = value()
+                matrix = env[name]
+                matrix[first_slice()][second_slice()] = evaluated_value
+        elif node.assign_op == "=":
+            def run():
+                env[name] = value()
+        else:
+            op = self._ops[node.assign_op]
+
+            def run():
+                evaluated_value = value()
+                env[name] = op(env[name], evaluated_value)
+
+        return run
+
+    def visit_Assignments(self, node: Assignments):
+        assignments = tuple(self.visit(assignment) for assignment in node.assignments)
+        if len(assignments) == 1:
+            return assignments[0]
+
+        def run():
+            for assignment in assignments:
+                assignment()
+
+        return run
+
+    def visit_Break(self, node: Break):
+        return lambda: BREAK
+
+    def visit_Continue(self, node: Continue):
+        return lambda: CONTINUE
+
+    def visit_Return(self, node: Return):
+        value = self.visit(node.expressions[0])
+
+        def run():
+            raise ReturnValueException(value())
+
+        return run
+
+    def visit_BinOp(self, node: BinOp):
+        op = self._ops[node.bin_op]
+        left = self.visit(node.left_expr)
+        right = self.visit(node.right_expr)
+        return lambda: op(left(), right())
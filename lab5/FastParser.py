@@ -0,0 +1,344 @@
+import re
+
+from AST import *
+
+_COMPARISON = 1  # nonassoc, lowest precedence of binary operators, as in Parser.precedence
+_BINARY = {
+    'GE': _COMPARISON, 'GEQ': _COMPARISON, 'LE': _COMPARISON, 'LEQ': _COMPARISON, 'EQ': _COMPARISON,
+    'NEQ': _COMPARISON,
+    'ADD': 2, 'SUB': 2, 'DOTADD': 2, 'DOTSUB': 2,
+    'MUL': 3, 'DIV': 3, 'DOTMUL': 3, 'DOTDIV': 3,
+}
+_CONST = frozenset(('STRING', 'FLOATNUM', 'INTNUM'))
+_EXPRESSION_START = frozenset(('LPAREN', 'SUB', 'ID', 'LBRACKET', 'EYE', 'ZEROS', 'ONES')) | _CONST
+_ASSIGN_OPS = frozenset(('ASSIGN', 'ADDASSIGN', 'SUBASSIGN', 'MULASSIGN', 'DIVASSIGN'))
+
+# Tokens of Scanner, alternatives in its order where they overlap: numbers before dotted operators, two
+# character operators before one character ones. Keywords are matched as ids, reserved words are looked up.
+_TOKEN = re.compile(r"""[ \t]*(?:
+    (\d+\.\d*|\.\d+|\d+)                          # 1 FLOATNUM or INTNUM
+    |([a-zA-Z_]\w*)                                # 2 ID or reserved word
+    |(\.[-+*/]|[-+*/=<>!]=|[-+*/=<>()[\]{}:',;])   # 3 operator or delimiter
+    |\"(.*?)\"                                     # 4 STRING
+    |(\r?\n+)                                      # 5 newlines
+    |\#.*                                          # comment
+    |([^ \t])                                      # 6 illegal character
+)""", re.VERBOSE)
+_OPERATORS = {
+    '=': 'ASSIGN', '-': 'SUB', '+': 'ADD', '*': 'MUL', '/': 'DIV', '(': 'LPAREN', ')': 'RPAREN',
+    '.+': 'DOTADD', '.-': 'DOTSUB', '.*': 'DOTMUL', './': 'DOTDIV', '+=': 'ADDASSIGN', '-=': 'SUBASSIGN',
+    '*=': 'MULASSIGN', '/=': 'DIVASSIGN', '>': 'GE', '>=': 'GEQ', '<': 'LE', '<=': 'LEQ', '!=': 'NEQ', '==': 'EQ',
+    '[': 'LBRACKET', ']': 'RBRACKET', '{': 'LCURLY', '}': 'RCURLY', ':': 'RANGE', "'": 'TRANS', ',': 'COMMA',
+    ';': 'SEMICOL',
+}
+
+
+_new = object.__new__
+
+
+# The most frequent nodes are built without chains of constructors, fields are set in the order of them
+def _new_id(value: str, lineno: int = -1):
+    node = _new(Id)
+    node.lineno = lineno
+    node.value = value
+    node.slot = None
+    return node
+
+
+def _new_variable(value, minus: int, trans: int, lineno: int):
+    node = _new(Variable)
+    node.lineno = lineno
+    node.value = value
+    node.minus = minus
+    node.trans = trans
+    return node
+
+
+def _new_bin_op(left_expr, bin_op: str, right_expr, lineno: int):
+    node = _new(BinOp)
+    node.lineno = lineno
+    node.left_expr = left_expr
+    node.bin_op = bin_op
+    node.right_expr = right_expr
+    return node
+
+
+class _Unsupported(Exception):  # syntax error or illegal character, program is left to PLY parser
+    pass
+
+
+class _Continued(_Unsupported):  # token or comment continues after stop of tokenized part of text
+    pass
+
+
+class FastParser(object):
+    """Hand written recursive descent parser of the grammar of Parser, with precedence climbing for operators.
+
+    Builds the same AST as PLY parser, including linenos: actions of Parser take line of the lexer, which
+    has read the token after reduced rule, the last line for end of input. Only break and continue are
+    reduced before reading it. Tokens of the Scanner are matched at once by a single regex, which has to be
+    kept in sync with it, differential.py compares both parsers. Programs with illegal characters, syntax
+    errors or nesting too deep for recursion are not parsed, parse returns None and Parser falls back to
+    PLY, which reports the errors.
+    """
+
+    def __init__(self, scanner):
+        self.reserved = scanner.reserved
+        self.types = []
+        self.values = []
+        self.lines = []
+        self.offsets = []  # of tokens in text
+        self.pos = 0
+
+    def parse(self, text: str):  # returns Statements, or None if PLY parser has to parse text
+        tokens = self.tokenize(text)
+        return None if tokens is None else self.parse_tokens(tokens)
+
+    def tokenize(self, text: str):  # returns token types, values and lines, or None for illegal character
+        try:
+            self._tokenize(text)
+            return self.types, self.values, self.lines
+        except _Unsupported:
+            return None
+        finally:
+            self.types, self.values, self.lines, self.offsets = [], [], [], []
+
+    def parse_tokens(self, tokens: tuple):  # returns Statements of tokenized text, or None for syntax error
+        self.types, self.values, self.lines = tokens
+        self.pos = 0
+        try:
+            program = Statements([])
+            self._statements(program.statements, '$end')
+            return program
+        except (_Unsupported, RecursionError):
+            return None
+        finally:
+            self.types, self.values, self.lines = [], [], []
+
+    def _tokenize(self, text: str, pos: int = 0, stop: int = None, lineno: int = 1):
+        # tokens from pos, with line of lexer at pos, up to the token at stop, whose line gets the end token
+        types, values, lines, offsets = [], [], [], []
+        reserved = self.reserved
+        stop = len(text) if stop is None else stop
+        for match in _TOKEN.finditer(text, pos):  # only spaces and tabs are left between matches
+            group = match.lastindex
+            if match.end() > stop:
+                if group is None or match.start(group) != stop:
+                    raise _Continued
+                break
+            if group == 3:
+                value = match.group(3)
+                types.append(_OPERATORS[value])
+            elif group == 2:
+                value = match.group(2)
+                types.append(reserved.get(value, 'ID'))
+            elif group == 1:
+                value = match.group(1)
+                if '.' in value:
+                    types.append('FLOATNUM')
+                    value = float(value)
+                else:
+                    types.append('INTNUM')
+                    value = int(value)
+            elif group == 4:
+                value = match.group(4)
+                types.append('STRING')
+            elif group == 5:
+                lineno += len(match.group(5))
+                continue
+            elif group == 6:
+                raise _Unsupported
+            else:  # comment
+                continue
+            values.append(value)
+            lines.append(lineno)
+            offsets.append(match.start(group))
+        types.append('$end')
+        values.append(None)
+        lines.append(lineno)
+        offsets.append(stop)
+        self.types, self.values, self.lines, self.offsets, self.pos = types, values, lines, offsets, 0
+
+    def _expect(self, kind: str):
+        if self.types[self.pos] != kind:
+            raise _Unsupported
+        self.pos += 1
+
+    def _statements(self, statements: list, end: str):
+        types = self.types
+        while types[self.pos] != end:
+            if types[self.pos] == 'LCURLY':  # nested { } is inner Statements
+                self.pos += 1
+                inner = Statements([])
+                self._statements(inner.statements, 'RCURLY')
+                self.pos += 1
+                statements.append(inner)
+            else:
+                statements.append(self._statement())
+
+    def _block(self):
+        if self.types[self.pos] == 'LCURLY':
+            self.pos += 1
+            statements = Statements([])
+            self._statements(statements.statements, 'RCURLY')
+            self.pos += 1
+            return statements
+        return self._statement()
+
+    def _statement(self):
+        kind = self.types[self.pos]
+        if kind == 'ID' or kind == 'SEMICOL':
+            assignments = self._assignments()
+            self._expect('SEMICOL')
+            return Assignments(assignments, lineno=self.lines[self.pos])
+        self.pos += 1
+        if kind == 'IF':
+            cond_expr = self._expression(_COMPARISON)
+            if_block = self._block()
+            if self.types[self.pos] != 'ELSE':
+                return If(cond_expr, Block(if_block))
+            self.pos += 1
+            else_block = self._block()
+            return If(cond_expr, Block(if_block), Block(else_block), lineno=self.lines[self.pos])
+        elif kind == 'WHILE':
+            cond_expr = self._expression(_COMPARISON)
+            return While(cond_expr, Block(self._block()), lineno=self.lines[self.pos])
+        elif kind == 'FOR':
+            if self.types[self.pos] != 'ID':
+                raise _Unsupported
+            for_id = Id(self.values[self.pos])
+            self.pos += 1
+            self._expect('ASSIGN')
+            start_expr = self._expression(_COMPARISON)
+            self._expect('RANGE')
+            iteration = ForExpr(for_id, start_expr, self._expression(_COMPARISON), lineno=self.lines[self.pos])
+            return For(iteration, Block(self._block()), lineno=self.lines[self.pos])
+        elif kind == 'PRINT':
+            expressions = self._expressions()
+            self._expect('SEMICOL')
+            return Print(expressions, lineno=self.lines[self.pos])
+        elif kind == 'BREAK' or kind == 'CONTINUE':  # reduced without reading the next token
+            node = Break(lineno=self.lines[self.pos - 1]) if kind == 'BREAK' else \
+                Continue(lineno=self.lines[self.pos - 1])
+            self._expect('SEMICOL')
+            return node
+        elif kind == 'RETURN':
+            node = Return(self._expressions(), lineno=self.lines[self.pos])
+            self._expect('SEMICOL')
+            return node
+        raise _Unsupported
+
+    def _assignments(self):  # trailing comma is allowed
+        assignments = []
+        while self.types[self.pos] == 'ID':
+            assignments.append(self._assignment())
+            if self.types[self.pos] != 'COMMA':
+                break
+            self.pos += 1
+        return assignments
+
+    def _assignment(self):
+        assign_id = Id(self.values[self.pos])
+        self.pos += 1
+        with_ref = None
+        if self.types[self.pos] == 'LBRACKET':
+            self.pos += 1
+            with_ref = self._expressions()
+            self._expect('RBRACKET')
+        if self.types[self.pos] not in _ASSIGN_OPS:
+            raise _Unsupported
+        assign_op = self.values[self.pos]
+        self.pos += 1
+        expression = self._expression(_COMPARISON)
+        if with_ref is None:
+            return Assignment(assign_id, assign_op, expression, lineno=self.lines[self.pos])
+        return Assignment(assign_id, assign_op, expression, with_ref, lineno=self.lines[self.pos])
+
+    def _expressions(self):  # trailing comma is allowed
+        if self.types[self.pos] not in _EXPRESSION_START:
+            return []
+        expressions = [self._expression(_COMPARISON)]
+        while self.types[self.pos] == 'COMMA':
+            self.pos += 1
+            if self.types[self.pos] not in _EXPRESSION_START:
+                break
+            expressions.append(self._expression(_COMPARISON))
+        return expressions
+
+    def _expression(self, level: int):  # binary operators of at least level, left associative
+        types = self.types
+        if types[self.pos] == 'LPAREN':
+            self.pos += 1
+            left = self._expression(_COMPARISON)
+            self._expect('RPAREN')
+        else:
+            left = self._variable()
+        while True:
+            op_level = _BINARY.get(types[self.pos])
+            if op_level is None or op_level < level:
+                return left
+            bin_op = self.values[self.pos]
+            self.pos += 1
+            left = _new_bin_op(left, bin_op, self._expression(op_level + 1), self.lines[self.pos])
+            if op_level == _COMPARISON and _BINARY.get(types[self.pos]) == _COMPARISON:
+                raise _Unsupported  # comparisons are not associative
+
+    def _variable(self):  # unary minuses and transpositions only count, the outermost Variable is kept
+        types = self.types
+        minus = 0
+        while types[self.pos] == 'SUB':
+            minus += 1
+            self.pos += 1
+        kind = types[self.pos]
+        if kind in _CONST:
+            value = self.values[self.pos]
+            self.pos += 1
+        elif kind == 'ID':
+            value = _new_id(self.values[self.pos])
+            self.pos += 1
+        elif kind == 'LBRACKET':
+            self.pos += 1
+            value = SimpleMatrix(self._vector(), lineno=self.lines[self.pos])
+        elif kind == 'EYE' or kind == 'ZEROS' or kind == 'ONES':
+            special = self.values[self.pos]
+            self.pos += 1
+            self._expect('LPAREN')
+            expressions = self._expressions()
+            self._expect('RPAREN')
+            value = SpecialMatrix(special, expressions, lineno=self.lines[self.pos])
+        else:
+            raise _Unsupported
+        trans = 0
+        while types[self.pos] == 'TRANS':
+            trans += 1
+            self.pos += 1
+        return _new_variable(value, minus, trans, self.lines[self.pos])
+
+    def _vector(self):  # elements of rows after LBRACKET, ';' between rows
+        vector = self._row()
+        while self.types[self.pos] == 'SEMICOL':
+            self.pos += 1
+            vector.append(';')
+            vector.extend(self._row())
+        self._expect('RBRACKET')
+        return vector
+
+    def _row(self):  # may be empty or start with comma, as inner_list of Parser
+        row = [self._element()] if self.types[self.pos] in _CONST or self.types[self.pos] in ('ID', 'LBRACKET') \
+            else []
+        while self.types[self.pos] == 'COMMA':
+            self.pos += 1
+            row.append(self._element())
+        return row
+
+    def _element(self):
+        kind = self.types[self.pos]
+        value = self.values[self.pos]
+        self.pos += 1
+        if kind in _CONST:
+            return value
+        elif kind == 'ID':
+            return _new_id(value, self.lines[self.pos])
+        elif kind == 'LBRACKET':
+            return self._vector()
+        raise _Unsupported
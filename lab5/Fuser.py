@@ -0,0 +1,52 @@
+from AST import *
+from visit import NodeVisitor
+
+
+class Fuser(NodeVisitor):
+    """Rewrites chains of element-wise operators into FusedExpr nodes, evaluated by Interpreter in one pass.
+
+    Maximal subtrees of .+ .- .* ./ become a list of instructions over registers, operands that are not
+    part of the chain are evaluated once as leaves. Transposed operands stay leaves, as transpose is just
+    a view. FusedExpr subclasses BinOp with the same children, so visitors without own visit_FusedExpr
+    still evaluate the chain as before.
+    """
+    _fused_ops = {'.+', '.-', '.*', './'}
+
+    def __init__(self):
+        self.fused = 0
+
+    def fuse(self, node: AstNode):
+        self.fused = 0
+        return self.visit(node)
+
+    def visit_AstNode(self, node: AstNode):
+        for name, value in vars(node).items():
+            if isinstance(value, list):
+                for i, el in enumerate(value):
+                    if isinstance(el, AstNode):
+                        value[i] = self.visit(el)
+            elif isinstance(value, AstNode):
+                setattr(node, name, self.visit(value))
+        return node
+
+    def visit_BinOp(self, node: BinOp):
+        if node.bin_op not in self._fused_ops:
+            return self.visit_AstNode(node)
+        leaves, code = [], []
+        self._compile(node, leaves, code)
+        if len(code) < 2:  # single operator has no intermediate to save
+            return self.visit_AstNode(node)
+        self.fused += 1
+        # operands are ('leaf', i) or ('temp', k) while leaves are collected, registers are leaves then temps
+        code = [(op, tuple(i if kind == 'leaf' else len(leaves) + i for kind, i in operands))
+                for op, operands in code]
+        return FusedExpr(node.left_expr, node.bin_op, node.right_expr, leaves, code, lineno=node.lineno)
+
+    def _compile(self, node: Expr, leaves: List[Expr], code: List[tuple]):  # returns operand holding node value
+        if isinstance(node, BinOp) and node.bin_op in self._fused_ops:
+            operands = (self._compile(node.left_expr, leaves, code), self._compile(node.right_expr, leaves, code))
+            code.append((node.bin_op, operands))
+        else:
+            leaves.append(self.visit(node))
+            return 'leaf', len(leaves) - 1
+        return 'temp', len(code) - 1
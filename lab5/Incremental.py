@@ -0,0 +1,129 @@
+from bisect import bisect_left, bisect_right
+
+from AST import *
+from FastParser import FastParser, _Continued, _Unsupported
+
+
+class IncrementalParser(FastParser):
+    """Parser of edited program, which parses again only top-level statements and { } blocks changed by edits.
+
+    Top-level statements tile the text, each reaches up to the first token of the next one, the first one
+    starts at 0. Edits are (start, end, text) replacing text[start:end], offsets are in the text after
+    preceding edits. Statements overlapping edits and the one before them, whose linenos may come from the
+    next token, are parsed again from their text, other statements are kept, only their line numbers are
+    shifted. If the edited statement continues after them, parsed statements are doubled until it ends. The
+    previous AST is updated in place and returned, so its statements have to be left unoptimized. None is
+    returned when the text has syntax errors, PLY parser reports them, and reparse of None parses the whole
+    edited text.
+    """
+
+    def __init__(self, scanner):
+        super().__init__(scanner)
+        self.text = ""
+        self.program = None  # the last AST, None after syntax error
+        self.starts = []  # offsets of top-level statements
+        self.start_lines = []  # lines of lexer at starts
+        self._lined = []  # of top-level statements, their nodes with line numbers, built when lines shift
+
+    def parse(self, text: str):  # parses whole text
+        self.text = text
+        self.program = None
+        try:
+            self._tokenize(text)
+            self.starts, self.start_lines = [], []
+            self.program = Statements(self._items(self.starts, self.start_lines))
+            if self.starts:
+                self.starts[0], self.start_lines[0] = 0, 1
+        except (_Unsupported, RecursionError):
+            self.starts, self.start_lines = [], []
+        finally:
+            self.types, self.values, self.lines, self.offsets = [], [], [], []
+        self._lined = [None] * len(self.starts)
+        return self.program
+
+    def reparse(self, program: Statements, edits):  # returns AST of edited text
+        if program is not self.program:
+            raise ValueError("program is not the last AST of this parser")
+        text = self.text
+        lo = hi = old_hi = None  # changed part of the new text, its end in the old text
+        for start, end, replacement in edits:
+            if not 0 <= start <= end <= len(text):
+                raise ValueError(f"edit ({start}, {end}) out of text of length {len(text)}")
+            text = text[:start] + replacement + text[end:]
+            if lo is None:
+                lo, hi, old_hi = start, start + len(replacement), end
+            else:
+                old_hi += max(end - hi, 0)
+                lo, hi = min(lo, start), max(hi, end) + len(replacement) - (end - start)
+        if lo is None:
+            return program if program is not None or not text else self.parse(text)
+        old_length, self.text = len(self.text), text
+        if not self.starts:  # empty program or syntax errors in the last text
+            return self.parse(text)
+        first = max(bisect_right(self.starts, lo) - 1 - 1, 0)  # the statement before gets the next line
+        last = max(bisect_left(self.starts, old_hi) - 1, first)
+        shift = len(text) - old_length
+        while True:
+            starts, start_lines = [], []
+            stop = self.starts[last + 1] + shift if last + 1 < len(self.starts) else len(text)
+            tokenized = False
+            try:
+                self._tokenize(text, self.starts[first], stop, self.start_lines[first])
+                tokenized = True
+                statements = self._items(starts, start_lines)
+                line_shift = self.lines[-1] - self.start_lines[last + 1] if last + 1 < len(self.starts) else 0
+                break
+            except (_Unsupported, RecursionError) as error:
+                # edit joined the statement with the next ones, unless the syntax error is before stop
+                continued = isinstance(error, _Continued) or tokenized and self.pos >= len(self.types) - 1
+                if not continued or last + 1 == len(self.starts):
+                    self.program = None
+                    self.starts, self.start_lines, self._lined = [], [], []
+                    return None
+                last = min(2 * last - first + 1, len(self.starts) - 1)  # doubles parsed statements
+            finally:
+                self.types, self.values, self.lines, self.offsets = [], [], [], []
+        if starts:  # keeps spaces and comments before the first token
+            starts[0], start_lines[0] = self.starts[first], self.start_lines[first]
+        program.statements[first:last + 1] = statements
+        self.starts[first:last + 1] = starts
+        self.start_lines[first:last + 1] = start_lines
+        self._lined[first:last + 1] = [None] * len(starts)
+        after = first + len(starts)
+        if shift:
+            self.starts[after:] = [start + shift for start in self.starts[after:]]
+        if line_shift:
+            self.start_lines[after:] = [line + line_shift for line in self.start_lines[after:]]
+            statements, lined = program.statements, self._lined
+            for i in range(after, len(lined)):
+                nodes = lined[i]
+                if nodes is None:  # built once, edits changing line count usually follow
+                    nodes = lined[i] = self._lined_nodes(statements[i])
+                for node in nodes:
+                    node.lineno += line_shift
+        if self.starts:  # the first statement lost, the next one gets its leading text
+            self.starts[0], self.start_lines[0] = 0, 1
+        return program
+
+    def _items(self, starts: list, start_lines: list):  # top-level statements of tokens, with their offsets
+        statements = []
+        types = self.types
+        while types[self.pos] != '$end':
+            starts.append(self.offsets[self.pos])
+            start_lines.append(self.lines[self.pos])
+            statements.append(self._block())  # statement or { } as nested Statements
+        return statements
+
+    @staticmethod
+    def _lined_nodes(statement):  # nodes of statement with line numbers, -1 of nodes created without it
+        lined = []
+        stack = [statement]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, AstNode):
+                if value.lineno > 0:
+                    lined.append(value)
+                stack.extend(value.__dict__.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+        return lined
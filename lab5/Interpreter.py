@@ -5,13 +5,26 @@ import numpy as np
 
 from AST import *
 from Exceptions import *
-from Memory import MemoryStack
-from visit import *
+from LazyMatrix import LazyMatrix
+from Memory import FrameStack
+from Resolver import Resolver
+from visit import NodeVisitor
 
 sys.setrecursionlimit(10000)
 
+# Completion signals returned by statement visits, None means normal completion.
+# Return statement completes with ReturnValueException instance, raised only by Interpreter.run.
+BREAK = 1
+CONTINUE = 2
 
-class Interpreter(object):
+
+def shared_slot(node: Expr):  # slot of variable whose matrix is the value of node, itself or its transposed view
+    if isinstance(node, Variable) and isinstance(node.value, Id) and node.minus % 2 == 0:
+        return node.value.slot
+    return None
+
+
+class Interpreter(NodeVisitor):
     _ops = {
         "+": operator.add,
         "-": operator.sub,
@@ -32,44 +45,59 @@ class Interpreter(object):
         "*=": operator.mul,
         "/=": operator.truediv
     }
+    _in_place_ops = {"+=": np.add, "-=": np.subtract, "*=": np.multiply, "/=": np.true_divide}
+    in_place = True  # compound assignment updates matrix in place when its variable owns it
+    _fused_ops = {".+": operator.add, ".-": operator.sub, ".*": operator.mul, "./": operator.truediv}
+    _fused_ufuncs = {".+": np.add, ".-": np.subtract, ".*": np.multiply, "./": np.true_divide}
+    fusion_chunk = 1 << 14  # elements per chunk of fused evaluation, so intermediates stay in cache
+    lazy_size = 1 << 16  # eye, zeros and ones of at least this many elements are created as LazyMatrix
 
-    def __init__(self):
-        self.memory = MemoryStack()
+    def __init__(self, dtype: str = "float64"):
+        self.float_dtype = np.dtype(dtype)  # dtype of float matrices, int matrices stay int
+        self.memory = FrameStack(0)
+        self.literals = {}  # SimpleMatrix -> prepared literal, see _prepare_literal
+        self.resolver = Resolver()
+        self.owned = set()  # slots of matrices bound fresh, no other variable or view refers to them
 
-    @on('node')
-    def visit(self, node):
-        pass
+    def run(self, node: AstNode):
+        self.memory = FrameStack(self.resolver.resolve(node))
+        self.literals = {}
+        self.owned.clear()
+        signal = self.visit(node)
+        if isinstance(signal, ReturnValueException):
+            raise signal
 
-    @when(AstNode)
-    def visit(self, node: AstNode):
-        print(f"No visitor for node {node.__class__.__name__}")
+    def start(self):  # starts streamed program, whose top-level statements are run one by one by run_next
+        self.memory = FrameStack(self.resolver.resolve(Statements([])))
+        self.owned.clear()
 
-    @when(Statement)
-    def visit(self, node: Statement):
+    def run_next(self, node: AstNode):  # runs next part of streamed program, variables of previous parts are kept
+        self.memory.slots.extend([None] * (self.resolver.resolve_next(node) - len(self.memory.slots)))
+        self.literals = {}  # nodes of finished parts are not kept
+        signal = self.visit(node)
+        if isinstance(signal, ReturnValueException):
+            raise signal
+
+    def visit_AstNode(self, node: AstNode):
         print(f"No visitor for node {node.__class__.__name__}")
 
-    @when(Statements)
-    def visit(self, node: Statements):
+    def visit_Statements(self, node: Statements):
         for statement in node.statements:
             if isinstance(statement, Statements):
                 self.memory.push()
-                statement.accept(self)
+                signal = self.visit(statement)
                 self.memory.pop()
             else:
-                statement.accept(self)
-
-    @when(Expr)
-    def visit(self, node: Expr):
-        return node.accept(self)
+                signal = self.visit(statement)
+            if signal:
+                return signal
 
-    @when(Id)
-    def visit(self, node: Id):
-        return self.memory.get(node.value)
+    def visit_Id(self, node: Id):
+        return self.memory.get(node.slot)
 
-    @when(Variable)
-    def visit(self, node: Variable):
+    def visit_Variable(self, node: Variable):
         if isinstance(node.value, Id) or isinstance(node.value, Matrix):
-            value = node.value.accept(self)
+            value = self.visit(node.value)
         else:
             value = node.value
 
@@ -78,22 +106,31 @@ class Interpreter(object):
         value = value if node.minus % 2 == 0 else -value
         return value
 
-    @when(Matrix)
-    def visit(self, node: Matrix):
-        return node.accept(self)
-
-    @when(SpecialMatrix)
-    def visit(self, node: SpecialMatrix):
-        value = node.expressions[0].accept(self)
+    def visit_SpecialMatrix(self, node: SpecialMatrix):
+        value = self.visit(node.expressions[0])
+        if value * value >= self.lazy_size:
+            return LazyMatrix.special(node.special, value, self.float_dtype)
         if node.special == "eye":
-            return np.eye(value)
+            return np.eye(value, dtype=self.float_dtype)
         elif node.special == "zeros":
-            return np.zeros((value, value))
+            return np.zeros((value, value), dtype=self.float_dtype)
         else:  # ones
-            return np.ones((value, value))
+            return np.ones((value, value), dtype=self.float_dtype)
+
+    def visit_SimpleMatrix(self, node: SimpleMatrix):
+        literal = self.literals.get(node)
+        if literal is None:
+            literal = self.literals[node] = self._prepare_literal(node, self.float_dtype)
+        template, slots, positions = literal
+        if not slots:
+            return template.copy()  # copying prebuilt array is much cheaper than np.array of nested lists
+        values = [self.memory.get(slot) for slot in slots]
+        matrix = template.astype(self._cast_dtype(np.result_type(template, *values)))  # as np.array of values
+        matrix.flat[positions] = values
+        return matrix
 
-    @when(SimpleMatrix)
-    def visit(self, node: SimpleMatrix):
+    @staticmethod
+    def _prepare_literal(node: SimpleMatrix, float_dtype: np.dtype):  # returns template, Id slots and positions
         def _create_matrix(vector: List[any]):
             outer = []
             inner = []
@@ -106,97 +143,227 @@ class Interpreter(object):
             outer.append(inner)
             return outer
 
+        def _flatten(vector: List[any]):
+            for el in vector:
+                if isinstance(el, list):
+                    yield from _flatten(el)
+                else:
+                    yield el
+
+        def _placeholders(vector: List[any]):
+            return [_placeholders(el) if isinstance(el, list) else 0 if isinstance(el, Id) else el
+                    for el in vector]
+
         matrix = _create_matrix(node.vector) if ';' in node.vector else node.vector
-        return np.array(matrix)
+        ids = [(position, el.slot) for position, el in enumerate(_flatten(matrix)) if isinstance(el, Id)]
+        template = np.array(_placeholders(matrix))
+        if template.dtype.kind == 'f':
+            template = template.astype(float_dtype)
+        template.flags.writeable = False
+        return template, [slot for _, slot in ids], [position for position, _ in ids]
+
+    def visit_Block(self, node: Block):
+        return self.visit(node.statements)
+
+    def visit_FusedExpr(self, node: FusedExpr):
+        values = [self.visit(leaf) for leaf in node.leaves]
+        shape = next((value.shape for value in values if isinstance(value, np.ndarray)), ())
+        if len(shape) != 2 or shape[0] * shape[1] <= self.fusion_chunk \
+                or any(isinstance(value, np.ndarray) and value.shape != shape or isinstance(value, LazyMatrix)
+                       for value in values):
+            return self._evaluate(node.code, values)[-1]
+
+        # the first chunk is evaluated as usual, its intermediates become buffers for the following chunks
+        rows = max(1, self.fusion_chunk // shape[1])
+        temps = self._evaluate(node.code, [value[:rows] if isinstance(value, np.ndarray) else value
+                                           for value in values])[len(values):]
+        result = np.empty(shape, dtype=temps[-1].dtype)
+        result[:rows] = temps[-1]
+        for start in range(rows, shape[0], rows):
+            stop = min(start + rows, shape[0])
+            registers = [value[start:stop] if isinstance(value, np.ndarray) else value for value in values] + temps
+            for k, (op, operands) in enumerate(node.code):  # buffers already have cast dtype
+                out = result[start:stop] if k == len(node.code) - 1 else temps[k]
+                if isinstance(out, np.ndarray):  # scalar intermediates do not depend on chunk
+                    registers[len(values) + k] = self._fused_ufuncs[op](*[registers[i] for i in operands],
+                                                                        out=out[:stop - start])
+        return result
+
+    def _evaluate(self, code: List[tuple], registers: List[any]):  # appends results of instructions to registers
+        for op, operands in code:
+            registers.append(self._cast(self._fused_ops[op](*[registers[i] for i in operands])))
+        return registers
 
-    @when(Block)
-    def visit(self, node: Block):
-        node.statements.accept(self)
+    def _cast_dtype(self, dtype: np.dtype):  # dtype of the policy for float results
+        return self.float_dtype if dtype.kind == 'f' else dtype
 
-    @when(If)
-    def visit(self, node: If):
-        cond = node.cond_expr.accept(self)
+    def _cast(self, value):  # float matrix computed by numpy, usually float64, in float dtype of the policy
+        if self.float_dtype != np.float64 and isinstance(value, (np.ndarray, LazyMatrix)) \
+                and value.dtype.kind == 'f' and value.dtype != self.float_dtype:
+            return value.astype(self.float_dtype, copy=False)
+        return value
+
+    def visit_If(self, node: If):
+        cond = self.visit(node.cond_expr)
         if cond:
-            node.if_block.accept(self)
+            return self.visit(node.if_block)
         elif node.else_block:
-            node.else_block.accept(self)
-
-    @when(While)
-    def visit(self, node: While):
-        while node.cond_expr.accept(self):
-            try:
-                node.while_block.accept(self)
-            except BreakException:
+            return self.visit(node.else_block)
+
+    def visit_While(self, node: While):
+        while self.visit(node.cond_expr):
+            signal = self.visit(node.while_block)
+            if signal == BREAK:
                 break
-            except ContinueException:
-                continue
+            elif signal and signal != CONTINUE:
+                return signal
 
-    @when(ForExpr)
-    def visit(self, node: ForExpr):
-        return node.for_id.value, node.start_expr.accept(self), node.end_expr.accept(self)
+    def visit_ForExpr(self, node: ForExpr):
+        return node.for_id.slot, self.visit(node.start_expr), self.visit(node.end_expr)
 
-    @when(For)
-    def visit(self, node: For):
+    def visit_For(self, node: For):
         self.memory.push()
-        var_id, start, end = node.iteration.accept(self)
-        self.memory.put(var_id, start)
-        while self.memory.get(var_id) < end:
-            try:
-                node.for_block.accept(self)
-            except BreakException:
+        slot, start, end = self.visit(node.iteration)
+        self.memory.put(slot, start)
+        signal = None
+        while self.memory.get(slot) < end:
+            signal = self.visit(node.for_block)
+            self.memory.put(slot, self.memory.get(slot) + 1)  # doesn't matter for break anyway
+            if signal == CONTINUE:
+                signal = None
+            elif signal:  # break or return
                 break
-            except ContinueException:
-                continue
-            finally:
-                self.memory.put(var_id, self.memory.get(var_id) + 1)  # doesn't matter for break anyway
         self.memory.pop()
+        return signal if signal != BREAK else None
+
+    def visit_VectorizedFor(self, node: VectorizedFor):
+        bounds = []
+        for loop in node.loops:
+            start, end = self.visit(loop.iteration.start_expr), self.visit(loop.iteration.end_expr)
+            if not start < end:
+                return self.visit_For(node)  # nothing to vectorize, scalar loop sets counters as usual
+            bounds.append((start, end))
+
+        slot = node.assignment.assign_id.slot
+        matrix = self.memory.get(slot)
+        if isinstance(matrix, LazyMatrix):  # writes whole block, keep dense array unless variable shares it
+            dense = matrix.dense()
+            if slot in self.owned:
+                self.memory.put(slot, dense)
+            matrix = dense
+        if not isinstance(matrix, np.ndarray) or matrix.ndim != 2:
+            return self.visit_For(node)
+        counters = {loop.iteration.for_id.slot: (start, end - 1) for loop, (start, end) in zip(node.loops, bounds)}
+        try:
+            self._int_bounds(node.assignment.expression, counters)
+        except OverflowError:  # int64 grids would wrap around where Python ints of scalar loop do not
+            return self.visit_For(node)
+        for loop, grid in zip(node.loops, np.ix_(*[np.arange(start, end) for start, end in bounds])):
+            self.memory.put(loop.iteration.for_id.slot, grid)
+        indexes = tuple(self.visit(ref) for ref in node.assignment.with_ref)
+        try:
+            with np.errstate(divide='raise', invalid='raise'):
+                value = self.visit(node.assignment.expression)
+            valid = all(np.all((-size <= index) & (index < size)) for index, size in zip(indexes, matrix.shape))
+        except (FloatingPointError, OverflowError):
+            valid = False
+        if not valid:
+            return self.visit_For(node)  # scalar loop raises the same error as without vectorization
+        matrix[indexes] = value
+        for loop, (start, end) in zip(node.loops, bounds):
+            self.memory.put(loop.iteration.for_id.slot, end)
+
+    def _int_bounds(self, node: Expr, counters: dict):
+        """Returns (low, high, array) bounds of int values of scalar expression while loop counters in slot ->
+        (start, last) run at once, array tells if they depend on counters, None if values are not ints.
+
+        Raises OverflowError if int64 grids of vectorized loop would give other values than Python ints.
+        """
+        if isinstance(node, Variable):
+            if isinstance(node.value, Id) and node.value.slot in counters:
+                low, high = counters[node.value.slot]
+                array = True
+                if not isinstance(low, int) or not isinstance(high, int):
+                    return None
+            else:
+                value = self.memory.get(node.value.slot) if isinstance(node.value, Id) else node.value
+                if not isinstance(value, (int, np.integer)) or isinstance(value, bool):
+                    return None
+                low = high = int(value)
+                array = False
+            return (-high, -low, array) if node.minus % 2 else (low, high, array)
+        if not isinstance(node, BinOp):
+            return None
+        left, right = self._int_bounds(node.left_expr, counters), self._int_bounds(node.right_expr, counters)
+        if left is None or right is None:  # int64 grids are converted to float the same way as Python ints
+            return None
+        bounds = [left, right]
+        if node.bin_op in ("+", "-", "*", ".+", ".-", ".*"):
+            corners = [self._ops[node.bin_op](a, b) for a in left[:2] for b in right[:2]]
+            bounds.append((min(corners), max(corners), left[2] or right[2]))
+        if left[2] or right[2]:  # Python ints of scalar operations are exact
+            limit = 1 << 53 if node.bin_op in ("/", "./") else 1 << 63  # int64 divides as float, exact to 2 ** 53
+            for low, high, _ in bounds:
+                if not -limit <= low <= high < limit:
+                    raise OverflowError(f"{node.bin_op} leaves range of int64 grids")
+        return bounds[2] if len(bounds) == 3 else None
 
-    @when(Print)
-    def visit(self, node: Print):
-        values = [expr.accept(self) for expr in node.expressions]
+    def visit_Print(self, node: Print):
+        values = [self.visit(expr) for expr in node.expressions]
         print(*values, sep=" ")
 
-    @when(Assignment)
-    def visit(self, node: Assignment):
-        value = node.expression.accept(self)
-        name = node.assign_id.value
+    def visit_Assignment(self, node: Assignment):
+        value = self.visit(node.expression)
+        slot = node.assign_id.slot
         if node.with_ref:
-            matrix = self.memory.get(name)
-            first_slice = node.with_ref[0].accept(self)
-            second_slice = node.with_ref[1].accept(self)
-            matrix[first_slice][second_slice] = value
+            matrix = self.memory.get(slot)
+            first_slice = self.visit(node.with_ref[0])
+            second_slice = self.visit(node.with_ref[1])
+            if isinstance(matrix, LazyMatrix):
+                matrix[first_slice, second_slice] = value
+                if matrix.densified and slot in self.owned:  # no other variable shares it
+                    self.memory.put(slot, matrix.dense())
+            else:
+                matrix[first_slice][second_slice] = value
         else:
             if node.assign_op == "=":
-                self.memory.put(name, value)
+                self.memory.put(slot, value)
+                source = shared_slot(node.expression)
+                if source is None:
+                    self.owned.add(slot)
+                else:  # both variables see the same matrix
+                    self.owned.discard(source)
+                    self.owned.discard(slot)
             else:
-                var_value = node.assign_id.accept(self)
-                evaluated_value = self._ops[node.assign_op](var_value, value)
-                self.memory.put(name, evaluated_value)
+                var_value = self.visit(node.assign_id)
+                # owned, so no alias or view sees the write
+                if self.in_place and slot in self.owned and self._updatable(var_value, value, node.assign_op):
+                    self._in_place_ops[node.assign_op](var_value, value, out=var_value)
+                else:
+                    self.memory.put(slot, self._cast(self._ops[node.assign_op](var_value, value)))
+                    self.owned.add(slot)
 
-    @when(Assignments)
-    def visit(self, node: Assignments):
+    def _updatable(self, matrix, value, op: str):  # whether op result cast by the policy fits into matrix
+        return isinstance(matrix, np.ndarray) and matrix.flags.owndata and matrix.flags.writeable \
+            and (np.ndim(value) == 0 or isinstance(value, np.ndarray) and value.shape == matrix.shape) \
+            and self._cast_dtype(np.result_type(matrix, value)) == matrix.dtype \
+            and (op != "/=" or matrix.dtype.kind == 'f')
+
+    def visit_Assignments(self, node: Assignments):
         for assignment in node.assignments:
-            assignment.accept(self)
-
-    @when(ControlExpr)
-    def visit(self, node: ControlExpr):
-        return node.accept(self)
-
-    @when(Break)
-    def visit(self, node: Break):
-        raise BreakException
-
-    @when(Continue)
-    def visit(self, node: Continue):
-        raise ContinueException
-
-    @when(Return)
-    def visit(self, node: Return):
-        value = node.expressions[0].accept(self)
-        raise ReturnValueException(value)
-
-    @when(BinOp)
-    def visit(self, node: BinOp):
-        left = node.left_expr.accept(self)
-        right = node.right_expr.accept(self)
-        return self._ops[node.bin_op](left, right)
+            self.visit(assignment)
+
+    def visit_Break(self, node: Break):
+        return BREAK
+
+    def visit_Continue(self, node: Continue):
+        return CONTINUE
+
+    def visit_Return(self, node: Return):
+        value = self.visit(node.expressions[0])
+        return ReturnValueException(value)
+
+    def visit_BinOp(self, node: BinOp):
+        left = self.visit(node.left_expr)
+        right = self.visit(node.right_expr)
+        return self._cast(self._ops[node.bin_op](left, right))
@@ -0,0 +1,62 @@
+from AST import *
+from Interpreter import BREAK, CONTINUE, Interpreter
+from visit import IterativeVisitor
+
+
+class IterativeInterpreter(IterativeVisitor, Interpreter):
+    """Interpreter visiting nested statements and operators on explicit stack, for ASTs of any depth.
+
+    Only nodes which can nest without limit are generators: statement lists, blocks, branches, loops and
+    binary operators. Other nodes keep Interpreter methods, whose visit of a child starts its own explicit
+    stack, so Python stack stays constant. Vectorizer and Fuser are recursive, their nodes are not created
+    for this interpreter.
+    """
+
+    def visit_Statements(self, node: Statements):
+        for statement in node.statements:
+            if isinstance(statement, Statements):
+                self.memory.push()
+                signal = yield statement
+                self.memory.pop()
+            else:
+                signal = yield statement
+            if signal:
+                return signal
+
+    def visit_Block(self, node: Block):
+        return (yield node.statements)
+
+    def visit_If(self, node: If):
+        cond = yield node.cond_expr
+        if cond:
+            return (yield node.if_block)
+        elif node.else_block:
+            return (yield node.else_block)
+
+    def visit_While(self, node: While):
+        while (yield node.cond_expr):
+            signal = yield node.while_block
+            if signal == BREAK:
+                break
+            elif signal and signal != CONTINUE:
+                return signal
+
+    def visit_For(self, node: For):
+        self.memory.push()
+        slot, start, end = self.visit(node.iteration)
+        self.memory.put(slot, start)
+        signal = None
+        while self.memory.get(slot) < end:
+            signal = yield node.for_block
+            self.memory.put(slot, self.memory.get(slot) + 1)
+            if signal == CONTINUE:
+                signal = None
+            elif signal:  # break or return
+                break
+        self.memory.pop()
+        return signal if signal != BREAK else None
+
+    def visit_BinOp(self, node: BinOp):
+        left = yield node.left_expr
+        right = yield node.right_expr
+        return self._cast(self._ops[node.bin_op](left, right))
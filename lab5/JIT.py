@@ -0,0 +1,219 @@
+from collections import defaultdict
+
+import numpy as np
+
+from AST import *
+from Exceptions import ReturnValueException
+from Interpreter import BREAK, CONTINUE, Interpreter, shared_slot
+from Transpiler import PythonGenerator
+
+DEOPT = object()  # returned by compiled loop whose guards failed, loop continues in Interpreter
+
+
+class LoopGenerator(PythonGenerator):
+    """Generates Python function continuing hot loop of TracingInterpreter, specialized on observed values.
+
+    Variables are read and written directly in slots list of the interpreter memory, so the rest is
+    delegated back to the interpreter: matrix literals, eye/zeros/ones, fused chains, vectorized loops and
+    matrix operations needing dtype policy. Element stores and element-wise operations of matrices not
+    assigned in the loop are specialized on their observed ndarray type, dtype and shape, checked by
+    guards on every entry of the function.
+    """
+    _ufuncs = {".+": np.add, ".-": np.subtract, ".*": np.multiply, "./": np.true_divide}
+
+    def __init__(self, interpreter: Interpreter):
+        super().__init__()
+        self.interpreter = interpreter
+        self.slots = []
+        self.loop = None
+        self.nodes = []  # nodes delegated to interpreter, bound as n0, n1, ... in generated module
+        self.guards = {}  # slot -> observed ndarray of specialized matrices
+
+    def compile(self, loop: Union[For, While], slots: list):  # returns function loop(slots, ...)
+        self.slots, self.loop, self.nodes, self.guards = slots, loop, [], {}
+        self.lines, self.indent, self.temps = [], 1, 0
+        if isinstance(loop, For):
+            var = self.visit(loop.iteration.for_id)
+            self._for_loop(loop, var, "_start", "_end")
+            header, entry = "def loop(s, _start, _end):", "type(_start) is int and type(_end) is int"
+        else:
+            self.visit_While(loop)
+            header, entry = "def loop(s):", "True"
+        body = self.lines
+        guards = " and ".join([entry] + [f"type(s[{slot}]) is np.ndarray and s[{slot}].dtype == d{slot} "
+                                         f"and s[{slot}].shape == {value.shape}"
+                                         for slot, value in self.guards.items()])
+        self.lines, self.indent = [header], 1
+        self._line(f"if not ({guards}):")
+        self.indent += 1
+        self._line("return DEOPT")
+        source = "\n".join(self.lines + body) + "\n"
+        namespace = {"np": np, "ReturnValueException": ReturnValueException, "DEOPT": DEOPT,
+                     "visit": self.interpreter.visit, "owned": self.interpreter.owned}
+        namespace.update({f"n{k}": node for k, node in enumerate(self.nodes)})
+        namespace.update({f"d{slot}": value.dtype for slot, value in self.guards.items()})
+        exec(compile(source, f"<loop {loop.lineno}>", "exec"), namespace)
+        return namespace["loop"]
+
+    def _delegate(self, node: AstNode):  # name of node evaluated by interpreter
+        self.nodes.append(node)
+        return f"n{len(self.nodes) - 1}"
+
+    def _delegate_statement(self, node: AstNode):
+        self._line(f"_r = visit({self._delegate(node)})")
+        self._line("if _r is not None:")
+        self.indent += 1
+        self._line("return _r")
+        self.indent -= 1
+
+    def _invariant_matrix(self, node: Expr):  # observed ndarray of variable not assigned in the loop, or None
+        if not isinstance(node, Variable) or not isinstance(node.value, Id) or node.minus % 2 \
+                or self._assigns(self.loop, node.value.value):
+            return None
+        value = self.slots[node.value.slot]
+        return value if type(value) is np.ndarray and value.ndim == 2 else None
+
+    def _for_loop(self, node: For, var: str, start: str, end: str):  # as PythonGenerator.visit_For
+        if self._assigns(node.for_block, node.iteration.for_id.value):
+            self.loops.append((var, False))
+            self._line(f"{var} = {start}")
+            self._line(f"while {var} < {end}:")
+            self._body(node.for_block)
+            self.indent += 1
+            self._line(f"{var} += 1")
+            self.indent -= 1
+        else:
+            self.loops.append((var, True))
+            self._line(f"for {var} in range({start}, {end}):")
+            self._body(node.for_block)
+            self._line("else:")
+            self.indent += 1
+            self._line(f"{var} = max({start}, {end})")
+            self.indent -= 1
+        self.loops.pop()
+
+    def visit_Id(self, node: Id):
+        return f"s[{node.slot}]"
+
+    def visit_SpecialMatrix(self, node: SpecialMatrix):
+        return f"visit({self._delegate(node)})"
+
+    def visit_SimpleMatrix(self, node: SimpleMatrix):
+        return f"visit({self._delegate(node)})"
+
+    def visit_BinOp(self, node: BinOp):
+        if node.bin_op not in self._ufuncs:  # scalar operation
+            return super().visit_BinOp(node)
+        left, right = self._invariant_matrix(node.left_expr), self._invariant_matrix(node.right_expr)
+        if isinstance(node, FusedExpr) or left is None or right is None or left.dtype != right.dtype \
+                or (left.dtype.kind == 'f' or node.bin_op == "./") and left.dtype != self.interpreter.float_dtype:
+            return f"visit({self._delegate(node)})"
+        self.guards[node.left_expr.value.slot] = left
+        self.guards[node.right_expr.value.slot] = right
+        ufunc = self._ufuncs[node.bin_op].__name__
+        return f"np.{ufunc}({self.visit(node.left_expr)}, {self.visit(node.right_expr)})"
+
+    def visit_VectorizedFor(self, node: VectorizedFor):
+        self._delegate_statement(node)
+
+    def visit_Assignment(self, node: Assignment):
+        if node.with_ref:
+            matrix = self._invariant_matrix(Variable(node.assign_id))
+            if matrix is None:
+                return self._delegate_statement(node)
+            self.guards[node.assign_id.slot] = matrix
+        elif node.matrix:  # matrix compound assignment, in place when possible
+            return self._delegate_statement(node)
+        super().visit_Assignment(node)
+        source = shared_slot(node.expression) if not node.with_ref and node.assign_op == "=" else None
+        if source is not None:  # as in Interpreter, neither variable owns the matrix
+            self._line(f"owned.discard({source})")
+            self._line(f"owned.discard({node.assign_id.slot})")
+
+    def visit_Return(self, node: Return):
+        self._line(f"return ReturnValueException({self.visit(node.expressions[0])})")
+
+
+class TracingInterpreter(Interpreter):
+    """Interpreter counting loop iterations and running loops which became hot as compiled Python code.
+
+    Once a loop ran threshold iterations in total, LoopGenerator compiles it specialized on the current
+    values, the loop continues in the compiled function and later entries start there. If guards of the
+    function fail, it is dropped and the loop continues interpreted until it becomes hot again.
+    """
+    threshold = 100
+
+    def __init__(self, dtype: str = "float64"):
+        super().__init__(dtype)
+        self.counters = defaultdict(int)  # loop -> iterations interpreted since last compilation
+        self.traces = {}  # loop -> compiled function
+
+    def run_next(self, node: AstNode):
+        try:
+            super().run_next(node)
+        finally:  # loops of finished part of streamed program are not run again
+            self.counters.clear()
+            self.traces.clear()
+
+    def _trace(self, node: Union[For, While], *args):  # runs compiled loop, DEOPT if guards failed
+        trace = self.traces.get(node)
+        if trace is None:
+            trace = self.traces[node] = LoopGenerator(self).compile(node, self.memory.slots)
+        signal = trace(self.memory.slots, *args)
+        if signal is DEOPT:
+            del self.traces[node]
+            self.counters[node] = 0
+        return signal
+
+    def visit_For(self, node: For):
+        self.memory.push()
+        slot, start, end = self.visit(node.iteration)
+        self.memory.put(slot, start)
+        signal = DEOPT
+        if self.counters[node] >= self.threshold:
+            signal = self._trace(node, start, end)
+        if signal is DEOPT:
+            signal = None
+            budget = max(self.threshold - self.counters[node], 1)
+            iterations = 0
+            while self.memory.get(slot) < end:
+                signal = self.visit(node.for_block)
+                self.memory.put(slot, self.memory.get(slot) + 1)
+                if signal == CONTINUE:
+                    signal = None
+                elif signal:  # break or return
+                    break
+                iterations += 1
+                if iterations == budget:
+                    self.counters[node] += iterations
+                    iterations = 0
+                    signal = self._trace(node, self.memory.get(slot), end)
+                    if signal is not DEOPT:
+                        break
+                    signal = None
+            self.counters[node] += iterations
+        self.memory.pop()
+        return signal if signal != BREAK else None
+
+    def visit_While(self, node: While):
+        signal = DEOPT
+        if self.counters[node] >= self.threshold:
+            signal = self._trace(node)
+        if signal is not DEOPT:
+            return signal
+        budget = max(self.threshold - self.counters[node], 1)
+        iterations = 0
+        while self.visit(node.cond_expr):
+            signal = self.visit(node.while_block)
+            if signal == BREAK:
+                break
+            elif signal and signal != CONTINUE:
+                return signal
+            iterations += 1
+            if iterations == budget:
+                self.counters[node] += iterations
+                iterations = 0
+                signal = self._trace(node)
+                if signal is not DEOPT:
+                    return signal
+        self.counters[node] += iterations
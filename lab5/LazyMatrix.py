@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class Storage(object):
+    """Elements of n x n matrix kept as diagonal and fill values with explicitly stored entries, or dense array."""
+
+    def __init__(self, n: int, dtype: np.dtype, diagonal, fill, entries: dict = None):
+        self.n = n
+        self.dtype = dtype
+        self.diagonal = dtype.type(diagonal)
+        self.fill = dtype.type(fill)
+        self.entries = entries if entries is not None else {}  # (row, column) -> value, sparse coordinates
+        self.array = None  # dense elements once densified, shared by all views
+
+    def get(self, key: tuple):
+        value = self.entries.get(key)
+        if value is None:
+            return self.diagonal if key[0] == key[1] else self.fill
+        return value
+
+    def densify(self):
+        if self.array is None:
+            array = np.full((self.n, self.n), self.fill, dtype=self.dtype)
+            np.fill_diagonal(array, self.diagonal)
+            if self.entries:
+                rows, columns = zip(*self.entries)
+                array[rows, columns] = list(self.entries.values())
+            self.array, self.entries = array, None
+        return self.array
+
+
+class LazyMatrix(np.lib.mixins.NDArrayOperatorsMixin):
+    """View of Storage behaving like ndarray for Interpreter: element-wise operators, transpose and A[i, j] = v.
+
+    Operations of lazy matrices and scalars are computed only for diagonal, fill and stored entries, so eye,
+    zeros and ones stay compact. Transposed views share storage, writes are seen by all of them as in numpy.
+    Storage is densified once stored entries exceed density fraction of elements, other numpy calls get
+    dense array.
+    """
+    density = 0.01
+    ndim = 2
+    _ufuncs = {np.add, np.subtract, np.multiply, np.true_divide, np.negative}
+
+    def __init__(self, storage: Storage, transposed: bool = False):
+        self.storage = storage
+        self.transposed = transposed
+
+    @staticmethod
+    def special(kind: str, n: int, dtype: np.dtype):  # lazy eye, zeros or ones of size n
+        fill = 1 if kind == "ones" else 0
+        return LazyMatrix(Storage(n, dtype, 1 if kind == "eye" else fill, fill))
+
+    @property
+    def shape(self):
+        return self.storage.n, self.storage.n
+
+    @property
+    def dtype(self):
+        return self.storage.dtype
+
+    @property
+    def densified(self):
+        return self.storage.array is not None
+
+    def dense(self):
+        array = self.storage.densify()
+        return array.T if self.transposed else array
+
+    def transpose(self, axes=None):  # called by np.transpose
+        if axes is not None and tuple(axes) != (1, 0):
+            return np.transpose(self.dense(), axes)
+        return LazyMatrix(self.storage, not self.transposed)
+
+    def astype(self, dtype, copy: bool = True):
+        dtype = np.dtype(dtype)
+        if self.densified:
+            return self.dense().astype(dtype, copy=copy)
+        if dtype == self.dtype and not copy:
+            return self
+        storage = self.storage
+        entries = {key: dtype.type(value) for key, value in storage.entries.items()}
+        return LazyMatrix(Storage(storage.n, dtype, storage.diagonal, storage.fill, entries), self.transposed)
+
+    def _key(self, key: tuple):  # coordinates in storage of element <key> of this view
+        return (key[1], key[0]) if self.transposed else key
+
+    def __setitem__(self, key: tuple, value):
+        if self.densified:
+            self.dense()[key[0]][key[1]] = value  # the same errors as for ndarray in Interpreter
+            return
+        n = self.storage.n
+        for index in key:
+            if not -n <= index < n:
+                raise IndexError(f"index {index} is out of bounds for axis 0 with size {n}")
+        storage = self.storage
+        storage.entries[self._key((key[0] % n, key[1] % n))] = self.dtype.type(value)
+        if len(storage.entries) > self.density * n * n:
+            storage.densify()
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.dense()
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        matrices = [x for x in inputs if isinstance(x, LazyMatrix)]
+        if method == "__call__" and not kwargs and ufunc in self._ufuncs \
+                and all(isinstance(x, LazyMatrix) or np.ndim(x) == 0 for x in inputs) \
+                and not any(x.densified or x.shape != self.shape for x in matrices):
+            return self._apply(ufunc, inputs, matrices)
+        inputs = [x.dense() if isinstance(x, LazyMatrix) else x for x in inputs]
+        if "out" in kwargs:
+            kwargs["out"] = tuple(x.dense() if isinstance(x, LazyMatrix) else x for x in kwargs["out"])
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def _apply(self, ufunc, inputs: tuple, matrices: list):
+        keys = list(set().union(*[{x._key(key) for key in x.storage.entries} for x in matrices]))
+        # diagonal, fill and every stored entry computed at once, with numpy dtypes and floating point errors
+        operands = [np.array([x.storage.diagonal, x.storage.fill] + [x.storage.get(x._key(key)) for key in keys],
+                             dtype=x.dtype) if isinstance(x, LazyMatrix) else x for x in inputs]
+        values = ufunc(*operands)
+        storage = Storage(self.storage.n, values.dtype, values[0], values[1], dict(zip(keys, values[2:])))
+        if len(keys) > self.density * storage.n * storage.n:
+            return storage.densify()
+        return LazyMatrix(storage)
+
+    def __str__(self):
+        return str(self.dense())
+
+    def __repr__(self):
+        return repr(self.dense())
@@ -27,3 +27,35 @@ class MemoryStack:
 
     def pop(self):  # pops the top memory from the stack
         self.memories.pop()
+
+
+class Frame:
+
+    def __init__(self, slots):  # list of variable values indexed by slot assigned by Resolver
+        self.slots = slots
+
+    def get(self, slot):  # gets from frame current value of variable in <slot>
+        return self.slots[slot]
+
+    def put(self, slot, value):  # puts into frame current value of variable in <slot>
+        self.slots[slot] = value
+
+
+class FrameStack:
+
+    def __init__(self, size):  # initialize frame stack with global frame of <size> slots
+        self.frames = [Frame([None] * size)]
+        self.slots = self.frames[-1].slots  # slots of the top frame, read directly on the hot path
+
+    def get(self, slot):  # gets from frame stack current value of variable in <slot>
+        return self.slots[slot]
+
+    def put(self, slot, value):  # inserts into frame stack variable in <slot> with value <value>
+        self.slots[slot] = value
+
+    def push(self):  # pushes frame sharing slots of the current one, the same as MemoryStack does
+        self.frames.append(Frame(self.slots))
+
+    def pop(self):  # pops the top frame from the stack
+        self.frames.pop()
+        self.slots = self.frames[-1].slots
@@ -0,0 +1,76 @@
+from AST import *
+from Interpreter import Interpreter
+from visit import IterativeVisitor
+
+
+class Optimizer(IterativeVisitor):
+    """Folds constant scalar expressions and removes branches with constant conditions.
+
+    Runs after TypeChecker, so operand types are already known to be valid. Division by constant zero
+    is left in place to fail at runtime as before. The number of folded nodes is kept in self.folded.
+    """
+    _ops = Interpreter._ops
+    _folded_ops = {'+', '-', '*', '/', '<', '<=', '>', '>=', '==', '!='}
+
+    def __init__(self):
+        self.folded = 0
+
+    def optimize(self, node: AstNode):
+        self.folded = 0
+        return self.visit(node)
+
+    @staticmethod
+    def _constant(node: AstNode):
+        return isinstance(node, Variable) and type(node.value) in {int, float, bool} and node.minus == 0
+
+    def visit_AstNode(self, node: AstNode):
+        for name, value in vars(node).items():
+            if isinstance(value, list):
+                for i, el in enumerate(value):
+                    if isinstance(el, AstNode):
+                        value[i] = yield el
+                value[:] = [el for el in value if el is not None]  # removed statements
+            elif isinstance(value, AstNode):
+                setattr(node, name, (yield value))
+        return node
+
+    def visit_Block(self, node: Block):
+        node.statements = (yield node.statements) or Statements([])
+        return node
+
+    def visit_Variable(self, node: Variable):
+        if isinstance(node.value, AstNode):
+            node.value = yield node.value
+        if node.minus > 1 or node.trans > 1:
+            node.minus, node.trans = node.minus % 2, node.trans % 2
+            self.folded += 1
+        if node.minus and type(node.value) in {int, float}:
+            node.value, node.minus = -node.value, 0
+            self.folded += 1
+        return node
+
+    def visit_BinOp(self, node: BinOp):
+        node.left_expr = yield node.left_expr
+        node.right_expr = yield node.right_expr
+        if node.bin_op not in self._folded_ops or not self._constant(node.left_expr) \
+                or not self._constant(node.right_expr):
+            return node
+        if node.bin_op == '/' and node.right_expr.value == 0:
+            return node
+        self.folded += 1
+        value = self._ops[node.bin_op](node.left_expr.value, node.right_expr.value)
+        return Variable(value, lineno=node.lineno)
+
+    def visit_If(self, node: If):
+        yield from self.visit_AstNode(node)
+        if not self._constant(node.cond_expr):
+            return node
+        self.folded += 1
+        return node.if_block if node.cond_expr.value else node.else_block
+
+    def visit_While(self, node: While):
+        yield from self.visit_AstNode(node)
+        if self._constant(node.cond_expr) and not node.cond_expr.value:
+            self.folded += 1
+            return None
+        return node
@@ -0,0 +1,179 @@
+import resource
+import time
+
+from AST import *
+from Exceptions import ReturnValueException
+
+
+def count_nodes(program):  # number of AST nodes of program
+    count = 0
+    stack = [program]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, AstNode):
+            count += 1
+            stack.extend(value.__dict__.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
+
+
+class Pipeline(object):
+    """Runs programs through explicit stages with components and options of Parser.
+
+    Stages lex -> parse -> check -> optimize -> execute return their artifacts: tokens, AST, type checked AST,
+    optimized AST and exit code. Every stage adds its wall and CPU time to stats, time of stages nested in it
+    excluded. Detailed stats also count AST nodes of artifacts and add how much max RSS of the process grew
+    during the stage, so stages raising the peak memory show up. Stages allocating less than an earlier peak
+    grow it by 0, per stage peaks would need tracemalloc, which slows stages several times. With ASTCache,
+    load replaces lex, parse and check of cached program, store saves checked one. Streamed programs are
+    lexed while parsed, their statements are checked and run inside parse.
+    """
+
+    def __init__(self, parser, detailed: bool = False):
+        self.parser = parser
+        self.detailed = detailed
+        self.stats = {}  # of stages of the last program in order: wall_ms, cpu_ms, count and rss_growth_kib
+        self._inner = [0.0, 0.0, 0]  # wall and CPU seconds and max RSS growth of stages nested in running one
+        self.illegal = False  # lexer of the last program reported illegal characters, it is not cached
+
+    def run(self, text: str, ast=False, type_check=False, interpretation=False):
+        parser = self.parser
+        parser.ast = ast
+        parser.type_check = type_check
+        parser.interpretation = interpretation
+        parser.error = False
+        parser.exit_code = None
+        parser.text = text
+        self.stats = {}
+        self.illegal = False
+        if parser.stream:
+            return self.measure('parse', parser.parse_stream, text)
+        return self._run(text)
+
+    def _run(self, text: str):  # prints tree, errors and result as selected, returns the last artifact
+        parser = self.parser
+        if parser.ast_cache and parser.type_check:
+            program = self.load(text)
+            if program is not None:  # parsed and checked without errors before, straight to interpretation
+                if parser.ast:
+                    program.printTree()
+                return self.interpret(program) if parser.interpretation else program
+        program = None
+        if parser.fast:
+            tokens = self.lex(text)
+            program = None if tokens is None else self.parse(tokens)
+        if program is None:  # PLY parser reports errors left by FastParser
+            program = self.parse(self.lex(text, fast=False), fast=False)
+        if program is None:  # PLY parser could not recover from syntax error
+            return None
+        if parser.ast:
+            if not parser.error:
+                program.printTree()
+            else:
+                print(f"Provided program has Syntax error, AST Tree won't be printed")
+        if parser.type_check:
+            if not parser.error:
+                program = self.check(program)  # Prints all Type Errors (Syntax Errors are not allowed here)
+                if parser.ast_cache and not (parser.type_checker.error or self.illegal):  # before optimizer changes it
+                    self.store(text, program)
+            else:
+                print(f"Provided program has Syntax error, Type Check won't be executed")
+        if parser.interpretation:
+            if not parser.type_check:
+                print(f"Type Check is necessary for Interpretation, Interpretation won't be executed")
+            elif parser.error:
+                print(f"Provided program has Syntax error, Interpretation won't be executed")
+            elif parser.type_checker.error:
+                print(f"Provided program has Type Error, Interpretation won't be executed")
+            else:
+                program = self.interpret(program)
+        return program
+
+    def measure(self, stage: str, fn, *args):  # calls fn, adding its time to the stage
+        stats = self.stats.setdefault(stage, {'wall_ms': 0.0, 'cpu_ms': 0.0, 'count': None, 'rss_growth_kib': None})
+        outer, self._inner = self._inner, [0.0, 0.0, 0]
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if self.detailed else 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return fn(*args)
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            stats['wall_ms'] += (wall - self._inner[0]) * 1000
+            stats['cpu_ms'] += (cpu - self._inner[1]) * 1000
+            if self.detailed:
+                rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss
+                stats['rss_growth_kib'] = (stats['rss_growth_kib'] or 0) + rss - self._inner[2]
+            outer[0] += wall
+            outer[1] += cpu
+            outer[2] += rss
+            self._inner = outer
+
+    def _count(self, stage: str, program):  # nodes of artifact of the stage, only in detailed stats
+        if self.detailed and program is not None:
+            self.stats[stage]['count'] = count_nodes(program)
+
+    def lex(self, text: str, fast: bool = None):  # tokens of FastParser, None for illegal character, or of PLY
+        parser = self.parser
+        fast = parser.fast if fast is None else fast
+        tokens = self.measure('lex', parser.fast_parser.tokenize if fast else parser.scanner.tokenize, text)
+        if tokens is not None:
+            self.stats['lex']['count'] = len(tokens[0] if fast else tokens) - 1  # without $end
+        if not fast:  # FastParser leaves programs with illegal characters to PLY
+            self.illegal = any(token.type == 'ILLEGAL' for token in tokens)
+        return tokens
+
+    def parse(self, tokens, fast: bool = None):  # AST, None for syntax error of FastParser or unrecovered one
+        parser = self.parser
+        fast = parser.fast if fast is None else fast
+        program = self.measure('parse', parser.fast_parser.parse_tokens if fast else parser.parse_tokens, tokens)
+        self._count('parse', program)
+        return program
+
+    def check(self, program: Statements):  # prints type errors, sets error of type checker
+        self.measure('check', self.parser.type_checker.visit, program)
+        self._count('check', program)
+        return program
+
+    def optimize(self, program: Statements):
+        parser = self.parser
+        program = self.measure('optimize', parser.optimizer.optimize, program)
+        self._count('optimize', program)
+        if parser.optimization_stats:
+            print(f"Optimization folded {parser.optimizer.folded} nodes")
+        return program
+
+    def execute(self, program: Statements):  # runs optimized program with selected backend, returns exit code
+        parser = self.parser
+        try:
+            self.measure('execute', parser.execute, program)
+            print(f"No return statement found during interpretation")
+        except ReturnValueException as e:
+            parser.exit_code = e.value
+            print(f"Interpretation finished with exit code {e.value}")
+        return parser.exit_code
+
+    def interpret(self, program: Statements):  # optimizes and runs type checked program, returns optimized one
+        program = self.optimize(program)
+        self.execute(program)
+        return program
+
+    def load(self, text: str):  # type checked AST of ASTCache, None if not cached
+        parser = self.parser
+        program = self.measure('load', parser.ast_cache.load, text, parser.signature)
+        self._count('load', program)
+        return program
+
+    def store(self, text: str, program: Statements):
+        parser = self.parser
+        self.measure('store', parser.ast_cache.store, text, parser.signature, program)
+
+    def report(self):  # table of stats of the last program
+        lines = [f"{'STAGE':<10}{'WALL MS':>12}{'CPU MS':>12}{'COUNT':>10}{'RSS GROWTH KIB':>16}"]
+        for stage, stats in self.stats.items():
+            count, growth = stats['count'], stats['rss_growth_kib']
+            lines.append(f"{stage:<10}{stats['wall_ms']:>12.3f}{stats['cpu_ms']:>12.3f}"
+                         f"{'-' if count is None else count:>10}{'-' if growth is None else growth:>16}")
+        lines.append(f"{'total':<10}{sum(stats['wall_ms'] for stats in self.stats.values()):>12.3f}"
+                     f"{sum(stats['cpu_ms'] for stats in self.stats.values()):>12.3f}")
+        return "\n".join(lines)
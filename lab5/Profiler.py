@@ -0,0 +1,78 @@
+import os
+import time
+from collections import defaultdict
+
+from AST import *
+from Interpreter import Interpreter
+
+
+class ProfilingInterpreter(Interpreter):
+    """Interpreter measuring calls, cumulative and self time of every visited node and source line.
+
+    Only visit is overridden, so plain Interpreter keeps its hot path untouched. Line cumulative time
+    counts only the outermost node of the line being visited, nested nodes of the same line are not
+    counted twice. Self time is also collected per stack of node labels, written as collapsed stacks.
+    """
+
+    def __init__(self, dtype: str = "float64"):
+        super().__init__(dtype)
+        self.nodes = {}  # node -> [calls, cumulative ns, self ns]
+        self.lines = {}  # lineno -> [calls, cumulative ns, self ns]
+        self.stacks = defaultdict(int)  # labels of nodes from the root -> self ns
+        self._labels = {}  # node -> 'Class:lineno' label, just 'Class' for nodes without lineno
+        self._stack = []  # labels of nodes being visited
+        self._children = [0]  # cumulative time of finished children of every node being visited
+        self._active = defaultdict(int)  # lineno -> number of its nodes being visited
+
+    def visit(self, node):
+        label = self._labels.get(node)
+        if label is None:
+            name = node.__class__.__name__
+            label = self._labels[node] = f"{name}:{node.lineno}" if node.lineno > 0 else name
+        lineno = node.lineno
+        outermost = not self._active[lineno]
+        self._active[lineno] += 1
+        self._stack.append(label)
+        self._children.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return self._dispatch[node.__class__](self, node)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            own = elapsed - self._children.pop()
+            self._children[-1] += elapsed
+            stats = self.nodes.get(node)
+            if stats is None:
+                stats = self.nodes[node] = [0, 0, 0]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] += own
+            stats = self.lines.get(lineno)
+            if stats is None:
+                stats = self.lines[lineno] = [0, 0, 0]
+            if outermost:
+                stats[0] += 1
+                stats[1] += elapsed
+            stats[2] += own
+            self.stacks[tuple(self._stack)] += own
+            self._stack.pop()
+            self._active[lineno] -= 1
+
+    def report(self, text: str = "", limit: int = 20):  # per line and top <limit> node stats sorted by self time
+        source = text.splitlines()
+        lines = [f"{'LINE':>6}{'CALLS':>12}{'CUMULATIVE MS':>16}{'SELF MS':>12}  SOURCE"]
+        for lineno, (calls, cumulative, own) in sorted(self.lines.items(), key=lambda item: -item[1][2]):
+            code = source[lineno - 1].strip() if 0 < lineno <= len(source) else ""
+            lines.append(f"{lineno if lineno > 0 else '-':>6}{calls:>12}{cumulative / 1e6:>16.3f}{own / 1e6:>12.3f}  "
+                         f"{code}")
+        lines.append("")
+        lines.append(f"{'NODE':<24}{'CALLS':>12}{'CUMULATIVE MS':>16}{'SELF MS':>12}")
+        for node, (calls, cumulative, own) in sorted(self.nodes.items(), key=lambda item: -item[1][2])[:limit]:
+            lines.append(f"{self._labels[node]:<24}{calls:>12}{cumulative / 1e6:>16.3f}{own / 1e6:>12.3f}")
+        return "\n".join(lines)
+
+    def write_stacks(self, path: str):  # collapsed stacks 'Root:1;Child:2 <self ns>' as read by flamegraph tools
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, "w") as file:
+            for stack, own in sorted(self.stacks.items()):
+                file.write(f"{';'.join(stack)} {own}\n")
@@ -0,0 +1,36 @@
+from AST import *
+from visit import IterativeVisitor
+
+
+class Resolver(IterativeVisitor):
+    """Assigns every variable a fixed slot index, stored in Id.slot, used with Memory.FrameStack.
+
+    Runs after TypeChecker. MemoryStack scopes share one table, so a name resolves to the same slot
+    in every scope and the whole program needs a single frame of resolve() slots.
+    """
+
+    def __init__(self):
+        self.slots = {}  # variable name -> slot
+
+    def resolve(self, node: AstNode):
+        self.slots = {}
+        return self.resolve_next(node)
+
+    def resolve_next(self, node: AstNode):  # next part of streamed program, slots of previous parts are kept
+        self.visit(node)
+        return len(self.slots)
+
+    def _children(self, value: any):  # nodes in value, nested lists of matrix literals included
+        if isinstance(value, list):
+            for el in value:
+                yield from self._children(el)
+        elif isinstance(value, AstNode):
+            yield value
+
+    def visit_AstNode(self, node: AstNode):
+        for value in vars(node).values():
+            for child in self._children(value):
+                yield child
+
+    def visit_Id(self, node: Id):
+        node.slot = self.slots.setdefault(node.value, len(self.slots))
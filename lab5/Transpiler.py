@@ -0,0 +1,234 @@
+import hashlib
+import importlib.util
+import marshal
+import os
+import tempfile
+
+import numpy as np
+
+from AST import *
+from ASTCache import evict, remove, touch, user_cache_dir
+from Exceptions import ReturnValueException
+from visit import NodeVisitor
+
+VERSION = 1  # bump whenever generated code changes, invalidates cached code objects
+
+
+class PythonGenerator(NodeVisitor):
+    """Translates a type checked AST into source of Python module with single function program().
+
+    Variables become locals prefixed with 'v_', element-wise matrix operators become numpy calls.
+    Return statement raises ReturnValueException, the same as in Interpreter.
+    """
+    _numpy_ops = {".+": "np.add", ".-": "np.subtract", ".*": "np.multiply", "./": "np.divide"}
+    _compound_ops = {"+=": "+", "-=": "-", "*=": "*", "/=": "/"}
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.indent = 1
+        self.loops = []  # (counter, native) of enclosing for loops, None for while
+        self.temps = 0
+
+    def generate(self, node: AstNode):
+        self.lines = ["def program():"]
+        self.indent = 1
+        self.visit(node)
+        if len(self.lines) == 1:
+            self._line("pass")
+        return "\n".join(self.lines) + "\n"
+
+    def _line(self, line: str):
+        self.lines.append("    " * self.indent + line)
+
+    def _temp(self):
+        self.temps += 1
+        return f"_t{self.temps}"
+
+    def _body(self, node: AstNode):
+        self.indent += 1
+        size = len(self.lines)
+        self.visit(node)
+        if len(self.lines) == size:
+            self._line("pass")
+        self.indent -= 1
+
+    @staticmethod
+    def _assigns(node: any, name: str):  # whether subtree rebinds variable <name>, element stores do not
+        if isinstance(node, Assignment):
+            return node.assign_id.value == name and not node.with_ref
+        if isinstance(node, For) and node.iteration.for_id.value == name:
+            return True
+        if isinstance(node, list):
+            return any(PythonGenerator._assigns(el, name) for el in node)
+        if isinstance(node, AstNode):
+            return any(PythonGenerator._assigns(el, name) for el in vars(node).values())
+        return False
+
+    def visit_Statements(self, node: Statements):
+        for statement in node.statements:
+            self.visit(statement)
+
+    def visit_Block(self, node: Block):
+        self.visit(node.statements)
+
+    def visit_Id(self, node: Id):
+        return f"v_{node.value}"
+
+    def visit_Variable(self, node: Variable):
+        if not isinstance(node.value, Id) and not isinstance(node.value, Matrix):
+            return repr(-node.value if node.minus % 2 else node.value)
+        value = self.visit(node.value)
+        value = value if node.trans % 2 == 0 else f"np.transpose({value})"
+        return value if node.minus % 2 == 0 else f"(-{value})"
+
+    def visit_SpecialMatrix(self, node: SpecialMatrix):
+        size = self.visit(node.expressions[0])
+        if node.special == "eye":
+            return f"np.eye({size})"
+        return f"np.{node.special}(({size},) * 2)"
+
+    def visit_SimpleMatrix(self, node: SimpleMatrix):
+        def _literal(vector: List[any]):
+            rows = [[]]
+            for el in vector:
+                if el == ";":
+                    rows.append([])
+                else:
+                    rows[-1].append(_literal(el) if isinstance(el, list) else
+                                    self.visit(el) if isinstance(el, Id) else repr(el))
+            rows = [f"[{', '.join(row)}]" for row in rows]
+            return f"[{', '.join(rows)}]" if ';' in vector else rows[0]
+
+        return f"np.array({_literal(node.vector)})"
+
+    def visit_BinOp(self, node: BinOp):
+        left = self.visit(node.left_expr)
+        right = self.visit(node.right_expr)
+        if node.bin_op in self._numpy_ops:
+            return f"{self._numpy_ops[node.bin_op]}({left}, {right})"
+        return f"({left} {node.bin_op} {right})"
+
+    def visit_If(self, node: If):
+        self._line(f"if {self.visit(node.cond_expr)}:")
+        self._body(node.if_block)
+        if node.else_block:
+            self._line("else:")
+            self._body(node.else_block)
+
+    def visit_While(self, node: While):
+        self._line(f"while {self.visit(node.cond_expr)}:")
+        self.loops.append(None)
+        self._body(node.while_block)
+        self.loops.pop()
+
+    def visit_For(self, node: For):
+        # Interpreter keeps counter after the loop: start or end when finished, counter + 1 after break
+        var = self.visit(node.iteration.for_id)
+        start, end = self._temp(), self._temp()
+        self._line(f"{start} = {self.visit(node.iteration.start_expr)}")
+        self._line(f"{end} = {self.visit(node.iteration.end_expr)}")
+        if self._assigns(node.for_block, node.iteration.for_id.value):
+            self.loops.append((var, False))
+            self._line(f"{var} = {start}")
+            self._line(f"while {var} < {end}:")
+            self._body(node.for_block)
+            self.indent += 1
+            self._line(f"{var} += 1")
+            self.indent -= 1
+        else:
+            self.loops.append((var, True))  # native for loop increments counter itself on continue
+            self._line(f"for {var} in range({start}, {end}):")
+            self._body(node.for_block)
+            self._line("else:")
+            self.indent += 1
+            self._line(f"{var} = max({start}, {end})")
+            self.indent -= 1
+        self.loops.pop()
+
+    def visit_Print(self, node: Print):
+        self._line(f"print({', '.join(self.visit(expr) for expr in node.expressions)}, sep=\" \")")
+
+    def visit_Assignments(self, node: Assignments):
+        for assignment in node.assignments:
+            self.visit(assignment)
+
+    def visit_Assignment(self, node: Assignment):
+        var = self.visit(node.assign_id)
+        value = self.visit(node.expression)
+        if node.with_ref:
+            first_slice = self.visit(node.with_ref[0])
+            second_slice = self.visit(node.with_ref[1])
+            self._line(f"{var}[{first_slice}][{second_slice}] = {value}")
+        elif node.assign_op == "=":
+            self._line(f"{var} = {value}")
+        else:  # x op= y would update numpy arrays in place
+            self._line(f"{var} = {var} {self._compound_ops[node.assign_op]} {value}")
+
+    def visit_Break(self, node: Break):
+        if self.loops[-1]:
+            self._line(f"{self.loops[-1][0]} += 1")
+        self._line("break")
+
+    def visit_Continue(self, node: Continue):
+        if self.loops[-1] and not self.loops[-1][1]:
+            self._line(f"{self.loops[-1][0]} += 1")
+        self._line("continue")
+
+    def visit_Return(self, node: Return):
+        self._line(f"raise ReturnValueException({self.visit(node.expressions[0])})")
+
+
+class CodeCache(object):
+    """On disk cache of generated source and code objects keyed by hash of program text.
+
+    Loading an entry touches it, least recently used entries are evicted once they exceed max_size bytes,
+    as in ASTCache. Parser stores only programs without illegal characters, as main.py runs cached code
+    without lexing.
+    """
+    suffix = ".mpyc"
+
+    def __init__(self, directory: str = None, max_size: int = 64 * 1024 * 1024):
+        self.directory = directory or user_cache_dir()
+        self.max_size = max_size
+
+    def _path(self, text: str):
+        key = hashlib.sha256(importlib.util.MAGIC_NUMBER + f"{VERSION}:{text}".encode()).hexdigest()
+        return os.path.join(self.directory, key + self.suffix)
+
+    def load(self, text: str):  # returns (source, code) or None
+        path = self._path(text)
+        try:
+            with open(path, "rb") as file:
+                cached = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        touch(path)
+        return cached
+
+    def store(self, text: str, source: str, code):  # program runs uncached if directory cannot be written
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "wb") as file:
+                marshal.dump((source, code), file)
+            os.replace(tmp_path, self._path(text))  # atomic, concurrent runs never see partial file
+            tmp_path = None
+            evict(self.directory, self.suffix, self.max_size)
+        except OSError:
+            pass
+        finally:
+            if tmp_path is not None:
+                remove(tmp_path)
+
+
+def transpile(program: Statements, filename: str = "<program>"):  # returns (source, code)
+    source = PythonGenerator().generate(program)
+    return source, compile(source, filename, "exec")
+
+
+def run(code):
+    namespace = {"np": np, "ReturnValueException": ReturnValueException}
+    exec(code, namespace)
+    namespace["program"]()
@@ -1,6 +1,7 @@
 from __future__ import print_function
 
 from AST import *
+from visit import NodeVisitor
 
 
 def addToClass(cls):
@@ -15,105 +16,93 @@ def printWithIndent(value, indent_num):
     print("|  " * indent_num + str(value))
 
 
-class TreePrinter:
+class TreePrinter(NodeVisitor):
 
-    @addToClass(AstNode)
-    def printTree(self, indent=0):
-        raise Exception("printTree not defined in class " + self.__class__.__name__)
+    def visit(self, node: AstNode, indent=0):
+        return self._dispatch[node.__class__](self, node, indent)
 
-    @addToClass(If)
-    def printTree(self, indent=0):
+    def visit_AstNode(self, node: AstNode, indent=0):
+        raise Exception("printTree not defined in class " + node.__class__.__name__)
+
+    def visit_If(self, node: If, indent=0):
         printWithIndent("IF", indent)
-        self.cond_expr.printTree(indent + 1)
+        self.visit(node.cond_expr, indent + 1)
         printWithIndent("THEN", indent)
-        self.if_block.printTree(indent + 1)
-        if self.else_block:
+        self.visit(node.if_block, indent + 1)
+        if node.else_block:
             printWithIndent("ELSE", indent)
-            self.else_block.printTree(indent + 1)
+            self.visit(node.else_block, indent + 1)
 
-    @addToClass(While)
-    def printTree(self, indent=0):
+    def visit_While(self, node: While, indent=0):
         printWithIndent("WHILE", indent)
-        self.cond_expr.printTree(indent + 1)
-        self.while_block.printTree(indent + 1)
+        self.visit(node.cond_expr, indent + 1)
+        self.visit(node.while_block, indent + 1)
 
-    @addToClass(For)
-    def printTree(self, indent=0):
+    def visit_For(self, node: For, indent=0):
         printWithIndent("FOR", indent)
-        self.iteration.printTree(indent + 1)
-        self.for_block.printTree(indent + 1)
+        self.visit(node.iteration, indent + 1)
+        self.visit(node.for_block, indent + 1)
 
-    @addToClass(Print)
-    def printTree(self, indent=0):
+    def visit_Print(self, node: Print, indent=0):
         printWithIndent("PRINT", indent)
-        for expression in self.expressions:
-            expression.printTree(indent + 1)
+        for expression in node.expressions:
+            self.visit(expression, indent + 1)
 
-    @addToClass(Assignment)
-    def printTree(self, indent=0):
-        printWithIndent(self.assign_op, indent)
-        if self.with_ref:
+    def visit_Assignment(self, node: Assignment, indent=0):
+        printWithIndent(node.assign_op, indent)
+        if node.with_ref:
             printWithIndent("REF", indent + 1)
-            self.assign_id.printTree(indent + 2)
-            self.with_ref[0].printTree(indent + 2)
-            self.with_ref[1].printTree(indent + 2)
+            self.visit(node.assign_id, indent + 2)
+            self.visit(node.with_ref[0], indent + 2)
+            self.visit(node.with_ref[1], indent + 2)
         else:
-            self.assign_id.printTree(indent + 2)
-        self.expression.printTree(indent + 1)
+            self.visit(node.assign_id, indent + 2)
+        self.visit(node.expression, indent + 1)
 
-    @addToClass(Assignments)
-    def printTree(self, indent=0):
-        for assignment in self.assignments:
-            assignment.printTree(indent)
+    def visit_Assignments(self, node: Assignments, indent=0):
+        for assignment in node.assignments:
+            self.visit(assignment, indent)
 
-    @addToClass(Break)
-    def printTree(self, indent=0):
+    def visit_Break(self, node: Break, indent=0):
         printWithIndent("BREAK", indent)
 
-    @addToClass(Continue)
-    def printTree(self, indent=0):
+    def visit_Continue(self, node: Continue, indent=0):
         printWithIndent("CONTINUE", indent)
 
-    @addToClass(Return)
-    def printTree(self, indent=0):
+    def visit_Return(self, node: Return, indent=0):
         printWithIndent("RETURN", indent)
-        for expression in self.expressions:
-            expression.printTree(indent + 1)
-
-    @addToClass(Statements)
-    def printTree(self, indent=0):
-        for statement in self.statements:
-            statement.printTree(indent)
-
-    @addToClass(Variable)
-    def printTree(self, indent=0):
-        if self.minus:
-            for i in range(self.minus):
+        for expression in node.expressions:
+            self.visit(expression, indent + 1)
+
+    def visit_Statements(self, node: Statements, indent=0):
+        for statement in node.statements:
+            self.visit(statement, indent)
+
+    def visit_Variable(self, node: Variable, indent=0):
+        if node.minus:
+            for i in range(node.minus):
                 printWithIndent("MINUS", indent+i)
-            indent += self.minus
-        if self.trans:
-            for i in range(self.trans):
+            indent += node.minus
+        if node.trans:
+            for i in range(node.trans):
                 printWithIndent("TRANSPOSE", indent+i)
-            indent += self.trans
-        try:  # for example X = -ones(3)'
-            self.value.printTree(indent + 1)
-        except AttributeError:
-            printWithIndent(self.value, indent)
-
-    @addToClass(BinOp)
-    def printTree(self, indent=0):
-        printWithIndent(self.bin_op, indent)
-        self.left_expr.printTree(indent + 1)
-        self.right_expr.printTree(indent + 1)
-
-    @addToClass(SpecialMatrix)
-    def printTree(self, indent=0):
-        printWithIndent(self.special, indent)
-        for expression in self.expressions:
-            expression.printTree(indent + 1)
-
-    @addToClass(SimpleMatrix)
-    def printTree(self, indent=0):
+            indent += node.trans
+        if isinstance(node.value, AstNode):  # for example X = -ones(3)'
+            self.visit(node.value, indent + 1)
+        else:
+            printWithIndent(node.value, indent)
+
+    def visit_BinOp(self, node: BinOp, indent=0):
+        printWithIndent(node.bin_op, indent)
+        self.visit(node.left_expr, indent + 1)
+        self.visit(node.right_expr, indent + 1)
+
+    def visit_SpecialMatrix(self, node: SpecialMatrix, indent=0):
+        printWithIndent(node.special, indent)
+        for expression in node.expressions:
+            self.visit(expression, indent + 1)
+
+    def visit_SimpleMatrix(self, node: SimpleMatrix, indent=0):
         def print_vector(vector, indent):
             printWithIndent("VECTOR", indent)
             indent += 1
@@ -126,27 +115,29 @@ class TreePrinter:
                     printWithIndent(elem, indent)
                 else:
                     if isinstance(elem, Id):
-                        elem.printTree(indent+1)
+                        self.visit(elem, indent+1)
                     else:
-                        elem.printTree(indent+1)
+                        self.visit(elem, indent+1)
 
-        vec = self.vector
+        vec = node.vector
         print_vector(vec, indent)
 
-    @addToClass(Id)
-    def printTree(self, indent=0):
-        printWithIndent(self.value, indent - 1)
+    def visit_Id(self, node: Id, indent=0):
+        printWithIndent(node.value, indent - 1)
 
-    @addToClass(Block)
-    def printTree(self, indent=0):
-        if isinstance(self.statements, Statements):
-            self.statements.printTree(indent+1)
+    def visit_Block(self, node: Block, indent=0):
+        if isinstance(node.statements, Statements):
+            self.visit(node.statements, indent+1)
         else:
-            self.statements.printTree(indent)
+            self.visit(node.statements, indent)
 
-    @addToClass(ForExpr)
-    def printTree(self, indent=0):
-        self.for_id.printTree(indent)
+    def visit_ForExpr(self, node: ForExpr, indent=0):
+        self.visit(node.for_id, indent)
         printWithIndent("RANGE", indent)
-        self.start_expr.printTree(indent + 1)
-        self.end_expr.printTree(indent + 1)
+        self.visit(node.start_expr, indent + 1)
+        self.visit(node.end_expr, indent + 1)
+
+
+@addToClass(AstNode)
+def printTree(self, indent=0):
+    TreePrinter().visit(self, indent)
@@ -1,11 +1,15 @@
 from AST import *
 from SymbolTable import *
+from visit import IterativeVisitor
 
 
-class NodeVisitor(object):
+class TypeChecker(IterativeVisitor):
+    """Checks types of the program, methods visiting children are generators so any AST depth is fine."""
 
     def __init__(self):
+        super().__init__()
         self.error = False
+        self.table = SymbolTable()
 
     @staticmethod
     def _get_type(var: any):
@@ -27,47 +31,20 @@ class NodeVisitor(object):
         self.error = True
         print(f"Line {node.lineno}, {msg}")
 
-    def visit(self, node: AstNode):
-        method = 'visit_' + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
-
-    def generic_visit(self, node: AstNode):  # Called if no explicit visitor function exists for a node.
-        print("No visitor for node ", node.__class__.__name__)
-        if isinstance(node, list):
-            for elem in node:
-                self.visit(elem)
-        else:
-            children = getattr(node, 'children', [])
-            for child in children:
-                if isinstance(child, list):
-                    for item in child:
-                        if isinstance(item, AstNode):
-                            self.visit(item)
-                elif isinstance(child, AstNode):
-                    self.visit(child)
-
-
-class TypeChecker(NodeVisitor):
-
-    def __init__(self):
-        super().__init__()
-        self.table = SymbolTable()
-
     def visit_Statements(self, node: Statements):
         for statement in node.statements:
             if isinstance(statement, Statements):  # if we are in new { } push new scope
                 scope = self.table.set_scope_name(SCOPE.LOCAL)
                 self.table.push_scope()
-                self.visit(statement)
+                yield statement
                 self.table.pop_scope()
                 self.table.set_scope_name(scope)
             else:
-                self.visit(statement)
+                yield statement
 
     def visit_Variable(self, node: Variable):
         if isinstance(node.value, Matrix):
-            var = self.visit(node.value)
+            var = yield node.value
         elif isinstance(node.value, Id):
             try:
                 var = self.table.get(node.value.value)
@@ -89,7 +66,7 @@ class TypeChecker(NodeVisitor):
         if len(node.expressions) != 1:
             self._wrap_with_lineno(node, f"TypeError: expected 1 argument got {len(node.expressions)}")
             return None
-        var = self.visit(node.expressions[0])
+        var = yield node.expressions[0]
         if type(var) != int:
             self._wrap_with_lineno(node, f"TypeError: bad operand for {node.special}: {self._get_type(var)}")
             return None
@@ -104,7 +81,7 @@ class TypeChecker(NodeVisitor):
 
     def visit_Assignments(self, node: Assignments):
         for assignment in node.assignments:  # One or multiple assignments separated by commas are allowed
-            self.visit(assignment)
+            yield assignment
 
     def visit_SimpleMatrix(self, node: SimpleMatrix):
         def flatten(matrix):
@@ -174,27 +151,27 @@ class TypeChecker(NodeVisitor):
         return node
 
     def visit_Block(self, node: Block):
-        self.visit(node.statements)
+        yield node.statements
 
     def visit_If(self, node: If):
-        var = self.visit(node.cond_expr)
+        var = yield node.cond_expr
         if type(var) != bool:
             self._wrap_with_lineno(node, f"TypeError: boolean condition expected, got: {self._get_type(var)}")
-        self.visit(node.if_block)
+        yield node.if_block
         if node.else_block:
-            self.visit(node.else_block)
+            yield node.else_block
 
     def visit_While(self, node: While):
         scope = self.table.set_scope_name(SCOPE.LOOP)
-        var = self.visit(node.cond_expr)
+        var = yield node.cond_expr
         if type(var) != bool:
             self._wrap_with_lineno(node, f"TypeError: boolean condition expected, got: {self._get_type(var)}")
-        self.visit(node.while_block)
+        yield node.while_block
         self.table.set_scope_name(scope)
 
     def visit_ForExpr(self, node: ForExpr):
-        var_start = self.visit(node.start_expr)
-        var_end = self.visit(node.end_expr)
+        var_start = yield node.start_expr
+        var_end = yield node.end_expr
         if type(var_start) != int or type(var_end) != int:
             self._wrap_with_lineno(node, f"TypeError: Unsupported operand types for iteration expression, got: "
                                          f"{self._get_type(var_start)} and {self._get_type(var_end)}")
@@ -208,15 +185,15 @@ class TypeChecker(NodeVisitor):
         if len(node.expressions) != 1:
             self._wrap_with_lineno(node, f"TypeError: expected 1 argument got {len(node.expressions)}")
             return
-        var = self.visit(node.expressions[0])
+        var = yield node.expressions[0]
         if type(var) != int:
             self._wrap_with_lineno(node, f"TypeError: bad operand for return: {self._get_type(var)}")
 
     def visit_For(self, node: For):
         self.table.push_scope()  # push scope in case of shadowing variable there
-        self.visit(node.iteration)
+        yield node.iteration
         scope = self.table.set_scope_name(SCOPE.LOOP)
-        self.visit(node.for_block)
+        yield node.for_block
         self.table.set_scope_name(scope)
         self.table.pop_scope()
 
@@ -224,11 +201,11 @@ class TypeChecker(NodeVisitor):
         if len(node.expressions) == 0:
             self._wrap_with_lineno(node, f"TypeError: expected at least 1 argument for statement")
         for expr in node.expressions:
-            self.visit(expr)
+            yield expr
 
     def visit_Assignment(self, node: Assignment):
         ops = {'+=', '-=', '/=', '*='}
-        var = self.visit(node.expression)
+        var = yield node.expression
         if node.with_ref:
             try:
                 var_id = self.table.get(node.assign_id.value)
@@ -243,8 +220,8 @@ class TypeChecker(NodeVisitor):
                 self._wrap_with_lineno(node, f"TypeError: expected 2 arguments for reference assignment,"
                                              f" got: {len(node.with_ref)}")
             else:
-                ref1 = self.visit(node.with_ref[0])
-                ref2 = self.visit(node.with_ref[1])
+                ref1 = yield node.with_ref[0]
+                ref2 = yield node.with_ref[1]
                 if type(ref1) != int:
                     self._wrap_with_lineno(node, f"TypeError: wrong type for reference, got: {self._get_type(ref1)}")
 
@@ -274,9 +251,15 @@ class TypeChecker(NodeVisitor):
                     self._wrap_with_lineno(node,
                                            f"TypeError: Unsupported operand type for "
                                            f"{node.assign_op}: {self._get_type(var)}")
-                if type(var_id) != type(var_id) and isinstance(var_id, Matrix) or isinstance(var, Matrix):
+                elif isinstance(var, Matrix) and not isinstance(var_id, Matrix):
                     self._wrap_with_lineno(node, f"TypeError: Unsupported operand types for {node.assign_op}:"
                                                  f" {self._get_type(var_id)} and {self._get_type(var)}")
+                elif isinstance(var, Matrix) and var_id.shape != var.shape:  # element-wise, as .+ .- .* ./
+                    self._wrap_with_lineno(node, f"TypeError: Unsupported operand matrix shapes for "
+                                                 f"{node.assign_op}, got: {self._get_shape(var_id)} and "
+                                                 f"{self._get_shape(var)}")
+                elif isinstance(var_id, Matrix):
+                    node.matrix = True
             else:  # this code should be unreachable
                 self._wrap_with_lineno(node, f"SyntaxError: Unsupported operator {node.assign_op}")
 
@@ -292,8 +275,8 @@ class TypeChecker(NodeVisitor):
         number_ops = {'+', '-', '/', '*'}
         matrix_ops = {'.+', '.-', './', '.*'}
         boolean_ops = {'<', '>', '<=', '>=', '==', '!='}
-        left_var = self.visit(node.left_expr)
-        right_var = self.visit(node.right_expr)
+        left_var = yield node.left_expr
+        right_var = yield node.right_expr
 
         if node.bin_op in number_ops:
             if type(left_var) not in {int, float} or type(right_var) not in {int, float}:
@@ -0,0 +1,78 @@
+import numpy as np
+
+from Bytecode import *
+from Exceptions import ReturnValueException
+
+
+class VM(object):
+    """Dispatch loop executing Code produced by BytecodeCompiler."""
+
+    def __init__(self, count: bool = False):
+        self.counts = [0] * len(OPNAMES) if count else None  # per opcode execution counters
+
+    def run(self, code: Code):
+        regs = [None] * code.nregs
+        consts = code.consts
+        for reg, k in code.init:
+            regs[reg] = consts[k]
+
+        instructions = code.instructions
+        binary_ops = BINARY_OPS
+        n_binary = len(BINARY_OPS)
+        counts = self.counts
+        end = len(instructions)
+        pc = 0
+        while pc < end:
+            op, a, b, c = instructions[pc]
+            pc += 1
+            if counts is not None:
+                counts[op] += 1
+            if op < n_binary:
+                regs[a] = binary_ops[op](regs[b], regs[c])
+            elif op == FOR_TEST:
+                if not regs[a] < regs[b]:
+                    pc = c
+            elif op == INC:
+                regs[a] = regs[a] + 1
+            elif op == JUMP:
+                pc = a
+            elif op == JUMP_IF_FALSE:
+                if not regs[a]:
+                    pc = b
+            elif op == MOVE:
+                regs[a] = regs[b]
+            elif op == SET_ITEM:
+                first_slice, second_slice = consts[b]
+                regs[a][regs[first_slice]][regs[second_slice]] = regs[c]
+            elif op == NEG:
+                regs[a] = -regs[b]
+            elif op == TRANSPOSE:
+                regs[a] = np.transpose(regs[b])
+            elif op == MATRIX:
+                regs[a] = np.array(consts[b])
+            elif op == MATRIX_REFS:
+                regs[a] = np.array(self._fill(consts[b], regs))
+            elif op == EYE:
+                regs[a] = np.eye(regs[b])
+            elif op == ZEROS:
+                regs[a] = np.zeros((regs[b], regs[b]))
+            elif op == ONES:
+                regs[a] = np.ones((regs[b], regs[b]))
+            elif op == PRINT:
+                print(*[regs[reg] for reg in consts[a]], sep=" ")
+            elif op == RETURN:
+                raise ReturnValueException(regs[a])
+            else:
+                raise RuntimeError(f"Unknown opcode {op} at {pc - 1}")
+
+    def _fill(self, layout: List[any], regs: List[any]):
+        return [self._fill(el, regs) if isinstance(el, list) else regs[el.reg] if isinstance(el, Ref) else el
+                for el in layout]
+
+    def report(self):  # execution counters sorted by count
+        total = sum(self.counts) or 1
+        lines = [f"{'OPCODE':<14}{'COUNT':>12}{'%':>8}"]
+        for op in sorted(range(len(OPNAMES)), key=lambda op: -self.counts[op]):
+            if self.counts[op]:
+                lines.append(f"{OPNAMES[op]:<14}{self.counts[op]:>12}{100 * self.counts[op] / total:>8.2f}")
+        return "\n".join(lines)
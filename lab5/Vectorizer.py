@@ -0,0 +1,90 @@
+from AST import *
+from visit import NodeVisitor
+
+
+class Vectorizer(NodeVisitor):
+    """Rewrites element-wise loop nests into VectorizedFor nodes, evaluated by Interpreter at once.
+
+    Matched nests have one or two For loops with invariant bounds, whose innermost body is the single
+    assignment A[r1, r2] = expr, where every loop counter is used exactly once as a whole reference
+    and remaining references do not depend on counters. Such iterations write distinct elements and
+    read only scalars, so they are independent. VectorizedFor subclasses For, so visitors without
+    own visit_VectorizedFor still run the loop as before.
+    """
+
+    def __init__(self):
+        self.vectorized = 0
+
+    def vectorize(self, node: AstNode):
+        self.vectorized = 0
+        return self.visit(node)
+
+    def visit_AstNode(self, node: AstNode):
+        for name, value in vars(node).items():
+            if isinstance(value, list):
+                for i, el in enumerate(value):
+                    if isinstance(el, AstNode):
+                        value[i] = self.visit(el)
+            elif isinstance(value, AstNode):
+                setattr(node, name, self.visit(value))
+        return node
+
+    def visit_For(self, node: For):
+        vectorized = self._match(node)
+        if vectorized is None:
+            return self.visit_AstNode(node)
+        self.vectorized += 1
+        return vectorized
+
+    @staticmethod
+    def _single(node: AstNode):  # the only statement of block, None if there are more
+        while isinstance(node, Block) or isinstance(node, Statements) and len(node.statements) == 1:
+            node = node.statements[0] if isinstance(node, Statements) else node.statements
+        return None if isinstance(node, Statements) else node
+
+    @staticmethod
+    def _names(node: any):  # names of all variables used in subtree
+        if isinstance(node, Id):
+            return {node.value}
+        if isinstance(node, list):
+            return set().union(*map(Vectorizer._names, node))
+        if isinstance(node, AstNode):
+            return set().union(*map(Vectorizer._names, vars(node).values()))
+        return set()
+
+    @staticmethod
+    def _counter(node: Expr):  # name of variable if expression is just a variable
+        if isinstance(node, Variable) and isinstance(node.value, Id) and node.minus % 2 == 0 \
+                and node.trans % 2 == 0:
+            return node.value.value
+        return None
+
+    def _match(self, node: For):
+        loops = [node]
+        body = self._single(node.for_block)
+        if isinstance(body, For) and not isinstance(body, VectorizedFor):
+            loops.append(body)
+            body = self._single(body.for_block)
+        if not isinstance(body, Assignments) or len(body.assignments) != 1:
+            return None
+        assignment = body.assignments[0]
+        if not assignment.with_ref or len(assignment.with_ref) != 2 or assignment.assign_op != "=":
+            return None
+
+        counters = [loop.iteration.for_id.value for loop in loops]
+        if len(set(counters)) != len(counters) or assignment.assign_id.value in counters:
+            return None
+        for loop in loops[1:]:  # inner bounds evaluated once, so they cannot depend on outer counters
+            if self._names([loop.iteration.start_expr, loop.iteration.end_expr]) & set(counters):
+                return None
+
+        used = []
+        for ref in assignment.with_ref:
+            if self._counter(ref) in counters:
+                used.append(self._counter(ref))
+            elif self._names(ref) & set(counters):
+                return None
+        if sorted(used) != sorted(counters):
+            return None
+
+        return VectorizedFor(node.iteration, node.for_block, loops, assignment, lineno=node.lineno)
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import os
+import time
+import traceback
+
+from parser import Parser
+
+# Options of a job with their defaults, as flags of main.py
+OPTIONS = {
+    'ast': False,
+    'type_check': True,
+    'interpretation': True,
+    'backend': 'tree',
+    'disassemble': False,
+    'opcode_stats': False,
+    'emit_python': False,
+    'optimization_stats': False,
+    'dtype': 'float64',
+    'jit': False,
+    'iterative': False,
+    'stream': False,
+    'parser': 'ply',
+}
+_CHOICES = {'backend': Parser.backends, 'dtype': ('float64', 'float32'), 'parser': Parser.parsers}
+
+_parser = None  # warm Parser of worker process
+_started = None  # shared array of server.py, slot of a job gets pid of the worker which started it
+
+
+def init_worker(started=None):  # initializer of worker processes of server.py and main.py --batch
+    global _parser, _started
+    import TreePrinter  # Add printTree to AST class dynamically
+    _parser = Parser()
+    _started = started
+
+
+def job_options(options: dict):  # options of request completed with defaults, ValueError if invalid
+    unknown = set(options) - set(OPTIONS)
+    if unknown:
+        raise ValueError(f"unknown options: {', '.join(sorted(unknown))}")
+    options = {**OPTIONS, **options}
+    for name, value in options.items():
+        if name in _CHOICES and value not in _CHOICES[name]:
+            raise ValueError(f"invalid {name}: {value}")
+        if name not in _CHOICES and not isinstance(value, bool):
+            raise ValueError(f"{name} should be boolean")
+    if options['stream'] and options['backend'] != 'tree':
+        raise ValueError("streaming is supported only by tree backend")
+    if options['stream'] and options['parser'] == 'fast':
+        raise ValueError("streaming is supported only by ply parser")
+    if options['dtype'] != 'float64' and options['backend'] != 'tree':
+        raise ValueError(f"{options['dtype']} dtype is supported only by tree backend")
+    return options
+
+
+def run_job(text: str, options: dict, submitted: float, job: int = None):  # runs program in worker, returns response
+    if job is not None:
+        _started[job % len(_started)] = os.getpid()
+    started = time.time()
+    start = time.perf_counter()
+    parser = _parser
+    for name in ('backend', 'disassemble', 'opcode_stats', 'emit_python', 'optimization_stats', 'dtype', 'jit',
+                 'iterative', 'stream'):
+        setattr(parser, name, options[name])
+    parser.fast = options['parser'] == 'fast'
+    parser.reset()  # nothing is left from previous jobs
+    output = io.StringIO()
+    status = 'ok'
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            parser.parse(text, ast=options['ast'], type_check=options['type_check'],
+                         interpretation=options['interpretation'])
+            if parser.error:
+                status = 'syntax error'
+            elif parser.type_checker.error:
+                status = 'type error'
+        except Exception:
+            traceback.print_exc()
+            status = 'runtime error'
+    timings = {'wait_ms': (started - submitted) * 1000, 'run_ms': (time.perf_counter() - start) * 1000}
+    timings.update({f"{stage}_ms": stats['wall_ms'] for stage, stats in parser.pipeline.stats.items()})
+    return {
+        'status': status,
+        'exit_code': None if parser.exit_code is None else int(parser.exit_code),
+        'output': output.getvalue(),
+        'timings': timings,
+    }
+
+
+def run_file(path: str, options: dict):  # run_job of script in file, read by worker
+    submitted = time.time()
+    try:
+        with open(path, "r") as file:
+            text = file.read()
+    except IOError:
+        return {'status': 'cannot open', 'exit_code': None, 'output': f"Cannot open {path} file\n", 'timings': {}}
+    return run_job(text, options, submitted)
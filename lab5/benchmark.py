@@ -0,0 +1,659 @@
+import argparse
+import contextlib
+import io
+import itertools
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Bytecode import BytecodeCompiler
+from AST import *
+from ASTCache import ASTCache
+from ClosureCompiler import ClosureCompiler
+from Exceptions import ReturnValueException
+from Fuser import Fuser
+from Incremental import IncrementalParser
+from Interpreter import CONTINUE, Interpreter
+from Iterative import IterativeInterpreter
+from JIT import TracingInterpreter
+from Memory import FrameStack, MemoryStack
+from Transpiler import run, transpile
+from TypeChecker import TypeChecker
+from VM import VM
+from Worker import OPTIONS, init_worker, run_file
+from Vectorizer import Vectorizer
+from parser import Parser
+from visit import NodeVisitor
+
+CASES = {}
+
+
+def case(name):
+    def decorator(fn):
+        CASES[name] = fn
+        return fn
+
+    return decorator
+
+
+def best_of(fn, repeat):  # returns best wall time of <repeat> runs in seconds
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            fn()
+        except ReturnValueException:
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn):  # runs <fn> in forked process, returns its peak traced allocation and max RSS in KiB
+    def target(queue):
+        tracemalloc.start()
+        try:
+            fn()
+        except ReturnValueException:
+            pass
+        queue.put((tracemalloc.get_traced_memory()[1] // 1024, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    process = context.Process(target=target, args=(queue,))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def report(title, timings):
+    baseline = next(iter(timings.values()))
+    print(title)
+    for name, seconds in timings.items():
+        print(f"  {name:<12} {seconds * 1000:10.2f} ms  x{baseline / seconds:.2f}")
+
+
+def check(text):  # parses and type checks <text>, returns AST of program
+    parser = Parser()
+    program = parser.parse(text, type_check=True)
+    if parser.error or parser.type_checker.error:
+        raise ValueError("benchmark program does not type check")
+    return program
+
+
+def nested_loops_program(n):
+    return f"""
+        s = 0;
+        for i = 0:{n} {{
+            for j = 0:{n} {{
+                s += i * j - 1;
+            }}
+        }}
+        k = 0;
+        while (k < {n * n}) {{
+            k += 1;
+            if (k == 3) continue;
+            s -= 1;
+        }}
+        return 0;
+    """
+
+
+@case('backends')
+def bench_backends(args):
+    program = check(nested_loops_program(args.size))
+    report(f"nested for/while, n={args.size}", {
+        'tree': best_of(lambda: Interpreter().run(program), args.repeat),
+        'closure': best_of(lambda: ClosureCompiler().compile(program)(), args.repeat),
+        'vm': best_of(lambda: VM().run(BytecodeCompiler().compile(program)), args.repeat),
+        'python': best_of(lambda: run(transpile(program)[1]), args.repeat),
+    })
+
+
+def continue_loops_program(n):
+    return f"""
+        s = 0;
+        for i = 0:{n} {{
+            if (i > 0) continue;
+            s += 1;
+        }}
+        k = 0;
+        while (k < {n}) {{
+            k += 1;
+            if (k > 0) continue;
+            s += 1;
+        }}
+        return 0;
+    """
+
+
+class _Continue(Exception):
+    pass
+
+
+def _raise_continue():
+    raise _Continue
+
+
+def _return_continue():
+    return CONTINUE
+
+
+def exception_loop(n):  # loop control as done by Interpreter before completion signals
+    for _ in range(n):
+        try:
+            _raise_continue()
+        except _Continue:
+            continue
+
+
+def signal_loop(n):
+    for _ in range(n):
+        if _return_continue() == CONTINUE:
+            continue
+
+
+@case('control')
+def bench_control(args):
+    n = args.size * args.size
+    program = check(continue_loops_program(n))
+    report(f"continue heavy for/while, n={n}", {
+        'tree': best_of(lambda: Interpreter().run(program), args.repeat),
+    })
+    report(f"continue mechanism alone, n={n}", {
+        'exceptions': best_of(lambda: exception_loop(n), args.repeat),
+        'signals': best_of(lambda: signal_loop(n), args.repeat),
+    })
+
+
+class _GetattrVisitor(object):  # dispatch by method name lookup, as TypeChecker did before NodeVisitor tables
+    def visit(self, node):
+        return getattr(self, 'visit_' + node.__class__.__name__)(node)
+
+    def visit_Id(self, node):
+        pass
+
+    def visit_BinOp(self, node):
+        pass
+
+    def visit_Variable(self, node):
+        pass
+
+
+class _TableVisitor(NodeVisitor):
+    def visit_Id(self, node):
+        pass
+
+    def visit_BinOp(self, node):
+        pass
+
+    def visit_Variable(self, node):
+        pass
+
+
+@case('dispatch')
+def bench_dispatch(args):
+    nodes = [Id('x'), BinOp(None, '+', None), Variable(1)] * (args.size * 1000)
+
+    def visit_all(visitor):
+        for node in nodes:
+            visitor.visit(node)
+
+    timings = {
+        'getattr': best_of(lambda: visit_all(_GetattrVisitor()), args.repeat),
+        'table': best_of(lambda: visit_all(_TableVisitor()), args.repeat),
+    }
+    report(f"visitor dispatch, {len(nodes)} nodes", timings)
+    for name, seconds in timings.items():
+        print(f"  {name:<12} {seconds / len(nodes) * 1e9:10.1f} ns per node")
+
+
+def memory_loop(memory, names, n):  # reads and increments every variable n times
+    for _ in range(n):
+        for name in names:
+            memory.put(name, memory.get(name) + 1)
+
+
+@case('memory')
+def bench_memory(args):
+    names = [f"var_{i}" for i in range(20)]
+    memory, frames = MemoryStack(), FrameStack(len(names))
+    for slot, name in enumerate(names):
+        memory.put(name, 0)
+        frames.put(slot, 0)
+    n = args.size * 100
+    report(f"variable get/put, {n * len(names)} accesses", {
+        'dict': best_of(lambda: memory_loop(memory, names, n), args.repeat),
+        'slots': best_of(lambda: memory_loop(frames, range(len(names)), n), args.repeat),
+    })
+
+
+def fill_program(n):
+    return f"""
+        A = zeros({n});
+        k = 0.5;
+        for i = 0:{n} {{
+            for j = 0:{n} {{
+                A[i, j] = i * k - j / 2 + 1;
+            }}
+        }}
+        return 0;
+    """
+
+
+@case('vectorize')
+def bench_vectorize(args):
+    program = check(fill_program(args.size))
+    vectorized = check(fill_program(args.size))
+    Vectorizer().vectorize(vectorized)
+    report(f"nested for filling {args.size}x{args.size} matrix", {
+        'scalar': best_of(lambda: Interpreter().run(program), args.repeat),
+        'vectorized': best_of(lambda: Interpreter().run(vectorized), args.repeat),
+    })
+
+
+def literals_program(n):
+    return f"""
+        x = 1.5;
+        for i = 0:{n} {{
+            A = [1.0, 2.0, 3.0; 4.0, 5.0, 6.0; 7.0, 8.0, 9.0];
+            B = [x, 2.0, 3.0; 4.0, x, 6.0; 7.0, 8.0, x];
+        }}
+        return 0;
+    """
+
+
+@case('literals')
+def bench_literals(args):
+    n = args.size * 100
+    rows = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]]
+    template = np.array(rows)
+
+    def build(fn):
+        for _ in range(n):
+            fn()
+
+    report(f"3x3 literal evaluation, n={n}", {
+        'np.array': best_of(lambda: build(lambda: np.array(rows)), args.repeat),
+        'template': best_of(lambda: build(template.copy), args.repeat),
+    })
+    program = check(literals_program(n))
+    report(f"literal heavy loop, n={n}", {
+        'tree': best_of(lambda: Interpreter().run(program), args.repeat),
+    })
+
+
+def compound_program(n, k):
+    return f"""
+        A = zeros({n});
+        B = ones({n});
+        for i = 0:{k} {{
+            A += B;
+            A *= B;
+            A -= 0.5;
+        }}
+        return 0;
+    """
+
+
+class _CopyingInterpreter(Interpreter):  # compound assignment always allocates new matrix, as before
+    in_place = False
+    lazy_size = float('inf')  # dense matrices, as LazyMatrix results are never updated in place
+
+
+@case('inplace')
+def bench_inplace(args):
+    n, k = args.size * 10, 20
+    program = check(compound_program(n, k))
+    interpreters = {'copying': _CopyingInterpreter, 'in place': _DenseInterpreter}
+    report(f"matrix compound assignment, {n}x{n} matrix, {3 * k} updates", {
+        name: best_of(lambda: interpreter().run(program), args.repeat) for name, interpreter in interpreters.items()
+    })
+    for name, interpreter in interpreters.items():
+        traced, rss = peak_memory(lambda: interpreter().run(program))
+        print(f"  {name:<12} {traced:10d} KiB peak allocated {rss:10d} KiB max RSS")
+
+
+def chain_program(n):
+    return f"""
+        A = ones({n});
+        B = eye({n});
+        C = ones({n});
+        D = ones({n});
+        for i = 0:10 {{
+            E = A .+ B .* C ./ D .- A';
+        }}
+        return 0;
+    """
+
+
+@case('fusion')
+def bench_fusion(args):
+    n = args.size * 20
+    program = check(chain_program(n))
+    fused = check(chain_program(n))
+    Fuser().fuse(fused)
+    programs = {'unfused': program, 'fused': fused}
+    report(f"element-wise chain of 4 operators, {n}x{n} matrices, 10 times", {
+        name: best_of(lambda: Interpreter().run(program), args.repeat) for name, program in programs.items()
+    })
+    for name, program in programs.items():
+        traced, rss = peak_memory(lambda: Interpreter().run(program))
+        print(f"  {name:<12} {traced:10d} KiB peak allocated {rss:10d} KiB max RSS")
+
+
+@case('dtype')
+def bench_dtype(args):
+    n = args.size * 20
+    program = check(chain_program(n))
+    Fuser().fuse(program)
+    dtypes = ('float64', 'float32')
+    report(f"element-wise chain of 4 operators, {n}x{n} matrices, 10 times", {
+        dtype: best_of(lambda: Interpreter(dtype).run(program), args.repeat) for dtype in dtypes
+    })
+    for dtype in dtypes:
+        traced, rss = peak_memory(lambda: Interpreter(dtype).run(program))
+        print(f"  {dtype:<12} {traced:10d} KiB peak allocated {rss:10d} KiB max RSS")
+
+
+def special_program(n):
+    return f"""
+        A = eye({n});
+        A[0, 1] = 2;
+        B = A' .+ ones({n});
+        C = zeros({n});
+        C += 0.5;
+        D = B .* C .- eye({n});
+        D[{n - 1}, 0] = 1;
+        return 0;
+    """
+
+
+class _DenseInterpreter(Interpreter):  # eye, zeros and ones always dense, as before LazyMatrix
+    lazy_size = float('inf')
+
+
+@case('lazy')
+def bench_lazy(args):
+    n = args.size * 20
+    program = check(special_program(n))
+    interpreters = {'dense': _DenseInterpreter, 'lazy': Interpreter}
+    report(f"eye/zeros/ones arithmetic with writes, {n}x{n} matrices", {
+        name: best_of(lambda: interpreter().run(program), args.repeat) for name, interpreter in interpreters.items()
+    })
+    for name, interpreter in interpreters.items():
+        traced, rss = peak_memory(lambda: interpreter().run(program))
+        print(f"  {name:<12} {traced:10d} KiB peak allocated {rss:10d} KiB max RSS")
+    n = args.size * 500
+    program = check(special_program(n))
+    report(f"the same for {n}x{n} matrices, too big to be dense", {
+        'lazy': best_of(lambda: Interpreter().run(program), args.repeat),
+    })
+
+
+@case('jit')
+def bench_jit(args):
+    programs = {
+        f"nested for/while, n={args.size}": check(nested_loops_program(args.size)),
+        f"scalar loops filling {args.size}x{args.size} matrix": check(fill_program(args.size)),
+    }
+    for title, program in programs.items():
+        report(title, {
+            'tree': best_of(lambda: Interpreter().run(program), args.repeat),
+            'tree + jit': best_of(lambda: TracingInterpreter().run(program), args.repeat),
+        })
+
+
+def sum_program(n):  # single expression of n terms, of variable so that Optimizer folds nothing
+    return f"y = 1;\nx = {' + '.join(['y'] * n)};\n"
+
+
+@case('deep')
+def bench_deep(args):
+    for n in (1000, args.size * 1000):
+        program = check(sum_program(n))
+        timings = {}
+        try:
+            timings['tree'] = best_of(lambda: Interpreter().run(program), args.repeat)
+        except RecursionError:
+            pass
+        timings['iterative'] = best_of(lambda: IterativeInterpreter().run(program), args.repeat)
+        report(f"expression of {n} terms" + ("" if 'tree' in timings else ", tree exceeds recursion limit"),
+               timings)
+        print(f"  {'type check':<12} {best_of(lambda: TypeChecker().visit(program), args.repeat) * 1000:10.2f} ms")
+
+
+@case('batch')
+def bench_batch(args):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for k in range(args.size):
+            paths.append(os.path.join(directory, f"{k}.m"))
+            with open(paths[-1], "w") as file:
+                file.write(nested_loops_program(20))
+
+        def run_all(jobs):
+            with ProcessPoolExecutor(jobs, initializer=init_worker) as executor:
+                list(executor.map(run_file, paths, [OPTIONS] * len(paths), chunksize=max(1, len(paths) // (jobs * 4))))
+
+        timings = {f"{jobs} workers": best_of(lambda: run_all(jobs), args.repeat)
+                   for jobs in sorted({1, os.cpu_count()})}
+        report(f"batch of {len(paths)} scripts, {os.cpu_count()} cores", timings)
+
+
+class _ConcatenatingParser(Parser):  # right recursive lists built by concatenation, as before linear time lists
+
+    def __init__(self):
+        super().__init__(tabmodule="concatenatingparsetab")
+
+    def __dir__(self):  # rules found by yacc, linear lists are not part of this grammar
+        return [name for name in super().__dir__() if name not in {'p_expression_list', 'p_assignment_list'}]
+
+    def p_statements(self, p):
+        """statements : empty
+                      | LCURLY statements RCURLY statements
+                      | statement statements
+        """
+        if len(p) == 2:
+            p[0] = Statements([])
+        elif len(p) == 3:
+            p[2].statements = [p[1]] + p[2].statements
+            p[0] = p[2]
+        else:
+            p[4].statements = [p[2]] + p[4].statements
+            p[0] = p[4]
+
+    def p_expressions(self, p):
+        """ expressions : expression COMMA expressions
+                        | expression
+        """
+        p[0] = [p[1]] if len(p) == 2 else [p[1]] + p[3]
+
+    def p_assignments(self, p):
+        """assignments : assignment COMMA assignments
+                       | assignment
+        """
+        p[0] = [p[1]] if len(p) == 2 else [p[1]] + p[3]
+
+    def p_outerlist(self, p):
+        """outer_list : outer_list SEMICOL inner_list
+                      | inner_list
+        """
+        p[0] = p[1] if len(p) == 2 else p[1] + [';'] + p[3]
+
+    def p_innerlist(self, p):
+        """inner_list : inner_list COMMA elem
+                      | elem
+        """
+        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+
+
+@case('parse')
+def bench_parse(args):
+    n = args.size * 1000
+    programs = {
+        f"{n} statements": "x = 1;\n" * n,
+        f"matrix literal of {n} elements": f"x = [{', '.join(['1'] * n)}];\n",
+    }
+    parsers = {'concatenating': _ConcatenatingParser(), 'linear': Parser()}
+    for title, text in programs.items():
+        report(f"parsing {title}", {name: best_of(lambda: parser.parse(text), args.repeat)
+                                    for name, parser in parsers.items()})
+
+
+@case('fast_parser')
+def bench_fast_parser(args):
+    n = args.size * 100
+    examples = [os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', lab, 'examples')
+                for lab in ('lab2', 'lab3')]
+    programs = {
+        f"{n} generated statements": generated_program(n),
+        f"expression of {n} terms": sum_program(n),
+        f"examples repeated {args.size} times": "".join(open(os.path.join(directory, name)).read()
+                                                      for directory in examples
+                                                      for name in sorted(os.listdir(directory))) * args.size,
+    }
+    parsers = {'ply': Parser(), 'fast': Parser(parser="fast")}
+    for title, text in programs.items():
+        assert parsers['fast'].fast_parser.parse(text) is not None
+        report(f"parsing {title}", {name: best_of(lambda: parser.parse(text), args.repeat)
+                                    for name, parser in parsers.items()})
+
+
+class _FirstOutput(io.StringIO):  # stdout discarding output, keeps time of the first write
+    def __init__(self):
+        super().__init__()
+        self.first = None
+
+    def write(self, text):
+        if self.first is None:
+            self.first = time.perf_counter()
+        return len(text)
+
+
+def generated_program(n):  # prints right away, then n statements
+    return "x = 0;\nprint x;\n" + "x += 1;\ny = [x, x; x, x];\n" * (n // 2) + "print x;\n"
+
+
+@case('stream')
+def bench_stream(args):
+    text = generated_program(args.size * 1000)
+    for name, stream in (('whole', False), ('stream', True)):
+        parser = Parser(stream=stream)
+
+        def run():
+            output = _FirstOutput()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(output):
+                parser.parse(text, type_check=True, interpretation=True)
+            return output.first - start, time.perf_counter() - start
+
+        first, total = min(run() for _ in range(args.repeat))
+        traced, rss = peak_memory(run)
+        print(f"{name:<8} first output {first * 1000:10.2f} ms, total {total * 1000:10.2f} ms, "
+              f"peak traced {traced:8} KiB, max RSS {rss:8} KiB")
+
+
+_STARTUP = {  # code constructing Parser in fresh interpreter, prints construction time in seconds
+    'generated': "import tempfile, time, scanner; scanner.lextab = None; import parser; start = time.perf_counter(); "
+                 "parser.Parser(outputdir=tempfile.mkdtemp(), tabmodule='baseparsetab'); "  # as before packaged tables
+                 "print(time.perf_counter() - start)",
+    'packaged': "import time, parser; start = time.perf_counter(); parser.Parser(); print(time.perf_counter() - start)",
+}
+
+
+@case('startup')
+def bench_startup(args):
+    directory = os.path.dirname(os.path.abspath(__file__))
+    constructions = {name: float('inf') for name in _STARTUP}
+
+    def start(name):
+        process = subprocess.run([sys.executable, "-c", _STARTUP[name]], cwd=directory, check=True,
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        constructions[name] = min(constructions[name], float(process.stdout))
+
+    report("cold start of python constructing Parser", {name: best_of(lambda: start(name), args.repeat)
+                                                        for name in _STARTUP})
+    report("Parser construction", constructions)
+
+
+@case('ast_cache')
+def bench_ast_cache(args):
+    text = generated_program(args.size * 100)
+    with tempfile.TemporaryDirectory() as directory:
+        parsers = {'uncached': Parser(), 'cached': Parser(ast_cache=ASTCache(directory)),
+                   'miss and store': Parser(ast_cache=ASTCache(os.path.join(directory, 'miss'), max_size=0))}
+
+        def run(name):
+            with contextlib.redirect_stdout(io.StringIO()):
+                parsers[name].parse(text, type_check=True)
+
+        run('cached')  # stores entry, entries of max_size 0 cache are evicted right away
+        report(f"parse and type check of {args.size * 100} statements",
+               {name: best_of(lambda: run(name), args.repeat) for name in ('uncached', 'cached', 'miss and store')})
+
+
+@case('incremental')
+def bench_incremental(args):
+    n = args.size * 500
+    text = generated_program(n)
+    parser = IncrementalParser(Parser().scanner)
+    middle = text.index("x += 1;", len(text) // 2) + len("x += ")
+    edits = {  # applied and undone in turns
+        'same line': ([(middle, middle + 1, "2")], [(middle, middle + 1, "1")]),
+        'new line': ([(middle, middle, "\n")], [(middle, middle + 1, "")]),
+    }
+    timings = {'full parse': best_of(lambda: parser.parse(text), args.repeat)}
+    for name, turns in edits.items():
+        turns = itertools.cycle(turns)
+        timings[name] = best_of(lambda: parser.reparse(parser.program, next(turns)), 2 * args.repeat)
+    assert parser.text == text
+    report(f"parsing {n} lines after single line edit", timings)
+
+
+@case('pipeline')
+def bench_pipeline(args):
+    text = generated_program(args.size * 100)
+    parsers = {'stats': Parser(), 'detailed': Parser(stats=True)}
+
+    def run(name):
+        with contextlib.redirect_stdout(io.StringIO()):
+            parsers[name].parse(text, type_check=True, interpretation=True)
+
+    report(f"pipeline of {args.size * 100} statements", {name: best_of(lambda: run(name), args.repeat)
+                                                         for name in parsers})
+    print(parsers['detailed'].pipeline.report())
+
+
+def create_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--case',
+        help='Benchmark to run, all by default',
+        choices=sorted(CASES),
+        action='append')
+    parser.add_argument(
+        '--size',
+        help='Problem size passed to benchmark programs',
+        type=int,
+        default=100)
+    parser.add_argument(
+        '--repeat',
+        help='Number of runs, the best one is reported',
+        type=int,
+        default=5)
+    return parser
+
+
+if __name__ == '__main__':
+    FLAGS = create_parser().parse_args()
+    for name in FLAGS.case or sorted(CASES):
+        CASES[name](FLAGS)
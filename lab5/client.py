@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import socket
+import sys
+
+
+# Client of server.py, imports nothing heavy so that it starts much faster than main.py
+def create_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--filename',
+        help='File to perform parsing',
+        type=str,
+        required=True)
+    parser.add_argument(
+        '--socket',
+        help='Path of Unix socket of running server.py',
+        type=str,
+        default=os.path.join('logs', 'server.sock'))
+    parser.add_argument(
+        '--parser',
+        help='Parser of scripts, fast is hand written, programs with errors are reported by ply',
+        choices=('ply', 'fast'),
+        default='ply')
+    parser.add_argument(
+        '--disable_ast',
+        help='Disable performing ast printing',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--disable_type_check',
+        help='Disable performing type checking',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--disable_interpretation',
+        help='Disable performing interpretation',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--backend',
+        help='Execution backend used for interpretation',
+        choices=('tree', 'closure', 'vm', 'python'),
+        default='tree')
+    parser.add_argument(
+        '--dtype',
+        help='Element type of float matrices, int matrices stay int (tree backend)',
+        choices=('float64', 'float32'),
+        default='float64')
+    parser.add_argument(
+        '--jit',
+        help='Compile hot loops into specialized Python code (tree backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--iterative',
+        help='Interpret on explicit stack, for arbitrarily deep programs (tree backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--timings',
+        help='Print wait and run time of the job to stderr',
+        action='store_true',
+        default=False)
+    return parser
+
+
+def submit(path: str, text: str, options: dict):  # sends program to server, returns its response
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        connection.sendall((json.dumps({'text': text, 'options': options}) + '\n').encode())
+        with connection.makefile('rb') as response:
+            return json.loads(response.readline())
+
+
+if __name__ == '__main__':
+    FLAGS = create_parser().parse_args()
+    try:
+        file = open(FLAGS.filename, "r")
+    except IOError:
+        print(f"Cannot open {FLAGS.filename} file")
+        sys.exit(0)
+    options = {'ast': not FLAGS.disable_ast, 'type_check': not FLAGS.disable_type_check,
+               'interpretation': not FLAGS.disable_interpretation, 'backend': FLAGS.backend, 'dtype': FLAGS.dtype,
+               'jit': FLAGS.jit, 'iterative': FLAGS.iterative, 'parser': FLAGS.parser}
+    try:
+        response = submit(FLAGS.socket, file.read(), options)
+    except OSError as e:
+        print(f"Cannot connect to server at {FLAGS.socket}: {e}")
+        sys.exit(1)
+    print(response['output'], end="")
+    if FLAGS.timings:
+        print(f"{response['status']}, wait {response['timings'].get('wait_ms', 0):.2f} ms, "
+              f"run {response['timings'].get('run_ms', 0):.2f} ms", file=sys.stderr)
+    sys.exit(0 if response['status'] == 'ok' else 1)
@@ -0,0 +1,274 @@
+import argparse
+import contextlib
+import glob
+import io
+import os
+import random
+import sys
+
+from AST import AstNode
+from Incremental import IncrementalParser
+from parser import Parser
+
+_EXAMPLES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', lab, 'examples')
+             for lab in ('lab2', 'lab3')]
+_IDS = ('a', 'b', 'x1', 'ifx', '_t', 'elsewhere')
+_CONSTS = ('0', '3', '42', '1.5', '2.', '.5', '"s"', '"a b"')
+_BINARY = ('+', '-', '*', '/', '.+', '.-', '.*', './')
+_COMPARISONS = ('<', '>', '<=', '>=', '==', '!=')
+_ASSIGN_OPS = ('=', '+=', '-=', '*=', '/=')
+_SEPARATORS = (' ', ' ', ' ', '\n', '\t', '  # comment\n', '\r\n', '')
+_NOISE = ('<', ';', ',', '(', ')', '[', ']', '{', '}', "'", '-', '.', 'else', 'a', '1', '=', '@', '!', '"', '#', '\r')
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(
+        description='Compares ASTs of FastParser and IncrementalParser with ASTs of PLY parser')
+    parser.add_argument(
+        'paths',
+        help='Files, directories or glob patterns of scripts, examples of lab2 and lab3 by default',
+        type=str,
+        nargs='*')
+    parser.add_argument(
+        '--generated',
+        help='Number of random programs, each also checked with random mutation',
+        type=int,
+        default=500)
+    parser.add_argument(
+        '--edits',
+        help='Number of random edits of every generated program, re-parsed by IncrementalParser',
+        type=int,
+        default=20)
+    parser.add_argument(
+        '--seed',
+        help='Seed of random programs',
+        type=int,
+        default=0)
+    return parser
+
+
+class Generator(object):  # random token lists of programs, covering grammar corner cases
+
+    def __init__(self, rng: random.Random, depth: int = 3):
+        self.rng = rng
+        self.depth = depth
+
+    def program(self, statements: int):
+        tokens = []
+        for _ in range(statements):
+            tokens += self.statement(self.depth)
+        return tokens
+
+    def statement(self, depth: int):
+        choice = self.rng.randrange(12 if depth > 0 else 7)
+        if choice < 3:
+            return self.assignments(depth) + [';']
+        elif choice == 3:
+            return ['print'] + self.expressions(depth) + [';']
+        elif choice == 4:
+            return [self.rng.choice(('break', 'continue'))] + [';']
+        elif choice == 5:
+            return ['return'] + self.expressions(depth) + [';']
+        elif choice == 6:
+            return [';']
+        elif choice == 7:
+            return ['if'] + self.expression(depth) + self.block(depth - 1)
+        elif choice == 8:
+            return ['if'] + self.expression(depth) + self.block(depth - 1) + ['else'] + self.block(depth - 1)
+        elif choice == 9:
+            return ['while'] + self.expression(depth) + self.block(depth - 1)
+        elif choice == 10:
+            return ['for', self.rng.choice(_IDS), '='] + self.expression(depth - 1) + [':'] + \
+                self.expression(depth - 1) + self.block(depth - 1)
+        return ['{'] + self.program(self.rng.randrange(3)) + ['}']  # nested statements
+
+    def block(self, depth: int):
+        if self.rng.random() < 0.5:
+            return self.statement(depth)
+        tokens = ['{']
+        for _ in range(self.rng.randrange(3)):
+            tokens += self.statement(depth)
+        return tokens + ['}']
+
+    def assignments(self, depth: int):
+        tokens = []
+        for i in range(self.rng.randrange(3)):
+            if i:
+                tokens.append(',')
+            tokens.append(self.rng.choice(_IDS))
+            if self.rng.random() < 0.2:
+                tokens += ['['] + self.expressions(depth - 1) + [']']
+            tokens += [self.rng.choice(_ASSIGN_OPS)] + self.expression(depth)
+        if tokens and self.rng.random() < 0.2:
+            tokens.append(',')  # trailing comma
+        return tokens
+
+    def expressions(self, depth: int):
+        tokens = []
+        for i in range(self.rng.randrange(4)):
+            if i:
+                tokens.append(',')
+            tokens += self.expression(depth)
+        if tokens and self.rng.random() < 0.2:
+            tokens.append(',')  # trailing comma
+        return tokens
+
+    def expression(self, depth: int):  # comparisons are not associative, so only at the top or in parentheses
+        if self.rng.random() < 0.2:
+            return self.term(depth) + [self.rng.choice(_COMPARISONS)] + self.term(depth)
+        return self.term(depth)
+
+    def term(self, depth: int):
+        choice = self.rng.random()
+        if depth <= 0 or choice < 0.35:
+            return self.variable(depth)
+        elif choice < 0.5:
+            return ['('] + self.expression(depth - 1) + [')']
+        return self.term(depth - 1) + [self.rng.choice(_BINARY)] + self.term(depth - 1)
+
+    def variable(self, depth: int):
+        choice = self.rng.random()
+        if depth <= 0 or choice < 0.6:
+            tokens = [self.rng.choice(_IDS + _CONSTS)]
+        elif choice < 0.8:
+            tokens = self.vector(depth - 1)
+        else:
+            tokens = [self.rng.choice(('eye', 'zeros', 'ones')), '('] + self.expressions(depth - 1) + [')']
+        return ['-'] * self.rng.choice((0, 0, 0, 1, 2)) + tokens + ["'"] * self.rng.choice((0, 0, 0, 1, 2))
+
+    def vector(self, depth: int):
+        tokens = ['[']
+        for i in range(self.rng.randrange(4)):
+            if i:
+                tokens.append(';')
+            for j in range(self.rng.randrange(4)):
+                if j or self.rng.random() < 0.1:  # row may start with comma
+                    tokens.append(',')
+                if depth > 0 and self.rng.random() < 0.2:
+                    tokens += self.vector(depth - 1)
+                else:
+                    tokens.append(self.rng.choice(_IDS + _CONSTS))
+        return tokens + [']']
+
+    def mutate(self, tokens: list):  # deletes, duplicates or inserts a token, mostly making syntax error
+        tokens = list(tokens)
+        position = self.rng.randrange(len(tokens) + 1)
+        choice = self.rng.randrange(3)
+        if choice == 0 and position < len(tokens):
+            del tokens[position]
+        elif choice == 1 and position < len(tokens):
+            tokens.insert(position, tokens[position])
+        else:
+            tokens.insert(position, self.rng.choice(_NOISE))
+        return tokens
+
+    def text(self, tokens: list):
+        return "".join(token + self.rng.choice(_SEPARATORS) for token in tokens)
+
+    def edits(self, text: str):  # one or two edits of text, replacing few characters mostly by a statement
+        edits = []
+        for _ in range(self.rng.choice((1, 1, 2))):
+            start = self.rng.randrange(len(text) + 1)
+            if self.rng.random() < 0.5:  # token start, line of lookahead of previous statement may change
+                start = next((i for i in range(max(start, 1), len(text))
+                              if text[i - 1] in ' \t\n' and not text[i].isspace()), start)
+            end = min(start + self.rng.choice((0, 0, 1, 2, 5, 20)), len(text))
+            choice = self.rng.random()
+            if choice < 0.4:
+                replacement = self.text(self.statement(2))
+            elif choice < 0.55:
+                replacement = self.rng.choice(_SEPARATORS)
+            elif choice < 0.75:
+                replacement = self.rng.choice(_SEPARATORS + _NOISE)
+            else:
+                replacement = self.text(self.mutate(self.statement(1)))
+            edits.append((start, end, replacement))
+            text = text[:start] + replacement + text[end:]
+        return edits, text
+
+
+def difference(left, right):  # path of first difference of ASTs, None if equal
+    stack = [('program', left, right)]
+    while stack:
+        path, left, right = stack.pop()
+        if type(left) is not type(right):
+            return path
+        if isinstance(left, AstNode):
+            if list(vars(left)) != list(vars(right)):  # also order of fields
+                return path
+            stack.extend((f"{path}.{name}", value, vars(right)[name]) for name, value in vars(left).items())
+        elif isinstance(left, list):
+            if len(left) != len(right):
+                return path
+            stack.extend((f"{path}[{i}]", value, other) for i, (value, other) in enumerate(zip(left, right)))
+        elif left != right:
+            return path
+    return None
+
+
+def compare(parser: Parser, text: str):  # returns (parsed by FastParser, description of mismatch or None)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        expected = parser.parse(text)
+    program = parser.fast_parser.parse(text)
+    if program is None:
+        return False, None if output.getvalue() else "valid program left to PLY parser"
+    if output.getvalue():
+        return True, f"PLY parser reported errors: {output.getvalue().strip()}"
+    path = difference(expected, program)
+    return True, None if path is None else f"ASTs differ at {path}"
+
+
+def compare_edits(parser: Parser, incremental: IncrementalParser, generator: Generator, text: str, count: int):
+    # returns description of the first mismatch of re-parsed edits, edits with syntax errors are undone
+    program = incremental.parse(text)
+    for _ in range(count):
+        edits, edited = generator.edits(text)
+        program = incremental.reparse(program, edits)
+        expected = parser.fast_parser.parse(edited)  # the same as of PLY parser
+        if (program is None) != (expected is None):
+            return f"edits {edits} {'not ' if program is None else ''}parsed by IncrementalParser\n{edited}"
+        if program is None:
+            program = incremental.reparse(program, [(0, len(edited), text)])
+            continue
+        path = difference(expected, program)
+        if path is not None:
+            return f"edits {edits} ASTs differ at {path}\n{edited}"
+        text = edited
+    return None
+
+
+def main(flags):
+    parser = Parser()  # PLY parser, FastParser of the same scanner
+    cases = []
+    for pattern in flags.paths or _EXAMPLES:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.m')
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "r") as file:
+                cases.append((path, file.read()))
+    generator = Generator(random.Random(flags.seed))
+    for i in range(flags.generated):
+        tokens = generator.program(generator.rng.randrange(1, 8))
+        cases.append((f"generated {i}", generator.text(tokens)))
+        cases.append((f"mutated {i}", generator.text(generator.mutate(tokens))))
+    incremental = IncrementalParser(parser.scanner)
+    parsed, failures = 0, 0
+    for name, text in cases:
+        fast, mismatch = compare(parser, text)
+        parsed += fast
+        if mismatch:
+            failures += 1
+            print(f"{name}: {mismatch}\n{text}\n")
+        elif fast and name.startswith("generated"):
+            mismatch = compare_edits(parser, incremental, generator, text, flags.edits)
+            if mismatch:
+                failures += 1
+                print(f"{name}: {mismatch}\n")
+    print(f"{len(cases)} programs, {parsed} parsed by FastParser, {len(cases) - parsed} left to PLY parser, "
+          f"{flags.edits} edits of generated ones, {failures} mismatches")
+    return failures == 0
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main(create_parser().parse_args()) else 1)
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ADD', 'ADDASSIGN', 'ASSIGN', 'BREAK', 'COMMA', 'CONTINUE', 'DIV', 'DIVASSIGN', 'DOTADD', 'DOTDIV', 'DOTMUL', 'DOTSUB', 'ELSE', 'EQ', 'EYE', 'FLOATNUM', 'FOR', 'GE', 'GEQ', 'ID', 'IF', 'INTNUM', 'LBRACKET', 'LCURLY', 'LE', 'LEQ', 'LPAREN', 'MUL', 'MULASSIGN', 'NEQ', 'ONES', 'PRINT', 'RANGE', 'RBRACKET', 'RCURLY', 'RETURN', 'RPAREN', 'SEMICOL', 'STRING', 'SUB', 'SUBASSIGN', 'TRANS', 'WHILE', 'ZEROS'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_FLOATNUM>\\d+\\.\\d*|\\.\\d+)|(?P<t_INTNUM>\\d+)|(?P<t_ID>[a-zA-Z_](\\w|_)*)|(?P<t_STRING>\\".*?\\")|(?P<t_COMMENT>\\#.*)|(?P<t_newline>\\r?\\n+)|(?P<t_CONTINUE>continue)|(?P<t_RETURN>return)|(?P<t_BREAK>break)|(?P<t_PRINT>print)|(?P<t_WHILE>while)|(?P<t_ZEROS>zeros)|(?P<t_DOTADD>\\.\\+)|(?P<t_DOTMUL>\\.\\*)|(?P<t_ELSE>else)|(?P<t_ONES>ones)|(?P<t_ADDASSIGN>\\+=)|(?P<t_DOTDIV>\\./)|(?P<t_DOTSUB>\\.-)|(?P<t_EYE>eye)|(?P<t_FOR>for)|(?P<t_MULASSIGN>\\*=)|(?P<t_SUBASSIGN>\\-=)|(?P<t_ADD>\\+)|(?P<t_COMMA>\\,)|(?P<t_DIVASSIGN>/=)|(?P<t_EQ>==)|(?P<t_GEQ>>=)|(?P<t_IF>if)|(?P<t_LBRACKET>\\[)|(?P<t_LCURLY>\\{)|(?P<t_LEQ><=)|(?P<t_LPAREN>\\()|(?P<t_MUL>\\*)|(?P<t_NEQ>!=)|(?P<t_RBRACKET>\\])|(?P<t_RCURLY>\\})|(?P<t_RPAREN>\\))|(?P<t_TRANS>\\\')|(?P<t_ASSIGN>=)|(?P<t_DIV>/)|(?P<t_GE>>)|(?P<t_LE><)|(?P<t_RANGE>:)|(?P<t_SEMICOL>;)|(?P<t_SUB>-)', [None, ('t_FLOATNUM', 'FLOATNUM'), ('t_INTNUM', 'INTNUM'), ('t_ID', 'ID'), None, ('t_STRING', 'STRING'), ('t_COMMENT', 'COMMENT'), ('t_newline', 'newline'), (None, 'CONTINUE'), (None, 'RETURN'), (None, 'BREAK'), (None, 'PRINT'), (None, 'WHILE'), (None, 'ZEROS'), (None, 'DOTADD'), (None, 'DOTMUL'), (None, 'ELSE'), (None, 'ONES'), (None, 'ADDASSIGN'), (None, 'DOTDIV'), (None, 'DOTSUB'), (None, 'EYE'), (None, 'FOR'), (None, 'MULASSIGN'), (None, 'SUBASSIGN'), (None, 'ADD'), (None, 'COMMA'), (None, 'DIVASSIGN'), (None, 'EQ'), (None, 'GEQ'), (None, 'IF'), (None, 'LBRACKET'), (None, 'LCURLY'), (None, 'LEQ'), (None, 'LPAREN'), (None, 'MUL'), (None, 'NEQ'), (None, 'RBRACKET'), (None, 'RCURLY'), (None, 'RPAREN'), (None, 'TRANS'), (None, 'ASSIGN'), (None, 'DIV'), (None, 'GE'), (None, 'LE'), (None, 'RANGE'), (None, 'SEMICOL'), (None, 'SUB')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
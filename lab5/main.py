@@ -1,19 +1,41 @@
 import argparse
+import glob
+import json
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 
+from ASTCache import ASTCache
+from Exceptions import ReturnValueException
+from Transpiler import CodeCache, run
+from Worker import init_worker, job_options, run_file
 from parser import Parser
 
 
 def create_parser():
     parser = argparse.ArgumentParser()
-
-    parser.add_argument(
+    files = parser.add_mutually_exclusive_group(required=True)
+    files.add_argument(
         '--filename',
         help='File to perform parsing',
-        type=str,
-        required=True
+        type=str
     )
+    files.add_argument(
+        '--batch',
+        help='Files, directories or glob patterns of scripts run in parallel, followed by summary',
+        type=str,
+        nargs='+')
+    parser.add_argument(
+        '--jobs',
+        help='Number of worker processes of batch',
+        type=int,
+        default=os.cpu_count())
+    parser.add_argument(
+        '--parser',
+        help='Parser of scripts, fast is hand written, programs with errors are reported by ply',
+        choices=Parser.parsers,
+        default='ply')
     parser.add_argument(
         '--disable_ast',
         help='Disable performing ast printing',
@@ -29,11 +51,143 @@ def create_parser():
         help='Disable performing interpretation',
         action='store_true',
         default=False)
+    parser.add_argument(
+        '--backend',
+        help='Execution backend used for interpretation',
+        choices=Parser.backends,
+        default='tree')
+    parser.add_argument(
+        '--disassemble',
+        help='Print bytecode before execution (vm backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--opcode_stats',
+        help='Print per opcode execution counters (vm backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--emit_python', '--emit-python',
+        help='Print generated Python module before execution (python backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--cache_dir',
+        help='Directory of cache of type checked ASTs and compiled programs (python backend), '
+             '$XDG_CACHE_HOME/lab5 or ~/.cache/lab5 by default',
+        type=str,
+        default=None)
+    parser.add_argument(
+        '--cache_size',
+        help='Size of cached ASTs and of cached compiled programs in MB each, least recently used are evicted',
+        type=int,
+        default=64)
+    parser.add_argument(
+        '--disable_cache',
+        help='Disable caching of type checked ASTs and compiled programs',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--optimization_stats',
+        help='Print number of nodes folded by optimizer',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--dtype',
+        help='Element type of float matrices, int matrices stay int (tree backend)',
+        choices=('float64', 'float32'),
+        default='float64')
+    parser.add_argument(
+        '--jit',
+        help='Compile hot loops into specialized Python code (tree backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--iterative',
+        help='Interpret on explicit stack, for arbitrarily deep programs (tree backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--stream',
+        help='Check and run every top-level statement as soon as it is parsed, without keeping it (tree backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--profile',
+        help='Print per line and per node execution profile (tree backend)',
+        action='store_true',
+        default=False)
+    parser.add_argument(
+        '--profile_stacks',
+        help='File for collapsed stacks of profile, readable by flamegraph tools',
+        type=str,
+        default=os.path.join('logs', 'profile.folded'))
+    parser.add_argument(
+        '--stats',
+        help='Print wall and CPU time, token and node counts and growth of max RSS of the process in stages, '
+             'as table or JSON',
+        choices=('table', 'json'),
+        nargs='?',
+        const='table')
     return parser
 
 
+def batch_files(patterns):  # scripts of batch in order of arguments, sorted within directory or pattern
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.m')
+        paths.extend(sorted(glob.glob(pattern, recursive=True)) or [pattern])  # missing file fails in worker
+    return paths
+
+
+def summary(paths, results, seconds):  # table of status, return code and stage timings of every script
+    stages = ('lex', 'parse', 'check', 'optimize', 'execute', 'run')
+    width = max(len(path) for path in paths + ['FILE'])
+    lines = [f"{'FILE':<{width}}  {'STATUS':<14}{'RETURN':>8}" + "".join(f"{stage.upper() + ' MS':>16}"
+                                                                           for stage in stages)]
+    for path, result in zip(paths, results):
+        code = '-' if result['exit_code'] is None else result['exit_code']
+        timings = [result['timings'].get(f"{stage}_ms") for stage in stages]
+        lines.append(f"{path:<{width}}  {result['status']:<14}{code:>8}" + "".join(
+            f"{'-' if ms is None else f'{ms:.3f}':>16}" for ms in timings))
+    failed = sum(result['status'] != 'ok' for result in results)
+    lines.append(f"{len(paths)} files, {failed} failed, {seconds:.3f} s")
+    return "\n".join(lines)
+
+
+def run_batch(paths, options, jobs):  # prints output of every script in order, then summary
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(jobs, initializer=init_worker) as executor:
+        chunksize = max(1, len(paths) // (jobs * 4))  # fewer round trips for many small scripts
+        for path, result in zip(paths, executor.map(run_file, paths, [options] * len(paths), chunksize=chunksize)):
+            print(f"==> {path} <==")
+            print(result['output'], end="")
+            results.append(result)
+    print(summary(paths, results, time.perf_counter() - start))
+    return all(result['status'] == 'ok' for result in results)
+
+
 if __name__ == '__main__':
-    FLAGS = create_parser().parse_args()
+    arguments = create_parser()
+    FLAGS = arguments.parse_args()
+    if FLAGS.stream and FLAGS.backend != 'tree':
+        arguments.error("--stream is supported only by tree backend")
+    if FLAGS.stream and FLAGS.parser == 'fast':
+        arguments.error("--stream is supported only by ply parser")
+    if FLAGS.dtype != 'float64' and FLAGS.backend != 'tree':
+        arguments.error("--dtype is supported only by tree backend")
+    if FLAGS.stats and FLAGS.batch:
+        arguments.error("--stats is not supported by --batch, its summary has time of stages")
+    if FLAGS.batch:
+        options = job_options({
+            'ast': not FLAGS.disable_ast, 'type_check': not FLAGS.disable_type_check,
+            'interpretation': not FLAGS.disable_interpretation, 'backend': FLAGS.backend,
+            'disassemble': FLAGS.disassemble, 'opcode_stats': FLAGS.opcode_stats, 'emit_python': FLAGS.emit_python,
+            'optimization_stats': FLAGS.optimization_stats, 'dtype': FLAGS.dtype, 'jit': FLAGS.jit,
+            'iterative': FLAGS.iterative, 'stream': FLAGS.stream, 'parser': FLAGS.parser})
+        sys.exit(0 if run_batch(batch_files(FLAGS.batch), options, FLAGS.jobs) else 1)
     try:
         file = open(FLAGS.filename, "r")
     except IOError:
@@ -44,10 +198,33 @@ if __name__ == '__main__':
     except ImportError:
         print(f"TreePrinter not found in {os.path.dirname(os.path.realpath(__file__))}")
         sys.exit(0)
-    parser = Parser()
     text = file.read()
+    cache = None if FLAGS.disable_cache else CodeCache(FLAGS.cache_dir, FLAGS.cache_size << 20)
+    ast_cache = None if FLAGS.disable_cache or FLAGS.stream else ASTCache(FLAGS.cache_dir, FLAGS.cache_size << 20)
+    cached = cache and FLAGS.backend == 'python' and FLAGS.disable_ast and not FLAGS.disable_type_check \
+        and not FLAGS.disable_interpretation and not FLAGS.optimization_stats and not FLAGS.stats \
+        and cache.load(text)
+    if cached:  # program was already checked and compiled, skip lexing, parsing and type checking
+        source, code = cached
+        if FLAGS.emit_python:
+            print(source)
+        try:
+            run(code)
+            print(f"No return statement found during interpretation")
+        except ReturnValueException as e:
+            print(f"Interpretation finished with exit code {e.value}")
+        sys.exit(0)
+    parser = Parser(backend=FLAGS.backend, disassemble=FLAGS.disassemble, opcode_stats=FLAGS.opcode_stats,
+                    emit_python=FLAGS.emit_python, cache=cache, optimization_stats=FLAGS.optimization_stats,
+                    dtype=FLAGS.dtype, profile=FLAGS.profile_stacks if FLAGS.profile else None,
+                    jit=FLAGS.jit, iterative=FLAGS.iterative, stream=FLAGS.stream, ast_cache=ast_cache,
+                    parser=FLAGS.parser, stats=FLAGS.stats is not None)
     parser.parse(text,
                  ast=not FLAGS.disable_ast,
                  type_check=not FLAGS.disable_type_check,
                  interpretation=not FLAGS.disable_interpretation
                  )
+    if FLAGS.stats == 'json':
+        print(json.dumps(parser.pipeline.stats))
+    elif FLAGS.stats:
+        print(parser.pipeline.report())
@@ -3,11 +3,28 @@ import os
 import ply.yacc as yacc
 
 from AST import *
+from Bytecode import BytecodeCompiler, disassemble
+from ClosureCompiler import ClosureCompiler
 from Exceptions import ReturnValueException
+from FastParser import FastParser
+from Fuser import Fuser
 from Interpreter import Interpreter
+from Iterative import IterativeInterpreter
+from JIT import TracingInterpreter
+from Optimizer import Optimizer
+from Pipeline import Pipeline
+from Profiler import ProfilingInterpreter
+from Transpiler import CodeCache, run, transpile
 from TypeChecker import TypeChecker
+from VM import VM
+from Vectorizer import Vectorizer
 from scanner import Scanner
 
+try:
+    import parsetab  # tables packaged by tables.py, loaded without generating or writing anything
+except ImportError:
+    parsetab = None
+
 
 def create_dir(directory):
     if not os.path.exists(directory):
@@ -28,23 +45,164 @@ class Parser(object):
         ('nonassoc', 'ELSE')
     )
 
-    def __init__(self, start="program", outputdir="logs", tabmodule="baseparsetab"):
-        create_dir(outputdir)
+    backends = ('tree', 'closure', 'vm', 'python')
+    parsers = ('ply', 'fast')
+
+    def __init__(self, start="program", outputdir="logs", tabmodule=None, backend="tree",
+                 disassemble=False, opcode_stats=False, emit_python=False, cache=None, optimization_stats=False,
+                 dtype="float64", profile=None, jit=False, iterative=False, stream=False, ast_cache=None, parser="ply",
+                 stats=False):
+        if stream and backend != "tree":
+            raise ValueError("streaming is supported only by tree backend")
+        if stream and parser == "fast":
+            raise ValueError("streaming is supported only by ply parser")
+        if dtype != "float64" and backend != "tree":
+            raise ValueError(f"{dtype} dtype is supported only by tree backend")
+        self.backend = backend
+        self.disassemble = disassemble  # vm backend only
+        self.opcode_stats = opcode_stats  # vm backend only
+        self.emit_python = emit_python  # python backend only
+        self.cache = cache  # python backend only, CodeCache storing compiled programs
+        self.optimization_stats = optimization_stats
+        self.profile = profile  # tree backend only, path of collapsed stacks file, None if not profiling
+        self.iterative = iterative  # tree backend only, explicit stack interpreter for ASTs of any depth
+        self.jit = jit  # tree backend only, TracingInterpreter compiling hot loops
+        self.dtype = dtype  # tree backend only, dtype of float matrices
+        self.stream = stream  # tree backend only, top-level statements are checked and run as soon as parsed
+        self.ast_cache = ast_cache  # ASTCache of type checked programs, not used when streaming
+        self.fast = parser == "fast"  # FastParser parses programs, PLY parser only those with errors
+        self.folded = 0  # nodes folded by optimizer in streamed program
+        self.exit_code = None  # value of return statement of the last interpreted program
+        self.pipeline = Pipeline(self, detailed=stats)  # stages of programs, with their stats
+        self.text = ""
         self.ast = False
         self.type_check = False
         self.interpretation = False
         self.scanner = Scanner()
-        self.type_checker = TypeChecker()
-        self.interpreter = Interpreter()
-        self.parser = yacc.yacc(module=self, start=start, tabmodule=tabmodule, outputdir=outputdir)
+        self.fast_parser = FastParser(self.scanner)
+        self.reset()
+        if tabmodule is None and start == "program" and parsetab is not None:
+            # stale tables are still detected by grammar signature, then generated in memory only
+            self.parser = yacc.yacc(module=self, start=start, tabmodule=parsetab, debug=False, write_tables=False)
+        else:  # tables generated to outputdir, as well as parser.out
+            create_dir(outputdir)
+            self.parser = yacc.yacc(module=self, start=start, tabmodule=tabmodule or "baseparsetab",
+                                    outputdir=outputdir)
+        self.signature = self.grammar_signature(start) if ast_cache else None
         self.error = False
 
-    def parse(self, text, ast=False, type_check=False, interpretation=False):
-        self.ast = ast
-        self.type_check = type_check
-        self.interpretation = interpretation
-        self.error = False
-        self.parser.parse(text)
+    def grammar_signature(self, start):  # signature PLY checks tables against, changes with grammar
+        reflect = yacc.ParserReflect({name: getattr(self, name) for name in dir(self)})
+        reflect.get_all()
+        return start + reflect.signature()
+
+    def reset(self):  # fresh type checker, optimizer and interpreter for current options, lexer and tables stay
+        self.type_checker = TypeChecker()
+        self.optimizer = Optimizer()
+        if self.profile:
+            self.interpreter = ProfilingInterpreter(self.dtype)
+        elif self.jit:
+            self.interpreter = TracingInterpreter(self.dtype)
+        elif self.iterative:
+            self.interpreter = IterativeInterpreter(self.dtype)
+        else:
+            self.interpreter = Interpreter(self.dtype)
+
+    def parse(self, text, ast=False, type_check=False, interpretation=False):  # runs pipeline of program
+        return self.pipeline.run(text, ast, type_check, interpretation)
+
+    def parse_tokens(self, tokens: list):  # PLY parse of tokens of Scanner, reports syntax errors
+        lexer = self.scanner.lexer
+        end = tokens[-1]
+        tokens = iter(tokens)
+
+        def token():  # as read from lexer, with illegal characters and line of lexer, which actions take
+            token = next(tokens, end)
+            while token.type == 'ILLEGAL':
+                print(token.value)
+                token = next(tokens, end)
+            lexer.lineno = token.lineno
+            return None if token is end else token
+
+        return self.parser.parse(lexer=lexer, tokenfunc=token)
+
+    def parse_stream(self, text):  # top-level statements are run by p_program_statements, program is empty
+        running = self.type_check and self.interpretation
+        if self.interpretation and not self.type_check:
+            print(f"Type Check is necessary for Interpretation, Interpretation won't be executed")
+        self.folded = 0
+        self.scanner.lexer.lineno = 1
+        if running:
+            self.interpreter.start()
+        try:
+            program = self.parser.parse(text, lexer=self.scanner.lexer)
+            if running and self.optimization_stats:
+                print(f"Optimization folded {self.folded} nodes")
+            if running and self.error:
+                print(f"Provided program has Syntax error, Interpretation stopped")
+            elif running and self.type_checker.error:
+                print(f"Provided program has Type Error, Interpretation stopped")
+            elif running:
+                print(f"No return statement found during interpretation")
+            return program
+        except ReturnValueException as e:
+            self.exit_code = e.value
+            print(f"Interpretation finished with exit code {e.value}")
+        finally:
+            if running and self.profile:
+                print(self.interpreter.report(self.text))
+                self.interpreter.write_stacks(self.profile)
+
+    def _run_statement(self, statement: AstNode):  # streaming, checks and runs top-level statement once parsed
+        if self.error:  # statements after syntax error are only parsed
+            return
+        program = Statements([statement])
+        if self.ast:
+            program.printTree()
+        if not self.type_check:
+            return
+        self.pipeline.measure('check', self.type_checker.visit, program)
+        if self.interpretation and not self.type_checker.error:
+            program = self.pipeline.measure('optimize', self.optimizer.optimize, program)
+            self.folded += self.optimizer.folded
+            self.pipeline.measure('execute', self.execute_next, program)
+
+    def execute(self, program: Statements):  # runs type checked program with selected backend
+        if self.backend == "closure":
+            ClosureCompiler().compile(program)()
+        elif self.backend == "vm":
+            code = BytecodeCompiler().compile(program)
+            if self.disassemble:
+                print(disassemble(code))
+            vm = VM(count=self.opcode_stats)
+            try:
+                vm.run(code)
+            finally:
+                if self.opcode_stats:
+                    print(vm.report())
+        elif self.backend == "python":
+            source, code = transpile(program)
+            if self.emit_python:
+                print(source)
+            if self.cache and not self.pipeline.illegal:  # cache hit would skip lexer messages
+                self.cache.store(self.text, source, code)
+            run(code)
+        else:
+            if not self.iterative:  # both passes are recursive
+                Vectorizer().vectorize(program)
+                Fuser().fuse(program)
+            try:
+                self.interpreter.run(program)
+            finally:
+                if self.profile:
+                    print(self.interpreter.report(self.text))
+                    self.interpreter.write_stacks(self.profile)
+
+    def execute_next(self, program: Statements):  # runs next top-level statement of streamed program
+        if not self.iterative:
+            Vectorizer().vectorize(program)
+            Fuser().fuse(program)
+        self.interpreter.run_next(program)
 
     def p_error(self, p):
         if p:
@@ -59,49 +217,35 @@ class Parser(object):
         pass
 
     def p_program(self, p):
-        """program : statements"""
+        """program : program_statements"""
         p[0] = p[1]
-        if self.ast:
-            if not self.error:
-                p[0].printTree()
-            else:
-                print(f"Provided program has Syntax error, AST Tree won't be printed")
-        if self.type_check:
-            if not self.error:
-                self.type_checker.visit(p[0])  # Prints all Type Errors (Syntax Errors are not allowed here)
-            else:
-                print(f"Provided program has Syntax error, Type Check won't be executed")
-        if self.interpretation:
-            if not self.type_check:
-                print(f"Type Check is necessary for Interpretation, Interpretation won't be executed")
-            else:
-                if self.error:
-                    print(f"Provided program has Syntax error, Interpretation won't be executed")
-                elif self.type_checker.error:
-                    print(f"Provided program has Type Error, Interpretation won't be executed")
-                else:
-                    try:
-                        p[0].accept(self.interpreter)
-                        print(f"No return statement found during interpretation")
-                    except ReturnValueException as e:
-                        print(f"Interpretation finished with exit code {e.value}")
 
+    # Lists are left recursive and appended in place, so parsing is linear and LALR stack does not grow with them
     def p_statements(self, p):
         """statements : empty
-                      | LCURLY statements RCURLY statements
-                      | statement statements
+                      | statements LCURLY statements RCURLY
+                      | statements statement
+        """
+        if len(p) == 2:
+            p[0] = Statements([])
+        else:
+            p[1].statements.append(p[3] if len(p) == 5 else p[2])  # nested { } is inner Statements
+            p[0] = p[1]
+
+    def p_program_statements(self, p):  # top-level statements, not kept when streaming
+        """program_statements : empty
+                              | program_statements LCURLY statements RCURLY
+                              | program_statements statement
         """
         if len(p) == 2:
             p[0] = Statements([])
-        elif len(p) == 3:
-            sts = p[2] if p[2] else Statements([])
-            sts.statements = [p[1]] + sts.statements
-            p[0] = sts
         else:
-            outer = p[4] if p[4] else Statements([])
-            inner = p[2] if p[2] else Statements([])
-            outer.statements = [inner] + outer.statements
-            p[0] = outer
+            statement = p[3] if len(p) == 5 else p[2]
+            if self.stream:
+                self._run_statement(statement)
+            else:
+                p[1].statements.append(statement)
+            p[0] = p[1]
 
     def p_block(self, p):
         """block : statement
@@ -192,18 +336,25 @@ class Parser(object):
         p[0] = ForExpr(Id(p[1]), p[3], p[5], lineno=self.scanner.lexer.lineno)
 
     def p_expressions(self, p):
-        """ expressions : expression COMMA expressions
-                        | expression
+        """ expressions : expression_list
+                        | expression_list COMMA
         """
-        if len(p) == 2:
-            p[0] = [p[1]]
-        else:
-            p[0] = [p[1]] + p[3]
+        p[0] = p[1]  # trailing comma is allowed
 
     def p_expressions_empty(self, p):
         """ expressions : empty """
         p[0] = []
 
+    def p_expression_list(self, p):
+        """ expression_list : expression_list COMMA expression
+                            | expression
+        """
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
+
     def p_control_expression(self, p):
         """control_expression : BREAK
                               | CONTINUE
@@ -217,18 +368,25 @@ class Parser(object):
             p[0] = Return(p[2], lineno=self.scanner.lexer.lineno)
 
     def p_assignments(self, p):
-        """assignments : assignment COMMA assignments
-                       | assignment
+        """assignments : assignment_list
+                       | assignment_list COMMA
         """
-        if len(p) == 2:
-            p[0] = [p[1]]
-        else:
-            p[0] = [p[1]] + p[3]
+        p[0] = p[1]  # trailing comma is allowed
 
     def p_assignments_empty(self, p):
         """assignments : empty """
         p[0] = []
 
+    def p_assignment_list(self, p):
+        """assignment_list : assignment_list COMMA assignment
+                           | assignment
+        """
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
+
     def p_assignment(self, p):
         """assignment : ID assign_op expression
                       | ID LBRACKET expressions RBRACKET assign_op expression
@@ -269,7 +427,9 @@ class Parser(object):
         if len(p) == 2:
             p[0] = p[1]
         else:
-            p[0] = p[1] + [';'] + p[3]  # Keep track of SEMICOL, for inputs like [1;2,3,4]
+            p[1].append(';')  # Keep track of SEMICOL, for inputs like [1;2,3,4]
+            p[1].extend(p[3])
+            p[0] = p[1]
 
     def p_innerlist(self, p):
         """inner_list : inner_list COMMA elem
@@ -278,7 +438,8 @@ class Parser(object):
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_innerlist_empty(self, p):
         """inner_list : empty """
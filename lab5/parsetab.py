@@ -0,0 +1,105 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'programrightASSIGNADDASSIGNSUBASSIGNMULASSIGNDIVASSIGNnonassocGEGEQLELEQEQNEQleftADDSUBDOTADDDOTSUBleftMULDIVDOTMULDOTDIVleftTRANSrightUMINUSnonassocIFXnonassocELSEADD ADDASSIGN ASSIGN BREAK COMMA CONTINUE DIV DIVASSIGN DOTADD DOTDIV DOTMUL DOTSUB ELSE EQ EYE FLOATNUM FOR GE GEQ ID IF INTNUM LBRACKET LCURLY LE LEQ LPAREN MUL MULASSIGN NEQ ONES PRINT RANGE RBRACKET RCURLY RETURN RPAREN SEMICOL STRING SUB SUBASSIGN TRANS WHILE ZEROSempty :program : program_statementsstatements : empty\n                      | statements LCURLY statements RCURLY\n                      | statements statement\n        program_statements : empty\n                              | program_statements LCURLY statements RCURLY\n                              | program_statements statement\n        block : statement\n                 | LCURLY statements RCURLY\n        statement : IF expression block %prec IFX\n                     | IF expression block ELSE block\n                     | WHILE expression block\n                     | FOR for_expression block\n                     | PRINT expressions SEMICOL\n                     | control_expression SEMICOL\n        statement : assignments SEMICOLexpression : expression ADD expression\n                      | expression SUB expression\n                      | expression DIV expression\n                      | expression MUL expression\n                      | expression DOTADD expression\n                      | expression DOTSUB expression\n                      | expression DOTDIV expression\n                      | expression DOTMUL expression\n                      | expression GE expression\n                      | expression GEQ expression\n                      | expression LE expression\n                      | expression LEQ expression\n                      | expression EQ expression\n                      | expression NEQ expression\n        expression : LPAREN expression RPARENexpression : variablevariable : const\n                    | matrix\n        variable : IDvariable : SUB variable %prec UMINUSvariable : variable TRANSconst : STRING\n                 | FLOATNUM\n                 | INTNUM\n         for_expression : ID ASSIGN expression RANGE expression expressions : expression_list\n                        | expression_list COMMA\n         expressions : empty  expression_list : expression_list COMMA expression\n                            | expression\n        control_expression : BREAK\n                              | CONTINUE\n                              | RETURN expressions\n        assignments : assignment_list\n                       | assignment_list COMMA\n        assignments : empty assignment_list : assignment_list COMMA assignment\n                           | assignment\n        assignment : ID assign_op expression\n                      | ID LBRACKET expressions RBRACKET assign_op expression\n        assign_op : ASSIGN\n                     | ADDASSIGN\n                     | SUBASSIGN\n                     | MULASSIGN\n                     | DIVASSIGN\n        matrix : EYE LPAREN expressions RPAREN\n                  | ZEROS LPAREN expressions RPAREN\n                  | ONES LPAREN expressions RPAREN\n        matrix : vectorvector : LBRACKET outer_list RBRACKETouter_list : outer_list SEMICOL inner_list\n                      | inner_list\n        inner_list : inner_list COMMA elem\n                      | elem\n        inner_list : empty elem : const\n                | vector\n        elem : ID'
+    
+_lr_action_items = {'LCURLY':([0,2,3,4,5,19,20,21,24,25,26,27,28,29,30,34,36,37,43,44,54,55,56,57,72,73,74,76,87,88,90,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,122,123,124,125,126,127,132,],[-1,4,-6,-1,-8,54,-3,73,-33,-34,-35,-36,-39,-40,-41,-66,73,73,-16,-17,-1,-7,-5,-11,-9,-1,-37,-38,-13,-14,-15,54,73,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,54,-32,-67,-4,-12,-10,-63,-64,-65,-42,]),'IF':([0,2,3,4,5,19,20,21,24,25,26,27,28,29,30,34,36,37,43,44,54,55,56,57,72,73,74,76,87,88,90,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,122,123,124,125,126,127,132,],[-1,6,-6,-1,-8,6,-3,6,-33,-34,-35,-36,-39,-40,-41,-66,6,6,-16,-17,-1,-7,-5,-11,-9,-1,-37,-38,-13,-14,-15,6,6,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,6,-32,-67,-4,-12,-10,-63,-64,-65,-42,]),'WHILE':([0,2,3,4,5,19,20,21,24,25,26,27,28,29,30,34,36,37,43,44,54,55,56,57,72,73,74,76,87,88,90,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,122,123,124,125,126,127,132,],[-1,7,-6,-1,-8,7,-3,7,-33,-34,-35,-36,-39,-40,-41,-66,7,7,-16,-17,-1,-7,-5,-11,-9,-1,-37,-38,-13,-14,-15,7,7,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,7,-32,-67,-4,-12,-10,-63,-64,-65,-42,]),'FOR':([0,2,3,4,5,19,20,21,24,25,26,27,28,29,30,34,36,37,43,44,54,55,56,57,72,73,74,76,87,88,90,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,122,123,124,125,126,127,132,],[-1,8,-6,-1,-8,8,-3,8,-33,-34,-35,-36,-39,-40,-41,-66,8,8,-16,-17,-1,-7,-5,-11,-9,-1,-37,-38,-13,-14,-15,8,8,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,8,-32,-67,-4,-12,-10,-63,-64,-65,-42,]),'PRINT':([0,2,3,4,5,19,20,21,24,25,26,27,28,29,30,34,36,37,43,44,54,55,56,57,72,73,74,76,87,88,90,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,122,123,124,125,126,127,132,],[-1,9,-6,-1,-8,9,-3,9,-33,-34,-35,-36,-39,-40,-41,-66,9,9,-16,-17,-1,-7,-5,-11,-9,-1,-37,-38,-13,-14,-15,9,9,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,9,-32,-67,-4,-12,-10,-63,-64,-65,-42,]),'BREAK':([0,2,3,4,5,19,20,21,24,25,26,27,28,29,30,34,36,37,43,44,54,55,56,57,72,73,74,76,87,88,90,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,122,123,124,125,126,127,132,],[-1,12,-6,-1,-8,12,-3,12,-33,-34,-35,-36,-39,-40,-41,-66,12,12,-16,-17,-1,-7,-5,-11,-9,-1,-37,-38,-13,-14,-15,12,12,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,12,-32,-67,-4,-12,-10,-63,-64,-65,-42,]),'CONTINUE':([0,2,3,4,5,19,20,21,24,25,26,27,28,29,30,34,36,37,43,44,54,55,56,57,72,73,74,76,87,88,90,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,122,123,124,125,126,127,132,],[-1,13,-6,-1,-8,13,-3,13,-33,-34,-35,-36,-39,-40,-41,-66,13,13,-16,-17,-1,-7,-5,-11,-9,-1,-37,-38,-13,-14,-15,13,13,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,13,-32,-67,-4,-12,-10,-63,-64,-65,-42,]),'RETURN':([0,2,3,4,5,19,20,21,24,25,26,27,28,29,30,34,36,37,43,44,54,55,56,57,72,73,74,76,87,88,90,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,122,123,124,125,126,127,132,],[-1,14,-6,-1,-8,14,-3,14,-33,-34,-35,-36,-39,-40,-41,-66,14,14,-16,-17,-1,-7,-5,-11,-9,-1,-37,-38,-13,-14,-15,14,14,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,14,-32,-67,-4,-12,-10,-63,-64,-65,-42,]),'ID':([0,2,3,4,5,6,7,8,9,14,19,20,21,22,23,24,25,26,27,28,29,30,34,35,36,37,43,44,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,76,77,78,79,87,88,89,90,91,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,117,118,122,123,124,125,126,127,130,131,132,],[-1,18,-6,-1,-8,27,27,38,27,27,18,-3,18,27,27,-33,-34,-35,-36,-39,-40,-41,-66,86,18,18,-16,-17,18,27,27,-58,-59,-60,-61,-62,-1,-7,-5,-11,27,27,27,27,27,27,27,27,27,27,27,27,27,27,-9,-1,-37,-38,27,27,27,-13,-14,27,-15,27,18,18,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,18,-32,-67,86,86,-4,-12,-10,-63,-64,-65,27,27,-42,]),'SEMICOL':([0,2,3,4,5,9,10,11,12,13,14,15,16,17,19,20,21,24,25,26,27,28,29,30,34,35,36,37,39,40,41,42,43,44,45,46,54,55,56,57,72,73,74,76,80,81,82,83,84,85,86,87,88,90,91,92,93,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,116,117,120,122,123,124,125,126,127,128,129,132,133,],[-1,-1,-6,-1,-8,-1,43,44,-48,-49,-1,-51,-53,-55,-1,-3,-1,-33,-34,-35,-36,-39,-40,-41,-66,-1,-1,-1,90,-43,-45,-47,-16,-17,-50,-52,-1,-7,-5,-11,-9,-1,-37,-38,117,-69,-71,-72,-73,-74,-75,-13,-14,-15,-44,-54,-56,-1,-1,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-1,-32,-67,-1,-46,-4,-12,-10,-63,-64,-65,-68,-70,-42,-57,]),'$end':([0,1,2,3,5,43,44,55,57,72,87,88,90,123,124,],[-1,0,-2,-6,-8,-16,-17,-7,-11,-9,-13,-14,-15,-12,-10,]),'RCURLY':([4,19,20,43,44,54,56,57,72,73,87,88,90,95,111,122,123,124,],[-1,55,-3,-16,-17,-1,-5,-11,-9,-1,-13,-14,-15,122,124,-4,-12,-10,]),'LPAREN':([6,7,9,14,23,31,32,33,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,130,131,],[23,23,23,23,23,77,78,79,23,23,-58,-59,-60,-61,-62,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,]),'SUB':([6,7,9,14,21,22,23,24,25,26,27,28,29,30,34,36,42,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,74,75,76,77,78,79,89,91,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,130,131,132,133,],[22,22,22,22,59,22,22,-33,-34,-35,-36,-39,-40,-41,-66,59,59,22,22,-58,-59,-60,-61,-62,22,22,22,22,22,22,22,22,22,22,22,22,22,22,-37,59,-38,22,22,22,22,22,59,-18,-19,-20,-21,-22,-23,-24,-25,59,59,59,59,59,59,-32,-67,59,59,-63,-64,-65,22,22,59,59,]),'STRING':([6,7,9,14,22,23,35,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,117,118,130,131,],[28,28,28,28,28,28,28,28,28,-58,-59,-60,-61,-62,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,]),'FLOATNUM':([6,7,9,14,22,23,35,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,117,118,130,131,],[29,29,29,29,29,29,29,29,29,-58,-59,-60,-61,-62,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,]),'INTNUM':([6,7,9,14,22,23,35,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,117,118,130,131,],[30,30,30,30,30,30,30,30,30,-58,-59,-60,-61,-62,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,]),'EYE':([6,7,9,14,22,23,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,130,131,],[31,31,31,31,31,31,31,31,-58,-59,-60,-61,-62,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,]),'ZEROS':([6,7,9,14,22,23,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,130,131,],[32,32,32,32,32,32,32,32,-58,-59,-60,-61,-62,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,]),'ONES':([6,7,9,14,22,23,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,130,131,],[33,33,33,33,33,33,33,33,-58,-59,-60,-61,-62,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,]),'LBRACKET':([6,7,9,14,18,22,23,35,47,48,49,50,51,52,53,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,117,118,130,131,],[35,35,35,35,48,35,35,35,35,35,-58,-59,-60,-61,-62,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,]),'COMMA':([15,17,24,25,26,27,28,29,30,34,35,40,42,74,76,81,82,83,84,85,86,92,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,117,120,125,126,127,128,129,133,],[46,-55,-33,-34,-35,-36,-39,-40,-41,-66,-1,91,-47,-37,-38,118,-71,-72,-73,-74,-75,-54,-56,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-67,-1,-46,-63,-64,-65,118,-70,-57,]),'ASSIGN':([18,38,121,],[49,89,49,]),'ADDASSIGN':([18,121,],[50,50,]),'SUBASSIGN':([18,121,],[51,51,]),'MULASSIGN':([18,121,],[52,52,]),'DIVASSIGN':([18,121,],[53,53,]),'ADD':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[58,-33,-34,-35,-36,-39,-40,-41,-66,58,58,-37,58,-38,58,-18,-19,-20,-21,-22,-23,-24,-25,58,58,58,58,58,58,-32,-67,58,58,-63,-64,-65,58,58,]),'DIV':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[60,-33,-34,-35,-36,-39,-40,-41,-66,60,60,-37,60,-38,60,60,60,-20,-21,60,60,-24,-25,60,60,60,60,60,60,-32,-67,60,60,-63,-64,-65,60,60,]),'MUL':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[61,-33,-34,-35,-36,-39,-40,-41,-66,61,61,-37,61,-38,61,61,61,-20,-21,61,61,-24,-25,61,61,61,61,61,61,-32,-67,61,61,-63,-64,-65,61,61,]),'DOTADD':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[62,-33,-34,-35,-36,-39,-40,-41,-66,62,62,-37,62,-38,62,-18,-19,-20,-21,-22,-23,-24,-25,62,62,62,62,62,62,-32,-67,62,62,-63,-64,-65,62,62,]),'DOTSUB':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[63,-33,-34,-35,-36,-39,-40,-41,-66,63,63,-37,63,-38,63,-18,-19,-20,-21,-22,-23,-24,-25,63,63,63,63,63,63,-32,-67,63,63,-63,-64,-65,63,63,]),'DOTDIV':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[64,-33,-34,-35,-36,-39,-40,-41,-66,64,64,-37,64,-38,64,64,64,-20,-21,64,64,-24,-25,64,64,64,64,64,64,-32,-67,64,64,-63,-64,-65,64,64,]),'DOTMUL':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[65,-33,-34,-35,-36,-39,-40,-41,-66,65,65,-37,65,-38,65,65,65,-20,-21,65,65,-24,-25,65,65,65,65,65,65,-32,-67,65,65,-63,-64,-65,65,65,]),'GE':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[66,-33,-34,-35,-36,-39,-40,-41,-66,66,66,-37,66,-38,66,-18,-19,-20,-21,-22,-23,-24,-25,None,None,None,None,None,None,-32,-67,66,66,-63,-64,-65,66,66,]),'GEQ':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[67,-33,-34,-35,-36,-39,-40,-41,-66,67,67,-37,67,-38,67,-18,-19,-20,-21,-22,-23,-24,-25,None,None,None,None,None,None,-32,-67,67,67,-63,-64,-65,67,67,]),'LE':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[68,-33,-34,-35,-36,-39,-40,-41,-66,68,68,-37,68,-38,68,-18,-19,-20,-21,-22,-23,-24,-25,None,None,None,None,None,None,-32,-67,68,68,-63,-64,-65,68,68,]),'LEQ':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[69,-33,-34,-35,-36,-39,-40,-41,-66,69,69,-37,69,-38,69,-18,-19,-20,-21,-22,-23,-24,-25,None,None,None,None,None,None,-32,-67,69,69,-63,-64,-65,69,69,]),'EQ':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[70,-33,-34,-35,-36,-39,-40,-41,-66,70,70,-37,70,-38,70,-18,-19,-20,-21,-22,-23,-24,-25,None,None,None,None,None,None,-32,-67,70,70,-63,-64,-65,70,70,]),'NEQ':([21,24,25,26,27,28,29,30,34,36,42,74,75,76,93,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,120,125,126,127,132,133,],[71,-33,-34,-35,-36,-39,-40,-41,-66,71,71,-37,71,-38,71,-18,-19,-20,-21,-22,-23,-24,-25,None,None,None,None,None,None,-32,-67,71,71,-63,-64,-65,71,71,]),'RPAREN':([24,25,26,27,28,29,30,34,40,41,42,74,75,76,77,78,79,91,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,113,114,115,116,120,125,126,127,],[-33,-34,-35,-36,-39,-40,-41,-66,-43,-45,-47,-37,112,-38,-1,-1,-1,-44,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,125,126,127,-67,-46,-63,-64,-65,]),'RBRACKET':([24,25,26,27,28,29,30,34,35,40,41,42,48,74,76,80,81,82,83,84,85,86,91,94,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,117,120,125,126,127,128,129,],[-33,-34,-35,-36,-39,-40,-41,-66,-1,-43,-45,-47,-1,-37,-38,116,-69,-71,-72,-73,-74,-75,-44,121,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-67,-1,-46,-63,-64,-65,-68,-70,]),'RANGE':([24,25,26,27,28,29,30,34,74,76,97,98,99,100,101,102,103,104,105,106,107,108,109,110,112,116,119,125,126,127,],[-33,-34,-35,-36,-39,-40,-41,-66,-37,-38,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-67,130,-63,-64,-65,]),'TRANS':([24,25,26,27,28,29,30,34,74,76,116,125,126,127,],[76,-34,-35,-36,-39,-40,-41,-66,-37,-38,-67,-63,-64,-65,]),'ELSE':([43,44,57,72,87,88,90,123,124,],[-16,-17,96,-9,-13,-14,-15,-12,-10,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'program_statements':([0,],[2,]),'empty':([0,2,4,9,14,19,21,35,36,37,48,54,73,77,78,79,95,96,111,117,],[3,16,20,41,41,16,16,83,16,16,41,20,20,41,41,41,16,16,16,83,]),'statement':([2,19,21,36,37,95,96,111,],[5,56,72,72,72,56,72,56,]),'control_expression':([2,19,21,36,37,95,96,111,],[10,10,10,10,10,10,10,10,]),'assignments':([2,19,21,36,37,95,96,111,],[11,11,11,11,11,11,11,11,]),'assignment_list':([2,19,21,36,37,95,96,111,],[15,15,15,15,15,15,15,15,]),'assignment':([2,19,21,36,37,46,95,96,111,],[17,17,17,17,17,92,17,17,17,]),'statements':([4,54,73,],[19,95,111,]),'expression':([6,7,9,14,23,47,48,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,130,131,],[21,36,42,42,75,93,42,97,98,99,100,101,102,103,104,105,106,107,108,109,110,42,42,42,119,120,132,133,]),'variable':([6,7,9,14,22,23,47,48,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,130,131,],[24,24,24,24,74,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,]),'const':([6,7,9,14,22,23,35,47,48,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,117,118,130,131,],[25,25,25,25,25,25,84,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,84,84,25,25,]),'matrix':([6,7,9,14,22,23,47,48,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,130,131,],[26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,]),'vector':([6,7,9,14,22,23,35,47,48,58,59,60,61,62,63,64,65,66,67,68,69,70,71,77,78,79,89,91,117,118,130,131,],[34,34,34,34,34,34,85,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,85,85,34,34,]),'for_expression':([8,],[37,]),'expressions':([9,14,48,77,78,79,],[39,45,94,113,114,115,]),'expression_list':([9,14,48,77,78,79,],[40,40,40,40,40,40,]),'assign_op':([18,121,],[47,131,]),'block':([21,36,37,96,],[57,87,88,123,]),'outer_list':([35,],[80,]),'inner_list':([35,117,],[81,128,]),'elem':([35,117,118,],[82,82,129,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',216),
+  ('program -> program_statements','program',1,'p_program','parser.py',220),
+  ('statements -> empty','statements',1,'p_statements','parser.py',225),
+  ('statements -> statements LCURLY statements RCURLY','statements',4,'p_statements','parser.py',226),
+  ('statements -> statements statement','statements',2,'p_statements','parser.py',227),
+  ('program_statements -> empty','program_statements',1,'p_program_statements','parser.py',236),
+  ('program_statements -> program_statements LCURLY statements RCURLY','program_statements',4,'p_program_statements','parser.py',237),
+  ('program_statements -> program_statements statement','program_statements',2,'p_program_statements','parser.py',238),
+  ('block -> statement','block',1,'p_block','parser.py',251),
+  ('block -> LCURLY statements RCURLY','block',3,'p_block','parser.py',252),
+  ('statement -> IF expression block','statement',3,'p_statement','parser.py',260),
+  ('statement -> IF expression block ELSE block','statement',5,'p_statement','parser.py',261),
+  ('statement -> WHILE expression block','statement',3,'p_statement','parser.py',262),
+  ('statement -> FOR for_expression block','statement',3,'p_statement','parser.py',263),
+  ('statement -> PRINT expressions SEMICOL','statement',3,'p_statement','parser.py',264),
+  ('statement -> control_expression SEMICOL','statement',2,'p_statement','parser.py',265),
+  ('statement -> assignments SEMICOL','statement',2,'p_statement_assignments','parser.py',280),
+  ('expression -> expression ADD expression','expression',3,'p_expression','parser.py',284),
+  ('expression -> expression SUB expression','expression',3,'p_expression','parser.py',285),
+  ('expression -> expression DIV expression','expression',3,'p_expression','parser.py',286),
+  ('expression -> expression MUL expression','expression',3,'p_expression','parser.py',287),
+  ('expression -> expression DOTADD expression','expression',3,'p_expression','parser.py',288),
+  ('expression -> expression DOTSUB expression','expression',3,'p_expression','parser.py',289),
+  ('expression -> expression DOTDIV expression','expression',3,'p_expression','parser.py',290),
+  ('expression -> expression DOTMUL expression','expression',3,'p_expression','parser.py',291),
+  ('expression -> expression GE expression','expression',3,'p_expression','parser.py',292),
+  ('expression -> expression GEQ expression','expression',3,'p_expression','parser.py',293),
+  ('expression -> expression LE expression','expression',3,'p_expression','parser.py',294),
+  ('expression -> expression LEQ expression','expression',3,'p_expression','parser.py',295),
+  ('expression -> expression EQ expression','expression',3,'p_expression','parser.py',296),
+  ('expression -> expression NEQ expression','expression',3,'p_expression','parser.py',297),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',302),
+  ('expression -> variable','expression',1,'p_expression_variable','parser.py',306),
+  ('variable -> const','variable',1,'p_variable','parser.py',310),
+  ('variable -> matrix','variable',1,'p_variable','parser.py',311),
+  ('variable -> ID','variable',1,'p_variable_id','parser.py',316),
+  ('variable -> SUB variable','variable',2,'p_variable_uminus','parser.py',320),
+  ('variable -> variable TRANS','variable',2,'p_variable_trans','parser.py',324),
+  ('const -> STRING','const',1,'p_const','parser.py',328),
+  ('const -> FLOATNUM','const',1,'p_const','parser.py',329),
+  ('const -> INTNUM','const',1,'p_const','parser.py',330),
+  ('for_expression -> ID ASSIGN expression RANGE expression','for_expression',5,'p_for_expression','parser.py',335),
+  ('expressions -> expression_list','expressions',1,'p_expressions','parser.py',339),
+  ('expressions -> expression_list COMMA','expressions',2,'p_expressions','parser.py',340),
+  ('expressions -> empty','expressions',1,'p_expressions_empty','parser.py',345),
+  ('expression_list -> expression_list COMMA expression','expression_list',3,'p_expression_list','parser.py',349),
+  ('expression_list -> expression','expression_list',1,'p_expression_list','parser.py',350),
+  ('control_expression -> BREAK','control_expression',1,'p_control_expression','parser.py',359),
+  ('control_expression -> CONTINUE','control_expression',1,'p_control_expression','parser.py',360),
+  ('control_expression -> RETURN expressions','control_expression',2,'p_control_expression','parser.py',361),
+  ('assignments -> assignment_list','assignments',1,'p_assignments','parser.py',371),
+  ('assignments -> assignment_list COMMA','assignments',2,'p_assignments','parser.py',372),
+  ('assignments -> empty','assignments',1,'p_assignments_empty','parser.py',377),
+  ('assignment_list -> assignment_list COMMA assignment','assignment_list',3,'p_assignment_list','parser.py',381),
+  ('assignment_list -> assignment','assignment_list',1,'p_assignment_list','parser.py',382),
+  ('assignment -> ID assign_op expression','assignment',3,'p_assignment','parser.py',391),
+  ('assignment -> ID LBRACKET expressions RBRACKET assign_op expression','assignment',6,'p_assignment','parser.py',392),
+  ('assign_op -> ASSIGN','assign_op',1,'p_assign_op','parser.py',400),
+  ('assign_op -> ADDASSIGN','assign_op',1,'p_assign_op','parser.py',401),
+  ('assign_op -> SUBASSIGN','assign_op',1,'p_assign_op','parser.py',402),
+  ('assign_op -> MULASSIGN','assign_op',1,'p_assign_op','parser.py',403),
+  ('assign_op -> DIVASSIGN','assign_op',1,'p_assign_op','parser.py',404),
+  ('matrix -> EYE LPAREN expressions RPAREN','matrix',4,'p_matrix_special','parser.py',409),
+  ('matrix -> ZEROS LPAREN expressions RPAREN','matrix',4,'p_matrix_special','parser.py',410),
+  ('matrix -> ONES LPAREN expressions RPAREN','matrix',4,'p_matrix_special','parser.py',411),
+  ('matrix -> vector','matrix',1,'p_matrix','parser.py',416),
+  ('vector -> LBRACKET outer_list RBRACKET','vector',3,'p_vector','parser.py',420),
+  ('outer_list -> outer_list SEMICOL inner_list','outer_list',3,'p_outerlist','parser.py',424),
+  ('outer_list -> inner_list','outer_list',1,'p_outerlist','parser.py',425),
+  ('inner_list -> inner_list COMMA elem','inner_list',3,'p_innerlist','parser.py',435),
+  ('inner_list -> elem','inner_list',1,'p_innerlist','parser.py',436),
+  ('inner_list -> empty','inner_list',1,'p_innerlist_empty','parser.py',445),
+  ('elem -> const','elem',1,'p_elem','parser.py',449),
+  ('elem -> vector','elem',1,'p_elem','parser.py',450),
+  ('elem -> ID','elem',1,'p_elem_id','parser.py',455),
+]
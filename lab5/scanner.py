@@ -1,5 +1,10 @@
 import ply.lex as lex
 
+try:
+    import lextab  # tables packaged by tables.py, master regex is not rebuilt
+except ImportError:
+    lextab = None
+
 
 class Scanner(object):
     reserved = {
@@ -66,7 +71,11 @@ class Scanner(object):
     t_ignore = ' \t'
 
     def __init__(self):
-        self.lexer = lex.lex(module=self)
+        self.illegal = None  # tokens of tokenize, which gets illegal characters as ILLEGAL tokens
+        if lextab is not None:
+            self.lexer = lex.lex(module=self, optimize=True, lextab=lextab)
+        else:
+            self.lexer = lex.lex(module=self)
 
     def t_FLOATNUM(self, t):
         r'\d+\.\d*|\.\d+'
@@ -97,7 +106,11 @@ class Scanner(object):
         t.lexer.lineno += len(t.value)
 
     def t_error(self, t):
-        print(f"Illegal character '{t.value[0]}' at line {t.lineno}, column {self.find_tok_column(t)}, skipping.")
+        message = f"Illegal character '{t.value[0]}' at line {t.lineno}, column {self.find_tok_column(t)}, skipping."
+        if self.illegal is None:
+            print(message)
+        else:  # reported by parser when it reads the next token, as if lexed on the fly
+            self.illegal.append(self.token_of('ILLEGAL', message, t.lineno, t.lexpos))
         t.lexer.skip(1)
 
     # Build the lexer
@@ -110,6 +123,28 @@ class Scanner(object):
     def token(self):
         return self.lexer.token()
 
+    def tokenize(self, text):  # all tokens of text, then $end token with the last line
+        self.lexer.input(text)
+        self.lexer.lineno = 1
+        self.illegal = tokens = []
+        append, token = tokens.append, self.lexer.token
+        try:
+            while True:
+                lexed = token()
+                if lexed is None:
+                    break
+                append(lexed)
+        finally:
+            self.illegal = None
+        tokens.append(self.token_of('$end', None, self.lexer.lineno, len(text)))
+        return tokens
+
+    @staticmethod
+    def token_of(kind, value, lineno, lexpos):
+        token = lex.LexToken()
+        token.type, token.value, token.lineno, token.lexpos = kind, value, lineno, lexpos
+        return token
+
     def find_tok_column(self, token):
         line_start = self.lexer.lexdata.rfind('\n', 0, token.lexpos) + 1
         return (token.lexpos - line_start) + 1
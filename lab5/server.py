@@ -0,0 +1,133 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from Worker import init_worker, job_options, run_job
+
+
+def _error(status: str, message: str):  # response of job which did not run to its end
+    return {'status': status, 'exit_code': None, 'output': f"{message}\n", 'timings': {}}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:  # one JSON request per line, answered by one JSON response line
+            submitted = time.time()
+            try:
+                request = json.loads(line)
+                options = job_options(request.get('options', {}))
+                text = request['text']
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                response = _error('bad request', str(e))
+            else:
+                response = self.server.run(text, options, submitted)
+            self.wfile.write((json.dumps(response) + '\n').encode())
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Runs programs sent over Unix socket in a pool of worker processes with warm Parser.
+
+    Workers import NumPy and load parser tables once, every job gets fresh type checker, optimizer and
+    interpreter. Requests are JSON lines {"text": source, "options": {...}} with options of OPTIONS,
+    responses are JSON lines with status, exit code, captured output and timings. When a worker dies or a
+    job runs longer than timeout seconds, the pool is replaced and jobs running in it get error response.
+    Workers write their pid to the slot of a job in shared array when they start it, so the worker of a
+    stuck job is killed and jobs which did not start before the pool broke run once more in the new pool.
+    """
+    daemon_threads = True
+    slots = 1 << 16  # of shared array, more jobs at once than slots could see pid of other job
+
+    def __init__(self, path: str, workers: int, timeout: float = None):
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):  # left by server which was killed
+            os.unlink(path)
+        super().__init__(path, _Handler)
+        self.workers = workers
+        self.timeout = timeout
+        self.lock = threading.Lock()  # held while pool is replaced
+        self.started = multiprocessing.RawArray('i', self.slots)  # pids of workers by job % slots, 0 before start
+        self.jobs = itertools.count()
+        self.executor = self._start()
+
+    def _start(self):  # pool of warm workers
+        executor = ProcessPoolExecutor(self.workers, initializer=init_worker, initargs=(self.started,))
+        wait([executor.submit(os.getpid) for _ in range(self.workers)])
+        return executor
+
+    def _restart(self, executor: ProcessPoolExecutor):  # replaces broken or stuck pool, once for all its jobs
+        with self.lock:
+            if self.executor is not executor:  # already replaced by other handler
+                return
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._start()
+
+    def run(self, text: str, options: dict, submitted: float):  # response of job run by worker
+        job = next(self.jobs)
+        slot = job % self.slots
+        self.started[slot] = 0
+        for retry in (True, False):
+            executor = self.executor
+            try:
+                return executor.submit(run_job, text, options, submitted, job).result(self.timeout)
+            except BrokenProcessPool:
+                self._restart(executor)
+                if not retry or self.started[slot]:
+                    return _error('worker died', "Worker process died while running the program")
+            except TimeoutError:
+                if self.started[slot]:  # stuck worker does not stop otherwise, the pool then stops the others
+                    try:
+                        os.kill(self.started[slot], signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                self._restart(executor)
+                return _error('timeout', f"Program did not finish in {self.timeout:g} s, its worker was restarted")
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown()
+        os.unlink(self.server_address)
+
+
+def _terminate(signum, frame):  # SIGTERM stops server as Ctrl+C
+    raise KeyboardInterrupt
+
+
+def create_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--socket',
+        help='Path of Unix socket to listen on',
+        type=str,
+        default=os.path.join('logs', 'server.sock'))
+    parser.add_argument(
+        '--workers',
+        help='Number of worker processes',
+        type=int,
+        default=os.cpu_count())
+    parser.add_argument(
+        '--timeout',
+        help='Seconds a program may run before its worker is restarted',
+        type=float,
+        default=60)
+    return parser
+
+
+if __name__ == '__main__':
+    FLAGS = create_parser().parse_args()
+    os.makedirs(os.path.dirname(FLAGS.socket) or '.', exist_ok=True)
+    with Server(FLAGS.socket, FLAGS.workers, FLAGS.timeout) as server:
+        print(f"Listening on {FLAGS.socket} with {FLAGS.workers} workers")
+        signal.signal(signal.SIGTERM, _terminate)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,48 @@
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+
+import ply.lex as lex
+
+from parser import Parser
+from scanner import Scanner
+
+TABLES = ('parsetab.py', 'lextab.py')
+
+
+def write_tables(directory):  # writes parse and lex tables of current grammar and tokens to directory
+    with tempfile.TemporaryDirectory() as output:
+        Parser(outputdir=output, tabmodule="generatedparsetab")  # name not importable, always generated
+        with open(os.path.join(output, "generatedparsetab.py")) as file:
+            source = file.read().replace("# generatedparsetab.py", "# parsetab.py", 1)
+    with open(os.path.join(directory, "parsetab.py"), "w") as file:
+        file.write(source)
+    lex.lex(module=Scanner()).writetab("lextab", directory)
+
+
+def create_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--check',
+        help='Only check that packaged tables are up to date, exit status 1 if not',
+        action='store_true',
+        default=False)
+    return parser
+
+
+if __name__ == '__main__':
+    FLAGS = create_parser().parse_args()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    if not FLAGS.check:
+        write_tables(directory)
+        sys.exit(0)
+    with tempfile.TemporaryDirectory() as generated:
+        write_tables(generated)
+        stale = [name for name in TABLES
+                 if not os.path.exists(os.path.join(directory, name))
+                 or not filecmp.cmp(os.path.join(directory, name), os.path.join(generated, name), shallow=False)]
+    if stale:
+        print(f"Stale tables: {', '.join(stale)}, run python3 tables.py")
+    sys.exit(1 if stale else 0)
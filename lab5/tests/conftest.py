@@ -0,0 +1,22 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Parser  # noqa: E402
+
+
+def execute(parser: Parser, text: str):  # output of type checked and interpreted program
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        parser.parse(text, type_check=True, interpretation=True)
+    return output.getvalue()
+
+
+@pytest.fixture
+def run():  # runs program with fresh Parser of given options, returns its output
+    return lambda text, **options: execute(Parser(**options), text)
@@ -0,0 +1,21 @@
+A = zeros(3);
+B = [1, 2, 3; 4, 5, 6; 7, 8, 9];
+x = 0;
+for i = 0:3 {
+    for j = 0:3 {
+        A[i, j] = i * 3 + j;
+    }
+}
+print A;
+C = A .+ B';
+print C, -x;
+n = 10;
+while (n > 0) {
+    n -= 1;
+    if (n == 5) continue;
+    if (n == 2) break;
+    x += n;
+}
+print x, n;
+{ y = 2; print y; }
+return 0;
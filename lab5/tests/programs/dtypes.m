@@ -0,0 +1,18 @@
+A = [1, 2; 3, 4];
+B = [1.5, 2.5; 3.5, 4.5];
+C = ones(2);
+D = A .+ A;
+E = A ./ A;
+F = A .+ B;
+G = A .* A .+ B .- C;
+x = 2;
+H = [x, x; x, x];
+y = 2.5;
+K = [y, 1.0; 2.0, 3.0];
+L = [1, 2; 3, 4];
+L /= A;
+M = [1, 2; 3, 4];
+M += 1;
+N = C;
+N += C;
+return 0;
@@ -0,0 +1,12 @@
+x = 2 * 3 + 1;
+y = --x;
+z = - -4;
+if (1 < 2) print "yes"; else print "no";
+if (2 < 1) { print "dead"; }
+while (3 < 1) { print "never"; }
+k = 0;
+while (k < 3) { k += 1 + 1; if (5 == 5) { continue; } print "skip"; }
+print x, y, z, k, 1 < 2, 7 / 2, 2.5 * 2;
+A = eye(2 + 1);
+print A';
+return 10 - 3;
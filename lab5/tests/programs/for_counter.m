@@ -0,0 +1,12 @@
+i = 100;
+for i = 0:10 {
+    if (i == 2) { i += 3; continue; }
+    if (i == 8) break;
+    print i;
+}
+print i;
+for i = 5:2 { print "never"; }
+print i;
+for i = 0:4 { if (i == 2) break; }
+print i;
+return i;
@@ -0,0 +1,21 @@
+A = ones(3);
+B = A;
+A += B;
+print A;
+print B;
+C = eye(3);
+D = C';
+C += ones(3);
+print C;
+print D;
+E = zeros(3);
+E += ones(3);
+E *= E;
+print E;
+F = [1, 2; 3, 4];
+F /= [2, 2; 2, 2];
+print F;
+G = [1, 2; 3, 4];
+G += [1, 1; 1, 1];
+G -= 1;
+print G;
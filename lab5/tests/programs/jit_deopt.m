@@ -0,0 +1,10 @@
+M = zeros(3);
+r = 0; c = 0;
+for r = 0:6 {
+    if (r == 3) M = zeros(4);
+    for c = 0:3 {
+        M[c, 0] = r;
+        M[c, 1] = c;
+    }
+}
+print M, r, c;
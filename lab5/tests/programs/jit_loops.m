@@ -0,0 +1,44 @@
+i = 0; j = 0; n = 0;
+s = 0;
+x = 0.5;
+A = zeros(5);
+B = ones(5);
+C = [1, 2; 3, 4];
+for i = 0:20 {
+    for j = 0:5 {
+        if (j == 3) continue;
+        A[j, 4] = s * x;
+        s += j;
+    }
+    if (i == 17) break;
+    C = C .+ C;
+    x = x * 1.5;
+}
+print s, x, i, j, A, C;
+k = 0;
+while (k < 50) {
+    k += 1;
+    if (k == 14) continue;
+    s -= 1;
+    D = A .* B;
+    E = A .+ B .- A;
+    F = eye(3);
+    F[0, 1] = k;
+}
+print k, s, D, E, F;
+for n = 0:30 {
+    n += 2;
+    s += n;
+}
+print n, s;
+G = eye(300);
+for i = 0:10 {
+    G[i, i + 1] = i;
+    H = G .+ G;
+}
+print i;
+t = 0;
+while (t < 100) {
+    t += 1;
+    if (t == 60) return t;
+}
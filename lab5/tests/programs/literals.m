@@ -0,0 +1,15 @@
+a = 1.5; b = 2.5; c = 3.5; n = 4;
+for i = 0:3 {
+    A = [1, 2; 3, 4];
+    A[0, 0] = i;
+    print A;
+}
+B = [a, c; 5, 6];
+C = [a, b; 5, 6];
+D = [[a, 2], [3, c]];
+E = [n, n];
+F = ["x", "y"];
+G = [1.5, 2.5];
+B2 = B';
+B[0, 1] = 100;
+print B, C, D, E, F, G, B2;
@@ -0,0 +1,31 @@
+a = 1.5;
+b = 2.5;
+M = [a, b; 3.0, 4.0];
+print M, M', "hello";
+s = 0;
+for i = 1:10 {
+    if (i == 7) break;
+    if (i == 3) continue;
+    s += i * 2;
+}
+print s;
+k = 0;
+while (k < 100) {
+    k += 1;
+    j = 0;
+    while (j < 3) {
+        j += 1;
+        if (j == 2) { continue; }
+    }
+    if (k >= 5) {
+        break;
+    } else {
+        s -= 1;
+    }
+}
+print k, j, s, -k, 7 / 2;
+E = eye(3) .* ones(3);
+E[1, 2] = 5;
+print E, zeros(2) ./ ones(2);
+for q = 0:5 { if (q == 4) return q; }
+print "unreachable";
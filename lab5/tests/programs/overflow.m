@@ -0,0 +1,32 @@
+# int expressions of vectorized loops beyond int64, same as Python ints of scalar loops
+A = zeros(3);
+for i = 0:3 {
+    for j = 0:3 {
+        A[i, j] = 3000000000 * 3000000000 * (i + 1);
+    }
+}
+print A;
+
+B = zeros(3);
+for i = 0:3 {
+    for j = 0:3 {
+        B[i, j] = 3000000000 * 4000000000 * (i + 1) - j;
+    }
+}
+print B;
+
+C = zeros(3);
+for i = 0:3 {
+    for j = 0:3 {
+        C[i, j] = 3000000000 * 4000000000;
+    }
+}
+print C;
+
+D = zeros(3);
+for i = 0:3 {
+    for j = 0:3 {
+        D[i, j] = (3 * 4) * i + j / 2;
+    }
+}
+print D;
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import ASTCache as ast_cache_module
+from ASTCache import ASTCache
+from Transpiler import CodeCache
+from conftest import execute
+from parser import Parser
+
+PROGRAM = "A = [1, 2; 3, 4]; A += 1; print A; return 0;"
+
+
+def checked_parser(directory):
+    return Parser(ast_cache=ASTCache(str(directory)))
+
+
+def test_cached_program_skips_lex_parse_and_check(tmp_path):
+    output = execute(checked_parser(tmp_path), PROGRAM)
+    parser = checked_parser(tmp_path)
+    assert execute(parser, PROGRAM) == output
+    assert list(parser.pipeline.stats) == ['load', 'optimize', 'execute']
+
+
+@pytest.mark.parametrize("parser_kind", ["ply", "fast"])
+def test_program_with_illegal_character_is_not_stored(tmp_path, parser_kind):
+    text = "x = 1 @; print x;"
+    output = execute(Parser(parser=parser_kind, ast_cache=ASTCache(str(tmp_path))), text)
+    assert output.startswith("Illegal character '@' at line 1, column 7, skipping.\n")
+    assert os.listdir(tmp_path) == []
+    assert execute(Parser(parser=parser_kind, ast_cache=ASTCache(str(tmp_path))), text) == output
+
+
+@pytest.mark.parametrize("change", ["text", "signature", "version"])
+def test_changed_key_misses(tmp_path, monkeypatch, change):
+    parser = Parser()
+    cache, signature, text = ASTCache(str(tmp_path)), "signature", PROGRAM
+    cache.store(text, signature, parser.parse(text))
+    assert cache.load(text, signature) is not None
+    if change == "text":
+        text = PROGRAM.replace("1;", "2;")
+    elif change == "signature":
+        signature = "changed grammar"
+    else:
+        monkeypatch.setattr(ast_cache_module, "VERSION", ast_cache_module.VERSION + 1)
+    assert cache.load(text, signature) is None
+
+
+def test_corrupted_entry_misses(tmp_path):
+    cache = ASTCache(str(tmp_path))
+    cache.store(PROGRAM, "signature", Parser().parse(PROGRAM))
+    for name in os.listdir(tmp_path):
+        with open(tmp_path / name, "wb") as file:
+            file.write(b"not a pickle")
+    assert cache.load(PROGRAM, "signature") is None
+
+
+def test_unwritable_directory_runs_without_cache(tmp_path):
+    (tmp_path / "file").write_text("")
+    directory = tmp_path / "file" / "cache"  # makedirs fails under regular file
+    parser = checked_parser(directory)
+    assert execute(parser, PROGRAM) == execute(Parser(), PROGRAM)
+    assert not parser.ast_cache.writable
+    assert execute(parser, PROGRAM) == execute(Parser(), PROGRAM)
+
+
+def test_failed_write_removes_temporary_file(tmp_path, monkeypatch):
+    def replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", replace)
+    cache = ASTCache(str(tmp_path))
+    cache.store(PROGRAM, "signature", Parser().parse(PROGRAM))
+    CodeCache(str(tmp_path)).store(PROGRAM, "source", compile("", "<program>", "exec"))
+    assert not cache.writable
+    assert os.listdir(tmp_path) == []
+
+
+def test_default_directory_is_user_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert ASTCache().directory == CodeCache().directory == str(tmp_path / "lab5")
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    assert ASTCache().directory == os.path.join(os.path.expanduser("~"), ".cache", "lab5")
@@ -0,0 +1,38 @@
+import glob
+import os
+
+import pytest
+
+from conftest import execute
+from parser import Parser
+
+PROGRAMS = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs", "*.m")))
+BACKENDS = {
+    "jit": {"jit": True},
+    "iterative": {"iterative": True},
+    "stream": {"stream": True},
+    "fast parser": {"parser": "fast"},
+    "closure": {"backend": "closure"},
+    "vm": {"backend": "vm"},
+    "python": {"backend": "python"},
+}
+
+
+def run_file(path: str, **options):  # output and exit code of program in file
+    with open(path, "r") as file:
+        text = file.read()
+    parser = Parser(**options)
+    return execute(parser, text), parser.exit_code
+
+
+@pytest.fixture(scope="module")
+def expected():  # of tree backend, computed once for all backends
+    return {path: run_file(path) for path in PROGRAMS}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("path", PROGRAMS, ids=os.path.basename)
+def test_backend_matches_tree_interpreter(expected, path, backend):
+    output, exit_code = expected[path]
+    assert "Error" not in output
+    assert run_file(path, **BACKENDS[backend]) == (output, exit_code)
@@ -0,0 +1,33 @@
+import os
+import re
+import subprocess
+import sys
+
+LAB = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def batch(*args):  # stdout and exit status of main.py --batch
+    process = subprocess.run([sys.executable, "main.py", "--disable_ast", "--batch", *args], cwd=LAB,
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=120)
+    return process.stdout, process.returncode
+
+
+def test_outputs_in_argument_order_with_summary(tmp_path):
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "a.m").write_text("print 1; return 2;")
+    (tmp_path / "scripts" / "b.m").write_text("x = ;")
+    (tmp_path / "c.m").write_text('print "c";')
+    output, status = batch(str(tmp_path / "c.m"), str(tmp_path / "scripts"), "--jobs", "2")
+    assert status == 1
+    headers = [line for line in output.splitlines() if line.startswith("==> ")]
+    assert headers == [f"==> {tmp_path / name} <==" for name in ("c.m", "scripts/a.m", "scripts/b.m")]
+    assert "==> " + str(tmp_path / "c.m") + " <==\nc\nNo return statement" in output
+    rows = {line.split()[0]: line.split()[1:3] for line in output.splitlines() if line.startswith(str(tmp_path))}
+    assert rows[str(tmp_path / "scripts" / "a.m")] == ["ok", "2"]
+    assert rows[str(tmp_path / "scripts" / "b.m")] == ["syntax", "error"]
+    assert re.search(r"\n3 files, 1 failed, [0-9.]+ s\n$", output)
+
+
+def test_successful_batch_exits_with_0(tmp_path):
+    (tmp_path / "a.m").write_text("print 1;")
+    assert batch(str(tmp_path / "*.m"))[1] == 0
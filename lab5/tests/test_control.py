@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.mark.parametrize("text, output", [
+    ("for i = 0:3 { for j = 0:3 { if (j == 1) continue; if (i == 2) break; print i, j; } }",
+     "0 0\n0 2\n1 0\n1 2\nNo return statement found during interpretation\n"),
+    ("x = 0; while (1 < 2) { for i = 0:5 { if (i == 3) { return i * 10; } x += 1; } } print x;",
+     "Interpretation finished with exit code 30\n"),
+    ("i = 0; for i = 0:10 { if (i == 4) break; } print i; k = 0; while (k < 5) { k += 1; if (k > 2) break; } print k;",
+     "5\n3\nNo return statement found during interpretation\n"),
+])
+def test_signals_leave_only_their_loop(run, text, output):
+    assert run(text) == output
@@ -0,0 +1,28 @@
+import sys
+
+import pytest
+
+TERMS = 20000
+
+
+@pytest.fixture
+def recursion_limit():  # the default one, main.py raises it for recursive backends
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(1000)
+    yield
+    sys.setrecursionlimit(limit)
+
+
+def test_long_expression_runs_iteratively(run, recursion_limit):
+    text = "x = 1; y = " + " + ".join(["x"] * TERMS) + "; print y;"
+    assert run(text, iterative=True) == f"{TERMS}\nNo return statement found during interpretation\n"
+
+
+def test_deeply_nested_blocks_run_iteratively(run, recursion_limit):
+    text = "x = 0; " + "{ x += 1; " * 2000 + "print x;" + " }" * 2000
+    assert run(text, iterative=True) == "2000\nNo return statement found during interpretation\n"
+
+
+def test_type_errors_of_deep_expression_are_reported(run, recursion_limit):
+    text = "y = " + " + ".join(["1"] * TERMS) + " + \"s\";"
+    assert run(text, iterative=True).startswith("Line 1, TypeError: Unsupported operand types for +")
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from parser import Parser
+
+REBOUND = """
+B = ones(2);
+for i = 0:1 {
+    B = [[1,2],[3,4]];
+}
+A = B .- [[1,2],[3,4]];
+print A;
+"""
+
+
+@pytest.mark.parametrize("options", [{}, {"dtype": "float32"}, {"jit": True}, {"iterative": True}])
+def test_matrix_rebound_in_loop_keeps_runtime_dtype(run, options):
+    assert run(REBOUND, **options).startswith("[[0 0]\n [0 0]]\n")
+
+
+@pytest.mark.parametrize("text, dtype", [
+    ("A = [1, 2; 3, 4]; R = A .+ A;", np.int64),
+    ("A = [1, 2; 3, 4]; R = A ./ A;", np.float32),
+    ("R = [1, 2; 3, 4]; R /= [2, 2; 2, 2];", np.float32),
+    ("A = [1, 2; 3, 4]; R = A .+ ones(2);", np.float32),
+    ("x = 2.5; R = [x, 1.0; 2.0, 3.0];", np.float32),
+    ("A = [1, 2; 3, 4]; R = A .* A .+ A ./ A;", np.float32),
+])
+def test_float32_policy_casts_only_float_results(text, dtype):
+    parser = Parser(dtype="float32")
+    program = parser.parse(text, type_check=True, interpretation=True)
+    assert parser.interpreter.memory.get(program.statements[-1].assignments[0].assign_id.slot).dtype == dtype
+
+
+@pytest.mark.parametrize("backend", ["closure", "vm", "python"])
+def test_float32_is_rejected_by_other_backends(backend):
+    with pytest.raises(ValueError, match="float32 dtype is supported only by tree backend"):
+        Parser(backend=backend, dtype="float32")
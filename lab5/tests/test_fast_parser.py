@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+from differential import Generator, compare
+from parser import Parser
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return Parser()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_generated_programs_parse_as_with_ply(parser, seed):
+    generator = Generator(random.Random(seed))
+    for _ in range(20):
+        tokens = generator.program(generator.rng.randrange(1, 8))
+        for text in (generator.text(tokens), generator.text(generator.mutate(tokens))):
+            assert compare(parser, text)[1] is None, text
+
+
+@pytest.mark.parametrize("text", ["x = 1; y = @;", "x = 1", "print \"unterminated;"])
+def test_invalid_programs_are_left_to_ply(parser, text):
+    assert compare(parser, text) == (False, None)
@@ -0,0 +1,33 @@
+import pytest
+
+from Fuser import Fuser
+from parser import Parser
+
+CHAIN = "C = A .+ B .* A ./ (B .+ A) .- A'; print C;"
+PROGRAMS = {
+    "chunked": "A = ones(300); B = eye(300); B[7, 3] = 5; " + CHAIN,
+    "small": "A = [1, 2; 3, 4]; B = [2, 2; 5, 1]; " + CHAIN,
+    "int division": "A = [1, 2; 3, 4]; B = [1, 2; 3, 4]; C = A .* B ./ B .+ A; print C;",
+}
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_fused_chain_matches_unfused_evaluation(run, name):
+    assert run(PROGRAMS[name]) == run(PROGRAMS[name], backend="closure")
+
+
+@pytest.mark.parametrize("options", [{}, {"backend": "closure"}], ids=["fused", "unfused"])
+def test_mismatched_shapes_raise_numpy_error(run, options):
+    with pytest.raises(ValueError, match=r"shapes \(3,3\) \(300,300\)"):
+        run("A = ones(300); for i = 0:1 { A = ones(3); } C = A .+ A .* ones(300);", **options)
+
+
+@pytest.mark.parametrize("text, fused", [
+    (PROGRAMS["chunked"], 1),
+    ("A = ones(2); C = A .+ A; D = A * A .+ A;", 0),  # single operators, matrix product is a leaf
+    ("A = ones(2); C = (A .+ A) * (A .* A .- A);", 1),
+])
+def test_chains_of_two_or_more_operators_are_fused(text, fused):
+    fuser = Fuser()
+    fuser.fuse(Parser().parse(text, type_check=True))
+    assert fuser.fused == fused
@@ -0,0 +1,24 @@
+import pytest
+
+INTERPRETERS = [{}, {"jit": True}, {"iterative": True}, {"stream": True}]
+
+PROGRAMS = {
+    "alias": "A = [1, 2; 3, 4]; B = A; A += 1; print A, B;",
+    "alias of updated": "A = ones(3); A += 1; B = A; A *= A; B -= 1; print A, B;",
+    "rebound alias": "A = ones(3); B = A; A = zeros(3); A += 1; B += 2; print A, B;",
+    "transpose": "C = [1, 2; 3, 4]; D = C'; C += 1; print C, D;",
+    "transpose updated": "C = eye(3); D = C'; D += ones(3); C[0, 1] = 7; print C, D;",
+    "nested scope": "A = ones(2); B = zeros(2); { B = A; } A /= 2.0; print A, B;",
+    "lazy": "A = zeros(300); B = A; A += 1; for i = 0:300 { B[i, 0] = i; } print A, B;",
+    "vectorized lazy": "A = eye(300); B = A'; for i = 0:300 { for j = 0:300 { A[i, j] = i; } } B += 1; print A, B;",
+    "hot loop": "A = ones(2); B = A; for i = 0:300 { B = A; A += 1; } print A, B;",
+    "hot while": "A = ones(2); k = 0; while (k < 300) { A += 1; C = A'; k += 1; } C -= 1; print A, C;",
+}
+
+
+@pytest.mark.parametrize("options", INTERPRETERS, ids=["tree", "jit", "iterative", "stream"])
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_update_is_not_seen_by_alias_or_view(run, name, options):
+    output = run(PROGRAMS[name], **options)
+    assert output.endswith("No return statement found during interpretation\n")
+    assert output == run(PROGRAMS[name], backend="closure")
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from Incremental import IncrementalParser
+from differential import Generator, compare, compare_edits, difference
+from parser import Parser
+
+TEXT = """a = 1;
+b = [1, 2; 3, 4];
+for i = 0:3 {
+    a += i;
+}
+print a, b;
+"""
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return Parser()
+
+
+def edit(text: str, old: str, new: str):  # edit replacing the first occurrence of old
+    start = text.index(old)
+    return start, start + len(old), new
+
+
+@pytest.mark.parametrize("old, new", [
+    ("b = ", "c = 2;\nb = "),  # adds line, later line numbers shift
+    ("    a += i;\n", ""),  # removes statement of block
+    ("a = 1;\n", ""),  # removes the first statement
+    ("[1, 2; 3, 4];", "[1, 2; 3, 4]\n;"),  # splits statement
+    (";\nb", "\nb"),  # joins statements into syntax error
+    ("print a, b;\n", "print a, b;\nprint a;\n"),  # appends statement
+    ("0:3 {", "0:3 { a -= 1;"),
+])
+def test_reparse_equals_full_parse(parser, old, new):
+    incremental = IncrementalParser(parser.scanner)
+    program = incremental.parse(TEXT)
+    start, end, replacement = edit(TEXT, old, new)
+    edited = TEXT[:start] + replacement + TEXT[end:]
+    program = incremental.reparse(program, [(start, end, replacement)])
+    if parser.fast_parser.parse(edited) is None:  # syntax error, left to PLY parser
+        assert program is None
+    else:  # with line numbers of all nodes
+        assert difference(parser.parse(edited), program) is None
+
+
+def test_reparse_after_syntax_error(parser):
+    incremental = IncrementalParser(parser.scanner)
+    program = incremental.parse(TEXT)
+    broken = incremental.reparse(program, [edit(TEXT, "a += i;", "a += ;")])
+    assert broken is None
+    fixed = incremental.reparse(broken, [edit(TEXT.replace("a += i;", "a += ;"), "a += ;", "a += 2;")])
+    assert difference(parser.parse(TEXT.replace("a += i;", "a += 2;")), fixed) is None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_edits_of_generated_programs(parser, seed):
+    generator = Generator(random.Random(seed))
+    incremental = IncrementalParser(parser.scanner)
+    checked = 0
+    while checked < 5:
+        text = generator.text(generator.program(generator.rng.randrange(1, 8)))
+        fast, mismatch = compare(parser, text)
+        assert mismatch is None
+        if fast:
+            assert compare_edits(parser, incremental, generator, text, 20) is None
+            checked += 1
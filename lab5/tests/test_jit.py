@@ -0,0 +1,23 @@
+import os
+
+from conftest import execute
+from JIT import TracingInterpreter
+from parser import Parser
+
+DEOPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs", "jit_deopt.m")
+HOT = "s = 0; A = zeros(3); for i = 0:300 { A[1, 2] = i; s += i; } k = 0; while (k < 150) { k += 1; } print s, k, A;"
+
+
+def test_hot_loops_run_compiled(run):
+    parser = Parser(jit=True)
+    assert execute(parser, HOT) == run(HOT, backend="closure")
+    assert sorted(type(loop).__name__ for loop in parser.interpreter.traces) == ["For", "While"]
+
+
+def test_failed_guard_falls_back_to_interpreter(run, monkeypatch):
+    monkeypatch.setattr(TracingInterpreter, "threshold", 2)
+    with open(DEOPT, "r") as file:
+        text = file.read()
+    output = run(text, jit=True)
+    assert output == run(text, backend="closure")
+    assert "[[5. 0. 0. 0.]\n [5. 1. 0. 0.]\n [5. 2. 0. 0.]\n [0. 0. 0. 0.]] 6 3\n" in output
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from LazyMatrix import LazyMatrix
+
+
+def pair(kind: str, n: int = 300):  # lazy matrix and its dense equivalent
+    dense = {"eye": np.eye, "zeros": lambda n: np.zeros((n, n)), "ones": lambda n: np.ones((n, n))}[kind](n)
+    return LazyMatrix.special(kind, n, np.dtype(np.float64)), dense
+
+
+@pytest.mark.parametrize("kind", ["eye", "zeros", "ones"])
+def test_element_wise_operations_match_dense(kind):
+    lazy, dense = pair(kind)
+    other, other_dense = pair("eye")
+    lazy[3, 7] = 5
+    dense[3, 7] = 5
+    view, view_dense = other.transpose(), other_dense.T
+    view[1, 2] = -2
+    view_dense[1, 2] = -2
+    for result, expected in [(lazy + 1, dense + 1), (lazy * view, dense * view_dense), (-lazy, -dense),
+                             (view - lazy / 2, view_dense - dense / 2)]:
+        assert isinstance(result, LazyMatrix) and result.dtype == expected.dtype
+        assert np.array_equal(np.asarray(result), expected)
+    assert not lazy.densified
+    assert np.array_equal(lazy + dense, dense + dense)  # mixed with dense array, lazy matrix is densified
+
+
+def test_transposed_view_sees_writes():
+    lazy, _ = pair("zeros", 4 * 100)
+    view = lazy.transpose()
+    lazy[1, 2] = 3
+    assert view.storage.get(view._key((2, 1))) == 3
+    assert np.asarray(view)[2, 1] == 3
+
+
+def test_storage_densifies_above_density():
+    lazy, _ = pair("zeros", 100)
+    for i in range(100):
+        lazy[i, 0] = i
+    assert not lazy.densified
+    lazy[0, 1] = 1
+    assert lazy.densified and lazy.storage.entries is None
+    assert np.array_equal(np.asarray(lazy)[:, 0], np.arange(100))
+
+
+@pytest.mark.parametrize("text", [
+    "A = eye(300); B = A'; A[0, 1] = 5; C = A .+ B; D = -C ./ ones(300); print C, D;",
+    "A = zeros(300); for i = 0:300 { A[i, 0] = i; } B = A .* A; print B;",
+    "A = ones(300); A[7, 7] = 3; A += eye(300); A *= A; print A;",
+])
+def test_lazy_program_matches_dense_backend(run, text):
+    assert run(text) == run(text, backend="closure")
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from parser import Parser
+
+
+def test_written_literal_does_not_change_template(run):
+    output = run("for i = 0:2 { A = [1, 2; 3, 4]; A[0, 0] = i; print A; }")
+    assert output.startswith("[[0 2]\n [3 4]]\n[[1 2]\n [3 4]]\n")
+
+
+@pytest.mark.parametrize("text, value", [
+    ("R = [1, 2; 3, 4];", np.array([[1, 2], [3, 4]])),
+    ("n = 4; R = [n, n; n, n];", np.array([[4, 4], [4, 4]])),
+    ("a = 1.5; R = [a, 2.5];", np.array([1.5, 2.5])),
+    ("R = [\"x\", \"y\"];", np.array(["x", "y"])),
+])
+def test_literal_has_value_and_dtype_of_np_array(text, value):
+    parser = Parser()
+    program = parser.parse(text, type_check=True, interpretation=True)
+    result = parser.interpreter.memory.get(program.statements[-1].assignments[0].assign_id.slot)
+    assert result.dtype == value.dtype and np.array_equal(result, value)
@@ -0,0 +1,20 @@
+import os
+
+from AST import If, While
+from parser import Parser
+
+FOLDING = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs", "folding.m")
+
+
+def test_folded_program_prints_as_before(run):
+    with open(FOLDING, "r") as file:
+        output = run(file.read())
+    assert output == "yes\n7 7 4 4 True 3.5 5.0\n[[1. 0. 0.]\n [0. 1. 0.]\n [0. 0. 1.]]\n" \
+                     "Interpretation finished with exit code 7\n"
+
+
+def test_constant_branches_are_removed(run):
+    text = "print 2 * 3 + 1, --4, 1 < 2; if (2 < 1) { print 1; } else { print 2; } while (1 > 2) { print 3; }"
+    assert run(text, optimization_stats=True).startswith("Optimization folded 8 nodes\n7 4 True\n2\n")
+    program = Parser().parse(text, type_check=True)
+    assert not any(isinstance(statement, (If, While)) for statement in Parser().optimizer.optimize(program).statements)
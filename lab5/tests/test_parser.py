@@ -0,0 +1,26 @@
+import pytest
+
+from AST import Assignments, Print
+from parser import Parser
+
+N = 20000
+
+
+def test_long_lists_keep_their_order():
+    text = "".join(f"x{i} = {i};\n" for i in range(N)) + "print " + ", ".join(map(str, range(N))) + ";" \
+        + "A = [" + ", ".join(map(str, range(N))) + "];"
+    statements = Parser().parse(text).statements
+    assert len(statements) == N + 2
+    assert [statement.assignments[0].assign_id.value for statement in statements[:N]] == [f"x{i}" for i in range(N)]
+    assert isinstance(statements[N], Print) and [e.value for e in statements[N].expressions] == list(range(N))
+    assert isinstance(statements[-1], Assignments)
+    assert statements[-1].assignments[0].expression.value.vector == list(range(N))
+
+
+@pytest.mark.parametrize("text, output", [
+    ("x = 1, y = 2,; print x, y,;", "1 2\nNo return statement found during interpretation\n"),
+    ("A = [1, 2, 3,];", "Syntax error at line 1, column 14:LexToken(RBRACKET, ])\n"),
+    ("x = 1;\nprint x x;", "Syntax error at line 2, column 9:LexToken(ID, x)\n"),
+])
+def test_trailing_commas_and_syntax_errors_as_before(run, text, output):
+    assert run(text).startswith(output)
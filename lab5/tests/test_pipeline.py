@@ -0,0 +1,21 @@
+import resource
+
+from Pipeline import Pipeline
+from parser import Parser
+
+
+def test_detailed_stats_of_stages():
+    parser = Parser(stats=True)
+    parser.parse("A = [1, 2; 3, 4]; print A;", type_check=True, interpretation=True)
+    stats = parser.pipeline.stats
+    assert list(stats) == ['lex', 'parse', 'check', 'optimize', 'execute']
+    assert stats['lex']['count'] == 15
+    assert all(stage['rss_growth_kib'] >= 0 for stage in stats.values())
+
+
+def test_rss_growth_of_nested_stage_is_excluded():
+    pipeline = Pipeline(Parser(), detailed=True)
+    size = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss << 10) + (32 << 20)  # above the current peak
+    pipeline.measure('outer', pipeline.measure, 'inner', lambda: len(b'x' * size))
+    assert pipeline.stats['inner']['rss_growth_kib'] >= 32 << 10
+    assert pipeline.stats['outer']['rss_growth_kib'] < 1 << 10
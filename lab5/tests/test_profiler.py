@@ -0,0 +1,24 @@
+from parser import Parser
+
+TEXT = "x = 0;\nfor i = 0:100 {\n    x += i;\n}\nprint x;"
+
+
+def test_profile_counts_lines_and_writes_stacks(run, tmp_path):
+    path = tmp_path / "profile.folded"
+    output = run(TEXT, profile=str(path))
+    assert output.startswith("4950\n")
+    calls = {line.split()[0]: int(line.split()[1]) for line in output.splitlines()[2:8]}
+    assert calls == {"1": 1, "2": 2, "3": 100, "4": 100, "5": 2, "-": 1}
+    stacks = dict(line.rsplit(" ", 1) for line in path.read_text().splitlines())
+    assert all(stack.startswith("Statements") and int(own) >= 0 for stack, own in stacks.items())
+    assert "Statements;For:5;Block;Statements;Assignments:4;Assignment:3" in stacks
+
+
+def test_self_times_add_up_to_run_time():
+    parser = Parser(profile="/dev/null")
+    program = parser.parse(TEXT, type_check=True)
+    parser.interpreter.run(program)
+    interpreter = parser.interpreter
+    total = sum(own for _, _, own in interpreter.lines.values())
+    assert total == sum(interpreter.stacks.values()) == sum(own for _, _, own in interpreter.nodes.values())
+    assert total == interpreter.nodes[program][1]
@@ -0,0 +1,30 @@
+from AST import Id
+from Resolver import Resolver
+from parser import Parser
+
+TEXT = "x = 1; y = 0; { y = x; { x = y + 2; } } for i = 0:3 { z = [x, y]; } print x, y;"
+
+
+def ids(node, found):  # Id nodes of subtree in visiting order
+    if isinstance(node, list):
+        for el in node:
+            ids(el, found)
+    elif isinstance(node, Id):
+        found.append(node)
+    elif hasattr(node, '__dict__'):
+        for value in vars(node).values():
+            ids(value, found)
+    return found
+
+
+def test_name_has_one_slot_in_every_scope():
+    program = Parser().parse(TEXT, type_check=True)
+    assert Resolver().resolve(program) == 4
+    slots = {}
+    for node in ids(program, []):
+        assert slots.setdefault(node.value, node.slot) == node.slot
+    assert sorted(slots.values()) == [0, 1, 2, 3]
+
+
+def test_variables_of_inner_scopes_keep_values(run):
+    assert run(TEXT).startswith("3 1\n")
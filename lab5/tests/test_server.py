@@ -0,0 +1,65 @@
+import os
+import signal
+import threading
+
+import pytest
+
+from client import submit
+from server import Server
+
+LOOP = "x = 0; while (x < 1) { x = 0; }"
+PROGRAM = "A = [1, 2; 3, 4]; print A; return 3;"
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = Server(str(tmp_path / "server.sock"), workers=1, timeout=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_program_runs_in_worker(server):
+    response = submit(server.server_address, PROGRAM, {})
+    assert (response['status'], response['exit_code']) == ('ok', 3)
+    assert response['output'] == "[[1 2]\n [3 4]]\nInterpretation finished with exit code 3\n"
+
+
+@pytest.mark.parametrize("options", [{'backend': 'fortran'}, {'backend': 'vm', 'dtype': 'float32'}])
+def test_bad_request(server, options):
+    assert submit(server.server_address, PROGRAM, options)['status'] == 'bad request'
+
+
+def test_jobs_do_not_share_variables(server):
+    assert submit(server.server_address, "x = 1; print x;", {})['status'] == 'ok'
+    response = submit(server.server_address, "\nprint x;", {})
+    assert (response['status'], response['exit_code']) == ('type error', None)
+    assert response['output'].startswith("Line 2, NameError: x is not defined in given scope\n")
+
+
+def test_timeout_restarts_worker(server):
+    executor = server.executor
+    assert submit(server.server_address, LOOP, {})['status'] == 'timeout'
+    assert server.executor is not executor
+    assert submit(server.server_address, PROGRAM, {})['status'] == 'ok'
+
+
+def worker_pid(server):  # of the only worker of the pool
+    return server.executor.submit(os.getpid).result(timeout=10)
+
+
+def test_dead_worker_is_replaced(server):
+    executor = server.executor
+    os.kill(worker_pid(server), signal.SIGKILL)  # job may be queued before the pool notices, it runs again
+    assert submit(server.server_address, PROGRAM, {})['status'] == 'ok'
+    assert server.executor is not executor
+
+
+def test_worker_dying_in_job_gets_error(server):
+    timer = threading.Timer(0.5, os.kill, (worker_pid(server), signal.SIGKILL))
+    timer.start()
+    assert submit(server.server_address, LOOP, {})['status'] == 'worker died'
+    timer.join()
+    assert submit(server.server_address, PROGRAM, {})['status'] == 'ok'
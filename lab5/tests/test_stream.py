@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.mark.parametrize("text, output", [
+    ("x = 1; print x; y = x + 1; print y; z = ; print 5;",
+     "1\n2\nSyntax error at line 1, column 41:LexToken(SEMICOL, ;)\n"
+     "Provided program has Syntax error, Interpretation stopped\n"),
+    ("x = 1; print x; y = \"a\" + 1; print 5;",
+     "1\nLine 1, TypeError: Unsupported operand types for +, got: str and int\n"
+     "Provided program has Type Error, Interpretation stopped\n"),
+    ("print 1; A = zeros(2); i = 5; A[i, 0] = 1; print 2;",
+     "1\nLine 1, IndexError: matrix indexes out of range 5, 0\n"
+     "Provided program has Type Error, Interpretation stopped\n"),
+    ("x = 1; { print x; x = 3; } print x; return x;", "1\n3\nInterpretation finished with exit code 3\n"),
+])
+def test_statements_run_before_later_errors(run, text, output):
+    assert run(text, stream=True) == output
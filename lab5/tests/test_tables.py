@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+
+from conftest import execute
+from parser import Parser
+
+LAB = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEXT = "A = eye(3); for i = 0:3 { A[i, 0] = i; } print A';"
+
+
+def test_packaged_tables_are_up_to_date():
+    process = subprocess.run([sys.executable, "tables.py", "--check"], cwd=LAB, stdout=subprocess.PIPE, text=True)
+    assert (process.returncode, process.stdout) == (0, "")
+
+
+def test_parser_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Parser()
+    assert os.listdir(tmp_path) == []
+
+
+def test_packaged_tables_parse_as_generated_ones(run, tmp_path):
+    generated = Parser(outputdir=str(tmp_path), tabmodule="generatedparsetab")
+    assert run(TEXT) == execute(generated, TEXT)
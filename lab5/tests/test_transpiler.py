@@ -0,0 +1,41 @@
+import contextlib
+import io
+import os
+
+from Transpiler import CodeCache, run as run_code
+
+PROGRAM = "A = eye(2); s = 0; for i = 0:4 { s += i; } print A .* ones(2), s;"
+
+
+def test_emitted_module_defines_program(run):
+    assert "def program():\n" in run(PROGRAM, backend="python", emit_python=True)
+
+
+def test_cached_code_runs_without_parsing(run, tmp_path):
+    cache = CodeCache(str(tmp_path))
+    output = run(PROGRAM, backend="python", cache=cache)
+    source, code = cache.load(PROGRAM)
+    assert source.startswith("def program():\n")
+    cached_output = io.StringIO()
+    with contextlib.redirect_stdout(cached_output):
+        run_code(code)
+    assert output.startswith(cached_output.getvalue())
+    assert cache.load(PROGRAM + " ") is None
+
+
+def test_program_with_illegal_character_is_not_cached(run, tmp_path):
+    cache = CodeCache(str(tmp_path))
+    assert run("x = 1 @; print x;", backend="python", cache=cache).startswith("Illegal character '@'")
+    assert cache.load("x = 1 @; print x;") is None
+
+
+def test_least_recently_loaded_code_is_evicted(tmp_path):
+    cache = CodeCache(str(tmp_path))
+    for i, text in enumerate(["print 1;", "print 2;", "print 3;"]):
+        cache.store(text, "source", compile("", "<program>", "exec"))
+        os.utime(cache._path(text), (i, i))
+    cache.load("print 1;")  # most recently used, "print 2;" becomes the least recently used
+    cache.max_size = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+    cache.store("print 4;", "source", compile("", "<program>", "exec"))
+    assert [cache.load(text) is not None for text in ["print 1;", "print 2;", "print 3;", "print 4;"]] == \
+        [True, False, True, True]
@@ -0,0 +1,38 @@
+import pytest
+
+from Vectorizer import Vectorizer
+from parser import Parser
+
+PROGRAMS = {
+    "fill": "A = zeros(4); for i = 0:4 { for j = 0:4 { A[i, j] = i * 4 + j; } } print A, i, j;",
+    "column": "A = ones(3); k = 2; for i = 0:3 { A[i, k] = -i / 2; } print A, i;",
+    "empty range": "A = zeros(2); i = 7; for i = 3:1 { A[i, 0] = 1; } print A, i;",
+    "division by zero": "A = zeros(3); for i = 0:3 { A[i, i] = 1 / i; } print A;",
+    "int overflow": "A = zeros(3); for i = 0:3 { for j = 0:3 { A[i, j] = 3000000000 * 3000000000 * i; } } print A;",
+    "int beyond int64": "A = zeros(3); for i = 0:3 { for j = 0:3 { A[i, j] = 3000000000 * 4000000000; } } print A;",
+    "scalar beyond int64": "A = zeros(3); x = 3000000000; for i = 0:3 { A[i, 0] = x * 4000000000 * (i + 1); } print A;",
+    "exact division": "A = zeros(2); x = 9007199254740993; for i = 0:2 { A[i, 0] = (x + i) / 3; } print A;",
+}
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_vectorized_loop_matches_scalar_loop(run, name):
+    assert run(PROGRAMS[name]) == run(PROGRAMS[name], backend="closure")
+
+
+def test_out_of_bounds_index_raises_as_scalar_loop(run):
+    with pytest.raises(IndexError, match="index 2 is out of bounds"):
+        run("A = zeros(2); for i = 0:3 { A[i, 0] = i; }")
+
+
+@pytest.mark.parametrize("text, vectorized", [
+    (PROGRAMS["fill"], 1),
+    (PROGRAMS["column"], 1),
+    ("A = zeros(3); for i = 0:3 { A[i, i] = 1; }", 0),  # counter used twice
+    ("A = zeros(3); for i = 0:3 { for j = 0:i { A[i, j] = 1; } }", 1),  # only inner, its bound uses counter
+    ("A = zeros(3); for i = 0:3 { A[i, 0] = 1; print i; }", 0),
+])
+def test_only_independent_loop_nests_are_vectorized(text, vectorized):
+    vectorizer = Vectorizer()
+    vectorizer.vectorize(Parser().parse(text, type_check=True))
+    assert vectorizer.vectorized == vectorized
@@ -0,0 +1,81 @@
+import contextlib
+import io
+
+import TreePrinter  # noqa: F401, adds printTree to AST classes
+from AST import AstNode, BinOp, Expr, Statement
+from ClosureCompiler import ClosureCompiler
+from Interpreter import Interpreter
+from parser import Parser
+from visit import NodeVisitor
+
+TREE = """=
+|  A
+|  |  VECTOR
+|  |  |  1
+|  |  |  2
+|  |  |  SEMICOL
+|  |  |  3
+|  |  |  4
+FOR
+i
+|  RANGE
+|  |  0
+|  |  2
+|  |  +=
+|  |  |  REF
+|  |  |  A
+|  |  |  |  i
+|  |  |  |  0
+|  |  |  MINUS
+|  |  |  |  i
+IF
+|  <
+|  |  i
+|  |  1
+THEN
+|  PRINT
+|  |  TRANSPOSE
+|  |  |  A
+ELSE
+|  RETURN
+|  |  1
+"""
+
+
+class _Visitor(NodeVisitor):
+
+    def visit_Expr(self, node):
+        return 'Expr'
+
+    def visit_BinOp(self, node):
+        return 'BinOp'
+
+
+def test_tree_printer_output_is_unchanged():
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        Parser().parse("A = [1, 2; 3, 4]; for i = 0:2 { A[i, 0] += -i; } if (i < 1) print A'; else return 1;",
+                       ast=True)
+    assert output.getvalue() == TREE
+
+
+def test_missing_visit_method_resolves_along_mro():
+    class Late(BinOp):  # defined after the table of _Visitor was filled
+        pass
+
+    visitor = _Visitor()
+    assert visitor.visit(Late(None, ".+", None)) == 'BinOp'
+    assert _Visitor._dispatch[Late] is _Visitor.visit_BinOp
+    assert visitor.visit(Expr()) == 'Expr'
+    assert visitor.visit(AstNode()) is None
+
+
+def test_node_without_visitor_is_reported_when_run(capsys):
+    class Unknown(Statement):
+        pass
+
+    compiled = ClosureCompiler().visit(Unknown())
+    assert capsys.readouterr().out == ""
+    compiled()
+    Interpreter().visit(Unknown())
+    assert capsys.readouterr().out == "No visitor for node Unknown\n" * 2
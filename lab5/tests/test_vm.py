@@ -0,0 +1,14 @@
+LOOP = "x = 0; for i = 0:10 { x += 2; } print x;"
+
+
+def test_disassembly_names_registers_and_targets(run):
+    lines = [" ".join(line.split()) for line in run(LOOP, backend="vm", disassemble=True).splitlines()]
+    assert "2 FOR_TEST r2(i), r3(10), -> 7" in lines
+    assert "3 ADD r1(x), r1(x), r4(2)" in lines
+
+
+def test_opcode_stats_count_executed_instructions(run):
+    lines = run(LOOP, backend="vm", opcode_stats=True).splitlines()
+    start = next(k for k, line in enumerate(lines) if line.startswith("OPCODE"))
+    counts = dict(line.split()[:2] for line in lines[start + 1:-1])
+    assert counts == {"FOR_TEST": "11", "ADD": "10", "INC": "10", "JUMP": "10", "MOVE": "2", "PRINT": "1"}
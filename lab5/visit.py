@@ -1,53 +1,95 @@
-import inspect
+from types import GeneratorType
 
-__all__ = ['on', 'when']
+from AST import AstNode
 
+__all__ = ['NodeVisitor', 'IterativeVisitor']
 
-def on(param_name):
-    def f(fn):
-        dispatcher = Dispatcher(param_name, fn)
-        return dispatcher
 
-    return f
+def _subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
 
 
-def when(param_type):
-    # f - actual decorator
-    # fn - decorated method, i.e. visit
-    # ff - fn gets replaced by ff in the effect of applying @when decorator
-    # dispatcher is an function object
-    def f(fn):
-        frame = inspect.currentframe().f_back
-        dispatcher = frame.f_locals[fn.__name__]
-        if not isinstance(dispatcher, Dispatcher):
-            dispatcher = dispatcher.dispatcher
-        dispatcher.add_target(param_type, fn)
+class _DispatchTable(dict):  # node class -> visit function of one visitor class
 
-        def ff(*args, **kw):
-            return dispatcher(*args, **kw)
+    def __init__(self, visitor_class):
+        super().__init__()
+        self.visitor_class = visitor_class
+
+    def __missing__(self, node_class):  # first visit of class without own entry, resolve along MRO and cache
+        for klass in node_class.__mro__:
+            method = getattr(self.visitor_class, 'visit_' + klass.__name__, None)
+            if method is not None:
+                break
+        else:
+            method = self.visitor_class.generic_visit
+        self[node_class] = method
+        return method
 
-        ff.dispatcher = dispatcher
-        return ff
 
-    return f
+class NodeVisitor(object):
+    """Base of all AST visitors, node of class X is handled by method visit_X(self, node).
 
+    Every visitor class gets its own node class -> method table, filled up front for all known AstNode
+    classes. Classes without own visit_X fall back along their MRO, misses are resolved once and cached.
+    Visitors needing extra arguments override visit, looking methods up in the same table.
+    """
+    _dispatch = None  # set below for NodeVisitor itself, by __init_subclass__ for subclasses
 
-class Dispatcher(object):
-    def __init__(self, param_name, fn):
-        self.param_index = inspect.getfullargspec(fn).args.index(param_name)
-        self.param_name = param_name
-        self.targets = {}
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = _DispatchTable(cls)
+        for node_class in _subclasses(AstNode):
+            cls._dispatch[node_class] = cls._dispatch.__missing__(node_class)
 
-    def __call__(self, *args, **kw):
-        typ = args[self.param_index].__class__
-        d = self.targets.get(typ)
-        if d is not None:
-            return d(*args, **kw)
+    def visit(self, node):
+        return self._dispatch[node.__class__](self, node)
+
+    def generic_visit(self, node):  # Called if no explicit visitor function exists for a node.
+        print("No visitor for node ", node.__class__.__name__)
+        if isinstance(node, list):
+            for elem in node:
+                self.visit(elem)
         else:
-            issub = issubclass
-            t = self.targets
-            ks = t.iterkeys()
-            return [t[k](*args, **kw) for k in ks if issub(typ, k)]
+            children = getattr(node, 'children', [])
+            for child in children:
+                if isinstance(child, list):
+                    for item in child:
+                        if isinstance(item, AstNode):
+                            self.visit(item)
+                elif isinstance(child, AstNode):
+                    self.visit(child)
+
+
+NodeVisitor._dispatch = _DispatchTable(NodeVisitor)
+
+
+class IterativeVisitor(NodeVisitor):
+    """NodeVisitor running visit_X methods written as generators on explicit stack instead of Python stack.
+
+    Generator method yields child node and is sent back its visited value, its return value is the value of
+    the node. Plain methods work as in NodeVisitor, so AST of any depth is visited with constant Python stack
+    as long as methods visiting children are generators. Exceptions leave visit directly, generator methods
+    cannot catch exceptions of their children.
+    """
 
-    def add_target(self, typ, target):
-        self.targets[typ] = target
+    def visit(self, node):
+        dispatch = self._dispatch
+        value = dispatch[node.__class__](self, node)
+        if type(value) is not GeneratorType:
+            return value
+        stack = [value]
+        value = None
+        while stack:
+            try:
+                node = stack[-1].send(value)
+            except StopIteration as stop:  # method returned, its value goes to the parent
+                stack.pop()
+                value = stop.value
+                continue
+            value = dispatch[node.__class__](self, node)
+            if type(value) is GeneratorType:
+                stack.append(value)
+                value = None
+        return value